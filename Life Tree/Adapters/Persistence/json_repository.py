@@ -1,15 +1,18 @@
-import json
 import os
 import datetime
-from Infrastructure.variables import FOCUS_DATA_PATH, TREE_DATA_PATH
+from Core.Ports.serializer import read_file, write_file
+from Adapters.Persistence.session_log import SessionLog
+from Infrastructure.variables import FOCUS_DATA_PATH, TREE_DATA_PATH, APP_STATE_PATH, SESSION_LOGS_PATH, SESSION_LOG_PATH, RESTRICT_CONFIG_PATH, LEGACY_RESTRICT_CONFIG_PATH
 
 class JsonRepository:
     """
-    Adapter for JSON-based storage of application data.
+    Adapter for file-based storage of application data.
+    Encoded with the active serializer backend (JSON unless configured otherwise).
     """
     def __init__(self, focus_path=FOCUS_DATA_PATH, tree_path=TREE_DATA_PATH):
         self.focus_path = focus_path
         self.tree_path = tree_path
+        self.session_log = SessionLog(SESSION_LOG_PATH, legacy_path=SESSION_LOGS_PATH)
         os.makedirs(os.path.dirname(self.focus_path), exist_ok=True)
         os.makedirs(os.path.dirname(self.tree_path), exist_ok=True)
 
@@ -22,8 +25,7 @@ class JsonRepository:
             "chars": chars
         }
         try:
-            with open(self.focus_path, 'w') as f:
-                json.dump(data, f)
+            write_file(self.focus_path, data)
         except Exception as e:
             print(f"JsonRepository: Error saving focus stats: {e}")
 
@@ -31,16 +33,14 @@ class JsonRepository:
         if not os.path.exists(self.focus_path):
             return None
         try:
-            with open(self.focus_path, 'r') as f:
-                return json.load(f)
+            return read_file(self.focus_path)
         except Exception as e:
             print(f"JsonRepository: Error loading focus stats: {e}")
             return None
 
     def save_tree(self, roots_dict_list):
         try:
-             with open(self.tree_path, 'w') as f:
-                json.dump(roots_dict_list, f, indent=2)
+            write_file(self.tree_path, roots_dict_list)
         except Exception as e:
             print(f"JsonRepository: Failed to save tree data: {e}")
 
@@ -48,8 +48,51 @@ class JsonRepository:
         if not os.path.exists(self.tree_path):
             return None
         try:
-            with open(self.tree_path, 'r') as f:
-                return json.load(f)
+            return read_file(self.tree_path)
         except Exception as e:
             print(f"JsonRepository: Error loading tree data: {e}")
             return None
+
+    def load_app_state(self):
+        if not os.path.exists(APP_STATE_PATH):
+            return {}
+        try:
+            return read_file(APP_STATE_PATH)
+        except Exception as e:
+            print(f"JsonRepository: Error loading app state: {e}")
+            return {}
+
+    def save_app_state(self, state):
+        try:
+            write_file(APP_STATE_PATH, state, pretty=True, atomic=True)
+        except Exception as e:
+            print(f"JsonRepository: Failed to save app state: {e}")
+
+    def load_restriction_config(self):
+        path = RESTRICT_CONFIG_PATH if os.path.exists(RESTRICT_CONFIG_PATH) else LEGACY_RESTRICT_CONFIG_PATH
+        if not os.path.exists(path):
+            return None
+        try:
+            return read_file(path) # Saving writes it to the new location
+        except Exception as e:
+            print(f"JsonRepository: Error loading restriction config: {e}")
+            return None
+
+    def save_restriction_config(self, data):
+        try:
+            write_file(RESTRICT_CONFIG_PATH, data, atomic=True)
+        except Exception as e:
+            print(f"JsonRepository: Failed to save restriction config: {e}")
+
+    def iter_session_logs(self, start=None, end=None):
+        """Streams session reviews whose day is within [start, end] (dates or ISO strings)."""
+        try:
+            yield from self.session_log.iter_entries(start, end)
+        except OSError as e:
+            print(f"JsonRepository: Error reading session log: {e}")
+
+    def append_session_log(self, entry):
+        try:
+            self.session_log.append(entry)
+        except OSError as e:
+            print(f"JsonRepository: Failed to save session log: {e}")
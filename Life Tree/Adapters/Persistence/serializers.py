@@ -0,0 +1,104 @@
+from Core.Ports.serializer import Serializer, StdlibJsonSerializer, set_serializer, register_decoder
+
+# Optional dependencies: each backend is only offered when its package is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class OrjsonSerializer(Serializer):
+    name = "orjson"
+    format = "json"
+
+    def dumps(self, obj, pretty=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class MsgspecJsonSerializer(Serializer):
+    name = "msgspec"
+    format = "json"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj, pretty=False):
+        data = self._encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if pretty else data
+
+    def loads(self, data):
+        return self._decoder.decode(data)
+
+
+class MessagePackSerializer(Serializer):
+    """Binary format: smaller and faster, but files are no longer readable by hand."""
+    name = "msgpack"
+    format = "msgpack"
+
+    def __init__(self):
+        if msgspec:
+            self._encode = msgspec.msgpack.Encoder().encode
+            self._decode = msgspec.msgpack.Decoder().decode
+        else:
+            self._encode = lambda obj: msgpack.packb(obj, use_bin_type=True)
+            self._decode = lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+    def dumps(self, obj, pretty=False):
+        return self._encode(obj)
+
+    def loads(self, data):
+        return self._decode(data)
+
+
+def available_serializers():
+    """name -> backend instance, for every backend that can run here."""
+    backends = {"json": StdlibJsonSerializer()}
+    if orjson:
+        backends["orjson"] = OrjsonSerializer()
+    if msgspec:
+        backends["msgspec"] = MsgspecJsonSerializer()
+    if msgspec or msgpack:
+        backends["msgpack"] = MessagePackSerializer()
+    return backends
+
+
+def detect_serializer(preferred="auto"):
+    """
+    Picks the write backend. "auto" takes the fastest installed JSON backend
+    (orjson, then msgspec, then stdlib); MessagePack is only used when asked for by name,
+    since it changes the files on disk.
+    """
+    backends = available_serializers()
+    if preferred and preferred != "auto":
+        if preferred in backends:
+            return backends[preferred]
+        print(f"Serializers: '{preferred}' is not installed, falling back to auto-detection")
+    for name in ("orjson", "msgspec", "json"):
+        if name in backends:
+            return backends[name]
+
+
+def install_serializers(preferred="auto"):
+    """Selects the write backend and registers decoders for every format that can be read."""
+    backends = available_serializers()
+    register_decoder(detect_serializer("auto")) # Fastest JSON reader, even when writing MessagePack
+    if "msgpack" in backends:
+        register_decoder(backends["msgpack"])
+    
+    serializer = detect_serializer(preferred)
+    set_serializer(serializer)
+    return serializer
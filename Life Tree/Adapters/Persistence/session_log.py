@@ -0,0 +1,183 @@
+import os
+import json
+import datetime
+from Core.Ports.serializer import SerializationError, read_file, write_file
+
+COMPACT_EVERY = 500 # Appends between compactions
+
+
+class SessionLog:
+    """
+    Append-only JSON-lines log of session reviews, one {"timestamp": iso, ...} entry per line.
+    A sidecar index maps each day to the byte offset of its first entry, so date-range reads
+    seek straight to the right place instead of parsing the whole history.
+    """
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.legacy_path = legacy_path # Old whole-file JSON list, imported once
+        self.index = None # {"days": {day: offset}, "bytes": int, "sorted": bool, "appends": int}
+
+    # --- Writing ---
+    def append(self, entry):
+        self._ensure_ready()
+        line = json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n"
+        if os.path.exists(self.path) and os.path.getsize(self.path) > self.index["bytes"]:
+            with open(self.path, 'r+b') as f:
+                f.truncate(self.index["bytes"]) # Torn line from a crash; the new entry must start on a clean line
+        with open(self.path, 'ab') as f:
+            offset = f.tell()
+            f.write(line)
+
+        day = self._day(entry)
+        days = self.index["days"]
+        if day and days and day < max(days):
+            self.index["sorted"] = False # Clock went backwards; range reads can't stop early until compacted
+        new_day = day and day not in days
+        if new_day:
+            days[day] = offset
+        self.index["appends"] += 1
+        self.index["bytes"] = offset + len(line)
+
+        if self.index["appends"] >= COMPACT_EVERY or not self.index["sorted"]:
+            self.compact()
+        elif new_day:
+            self._save_index() # Otherwise the index only changes on a new day (see _ensure_ready)
+
+    def compact(self):
+        """Rewrites the log sorted by timestamp, dropping torn lines, and rebuilds the index."""
+        self._ensure_ready()
+        entries = sorted(self._scan(0), key=lambda e: e.get("timestamp", ""))
+        tmp_path = self.path + ".tmp"
+        days = {}
+        with open(tmp_path, 'wb') as f:
+            for entry in entries:
+                day = self._day(entry)
+                if day and day not in days:
+                    days[day] = f.tell()
+                f.write(json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n")
+            size = f.tell()
+        os.replace(tmp_path, self.path)
+        self.index = {"days": days, "bytes": size, "sorted": True, "appends": 0}
+        self._save_index()
+
+    # --- Reading ---
+    def iter_entries(self, start=None, end=None):
+        """
+        Streams entries whose day is within [start, end] (dates or ISO strings, inclusive).
+        Only the part of the file from the first matching day onwards is read.
+        """
+        self._ensure_ready()
+        start_day = self._as_day(start)
+        end_day = self._as_day(end)
+
+        offset = 0
+        if start_day:
+            later = [off for day, off in self.index["days"].items() if day >= start_day]
+            if not later:
+                return
+            offset = min(later) if self.index["sorted"] else 0
+
+        for entry in self._scan(offset):
+            day = self._day(entry)
+            if start_day and (not day or day < start_day):
+                continue
+            if end_day and day and day > end_day:
+                if self.index["sorted"]:
+                    return
+                continue
+            yield entry
+
+    def read_range(self, start=None, end=None):
+        return list(self.iter_entries(start, end))
+
+    def days(self):
+        """Days that have at least one entry, oldest first."""
+        self._ensure_ready()
+        return sorted(self.index["days"])
+
+    # --- Internals ---
+    @staticmethod
+    def _day(entry):
+        timestamp = entry.get("timestamp") if isinstance(entry, dict) else None
+        return timestamp[:10] if isinstance(timestamp, str) else None
+
+    @staticmethod
+    def _as_day(value):
+        if value is None:
+            return None
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()[:10]
+        return str(value)[:10]
+
+    def _scan(self, offset):
+        """Yields parsed entries from offset to the end. Torn lines (crash mid-write) are skipped."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+
+    def _ensure_ready(self):
+        if self.index is not None:
+            return
+        self._import_legacy()
+        try:
+            self.index = read_file(self.index_path)
+        except (OSError, SerializationError):
+            self.index = None
+
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if not self.index or self.index.get("bytes", 0) > size:
+            # Missing, or the log was replaced underneath us: index from scratch
+            self.index = {"days": {}, "bytes": 0, "sorted": True, "appends": 0}
+        if self.index["bytes"] < size:
+            self._index_tail(self.index["bytes"])
+            self._save_index()
+
+    def _index_tail(self, offset):
+        """Adds days found after offset (lines appended since the index was last written)."""
+        days = self.index["days"]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            while True:
+                position = f.tell()
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break # Missing or torn last line (cut by the next append)
+                try:
+                    day = self._day(json.loads(line))
+                except ValueError:
+                    continue
+                if day and days and day < max(days):
+                    self.index["sorted"] = False
+                if day and day not in days:
+                    days[day] = position
+            self.index["bytes"] = position
+
+    def _save_index(self):
+        try:
+            write_file(self.index_path, self.index)
+        except Exception as e:
+            print(f"SessionLog: Failed to save index: {e}")
+
+    def _import_legacy(self):
+        """Converts the old session_logs.json list into the JSON-lines file (once)."""
+        if not self.legacy_path or os.path.exists(self.path) or not os.path.exists(self.legacy_path):
+            return
+        try:
+            entries = read_file(self.legacy_path)
+        except (OSError, SerializationError) as e:
+            print(f"SessionLog: Could not import {self.legacy_path}: {e}")
+            return
+        entries = sorted((e for e in entries if isinstance(e, dict)), key=lambda e: e.get("timestamp", ""))
+        with open(self.path, 'wb') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n")
+        os.replace(self.legacy_path, self.legacy_path + ".imported")
@@ -0,0 +1,336 @@
+import os
+import json
+import uuid
+import sqlite3
+import threading
+import datetime
+from Core.Ports.serializer import SerializationError, read_file
+from Adapters.Persistence.session_log import SessionLog
+from Core.Services.tree_journal import TreeJournal
+from Infrastructure.variables import (FOCUS_DATA_PATH, TREE_DATA_PATH, VALUES_DATA_PATH, STATS_HISTORY_PATH,
+                                      SESSION_LOGS_PATH, SESSION_LOG_PATH, APP_STATE_PATH, RESTRICT_CONFIG_PATH,
+                                      LEGACY_RESTRICT_CONFIG_PATH)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    tree TEXT NOT NULL,
+    uid TEXT NOT NULL,
+    parent_uid TEXT,
+    position INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    status TEXT NOT NULL,
+    description TEXT NOT NULL,
+    x NUMERIC, y NUMERIC, width NUMERIC, height NUMERIC,
+    archived_time NUMERIC, archived_words INTEGER, archived_chars INTEGER,
+    allowed_windows TEXT NOT NULL,
+    cycle_time NUMERIC, cycle_count INTEGER, collapsed INTEGER,
+    PRIMARY KEY (tree, uid)
+);
+CREATE INDEX IF NOT EXISTS idx_nodes_parent ON nodes (tree, parent_uid, position);
+
+CREATE TABLE IF NOT EXISTS intentions (
+    tree TEXT NOT NULL,
+    node_uid TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL,
+    time NUMERIC, words INTEGER, chars INTEGER,
+    completed_at TEXT,
+    PRIMARY KEY (tree, node_uid, position)
+);
+
+CREATE TABLE IF NOT EXISTS history (
+    ts NUMERIC PRIMARY KEY,
+    active NUMERIC, words INTEGER, chars INTEGER,
+    node_label TEXT, intention_label TEXT
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    outcome TEXT,
+    duration_mins NUMERIC
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions (timestamp);
+
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+NODE_COLUMNS = ("tree, uid, parent_uid, position, label, status, description, x, y, width, height, "
+                "archived_time, archived_words, archived_chars, allowed_windows, cycle_time, cycle_count, collapsed")
+
+
+class SqliteTreeStore:
+    """One tree (e.g. 'problems') inside the SQLite database. Used by NodeService instead of its JSON file."""
+    def __init__(self, repository, tree):
+        self.repository = repository
+        self.tree = tree
+
+    def load_tree(self):
+        """Returns the roots as Node.to_dict()-shaped dicts, or None if the tree was never stored."""
+        conn = self.repository.conn
+        rows = conn.execute(f"SELECT {NODE_COLUMNS} FROM nodes WHERE tree = ? ORDER BY position", (self.tree,)).fetchall()
+        if not rows:
+            return None
+
+        intentions = {}
+        for node_uid, text, status, time, words, chars, completed_at in conn.execute(
+                "SELECT node_uid, text, status, time, words, chars, completed_at FROM intentions "
+                "WHERE tree = ? ORDER BY node_uid, position", (self.tree,)):
+            intention = {"text": text, "status": status, "stats": {"time": time, "words": words, "chars": chars}}
+            if completed_at:
+                intention["completed_at"] = completed_at
+            intentions.setdefault(node_uid, []).append(intention)
+
+        # Rows are ordered by position, so appending keeps every children list in order
+        built = {}
+        parents = []
+        for row in rows:
+            (_, uid, parent_uid, _, label, status, description, x, y, width, height,
+             a_time, a_words, a_chars, allowed_windows, cycle_time, cycle_count, collapsed) = row
+            built[uid] = {
+                "label": label, "uid": uid, "status": status, "description": description,
+                "x": x, "y": y, "width": width, "height": height,
+                "intentions": intentions.get(uid, []),
+                "archived_stats": {"time": a_time, "words": a_words, "chars": a_chars},
+                "allowed_windows": json.loads(allowed_windows),
+                "cycle_time": cycle_time, "cycle_count": cycle_count, "collapsed": bool(collapsed),
+                "children": [],
+            }
+            parents.append((uid, parent_uid))
+
+        roots = []
+        for uid, parent_uid in parents:
+            parent = built.get(parent_uid) if parent_uid else None
+            if parent:
+                parent["children"].append(built[uid])
+            else:
+                roots.append(built[uid]) # Orphans are promoted rather than lost
+        return roots
+
+    def save_tree(self, roots, nodes, dirty_uids, removed_uids, full=False):
+        """
+        Row-level write: only nodes in dirty_uids are upserted (with their intentions),
+        removed_uids are deleted. full=True rewrites the whole tree (after undo/redo).
+        """
+        conn = self.repository.conn
+        with conn:
+            if full:
+                conn.execute("DELETE FROM nodes WHERE tree = ?", (self.tree,))
+                conn.execute("DELETE FROM intentions WHERE tree = ?", (self.tree,))
+                targets = list(nodes.values())
+            else:
+                gone = [(self.tree, uid) for uid in removed_uids if uid not in nodes]
+                conn.executemany("DELETE FROM nodes WHERE tree = ? AND uid = ?", gone)
+                conn.executemany("DELETE FROM intentions WHERE tree = ? AND node_uid = ?", gone)
+                targets = [nodes[uid] for uid in dirty_uids if uid in nodes]
+
+            node_rows, intention_rows = [], []
+            positions = {} # id(parent) -> {id(child): index}, built once per sibling list
+            for node in targets:
+                index = positions.get(id(node.parent))
+                if index is None:
+                    siblings = node.parent.children if node.parent else roots
+                    index = positions[id(node.parent)] = {id(child): i for i, child in enumerate(siblings)}
+                node_rows.append(self._node_row(node, index[id(node)]))
+                for position, intention in enumerate(node.intentions):
+                    stats = intention.stats
+                    intention_rows.append((self.tree, node.uid, position, intention.text, intention.status,
+                                           stats.time, stats.words, stats.chars, intention.completed_at))
+
+            if not full:
+                conn.executemany("DELETE FROM intentions WHERE tree = ? AND node_uid = ?",
+                                 [(self.tree, node.uid) for node in targets])
+            conn.executemany(f"INSERT OR REPLACE INTO nodes ({NODE_COLUMNS}) VALUES ({', '.join('?' * 18)})", node_rows)
+            conn.executemany("INSERT INTO intentions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", intention_rows)
+
+    def _node_row(self, node, position):
+        stats = node.archived_stats
+        return (self.tree, node.uid, node.parent.uid if node.parent else None, position,
+                node.label, node.status, node.description, node.x, node.y, node.width, node.height,
+                stats.time, stats.words, stats.chars, json.dumps(node.allowed_windows),
+                node.cycle_time, node.cycle_count, int(node.collapsed))
+
+    def import_roots(self, root_dicts):
+        """Bulk insert of Node.to_dict() data (JSON migration)."""
+        conn = self.repository.conn
+        node_rows, intention_rows = [], []
+        stack = [(data, None, position) for position, data in enumerate(root_dicts)]
+        while stack:
+            data, parent_uid, position = stack.pop()
+            uid = data.get("uid") or str(uuid.uuid4()) # Very old files predate uids
+            stats = data.get("archived_stats") or {}
+            node_rows.append((self.tree, uid, parent_uid, position,
+                              data.get("label", "Unknown"), data.get("status", "neutral"), data.get("description", ""),
+                              data.get("x", 0), data.get("y", 0), data.get("width", 100), data.get("height", 40),
+                              stats.get("time", 0), stats.get("words", 0), stats.get("chars", 0),
+                              json.dumps(data.get("allowed_windows", [])),
+                              data.get("cycle_time", 0), data.get("cycle_count", 0), int(data.get("collapsed", False))))
+            for i, intention in enumerate(data.get("intentions", [])):
+                i_stats = intention.get("stats") or {}
+                intention_rows.append((self.tree, uid, i, intention.get("text", ""), intention.get("status", "active"),
+                                       i_stats.get("time", 0), i_stats.get("words", 0), i_stats.get("chars", 0),
+                                       intention.get("completed_at")))
+            stack.extend((child, uid, i) for i, child in enumerate(data.get("children", [])))
+        with conn:
+            conn.execute("DELETE FROM nodes WHERE tree = ?", (self.tree,))
+            conn.execute("DELETE FROM intentions WHERE tree = ?", (self.tree,))
+            conn.executemany(f"INSERT OR REPLACE INTO nodes ({NODE_COLUMNS}) VALUES ({', '.join('?' * 18)})", node_rows)
+            conn.executemany("INSERT OR REPLACE INTO intentions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", intention_rows)
+
+
+class SqliteRepository:
+    """
+    Adapter for SQLite-based storage of application data (alternative to JsonRepository).
+    One WAL-mode database holds the trees, intentions, history, session logs and small documents,
+    so changes are written as rows instead of rewriting whole files.
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL") # Safe with WAL; a crash loses at most the last commit
+        self.conn.executescript(SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(intentions)")]
+        if "completed_at" not in columns: # Databases created before intentions were archived
+            self.conn.execute("ALTER TABLE intentions ADD COLUMN completed_at TEXT")
+        self.tree_stores = {}
+        self._owner_thread = threading.get_ident()
+        self._local = threading.local() # Connections for other threads (settings flushes)
+
+    def close(self):
+        self.conn.close()
+
+    def tree_store(self, tree):
+        if tree not in self.tree_stores:
+            self.tree_stores[tree] = SqliteTreeStore(self, tree)
+        return self.tree_stores[tree]
+
+    def _thread_conn(self):
+        """self.conn on the thread that opened it, otherwise a per-thread connection (sqlite3 objects can't cross threads)."""
+        if threading.get_ident() == self._owner_thread:
+            return self.conn
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10) # Waits out a write in progress on the main connection
+            self._local.conn = conn
+        return conn
+
+    # --- Documents (small whole values) ---
+    def load_document(self, name, default=None):
+        row = self._thread_conn().execute("SELECT data FROM documents WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def save_document(self, name, data):
+        conn = self._thread_conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO documents (name, data) VALUES (?, ?)", (name, json.dumps(data)))
+
+    # --- JsonRepository interface ---
+    def save_focus_stats(self, total_seconds, active_seconds, words, chars):
+        self.save_document("focus", {
+            "date": datetime.date.today().isoformat(),
+            "total_seconds": total_seconds,
+            "active_seconds": active_seconds,
+            "words": words,
+            "chars": chars
+        })
+
+    def load_focus_stats(self):
+        return self.load_document("focus")
+
+    def save_tree(self, roots_dict_list):
+        self.tree_store("problems").import_roots(roots_dict_list)
+
+    def load_tree(self):
+        return self.tree_store("problems").load_tree()
+
+    def load_app_state(self):
+        return self.load_document("app_state", {})
+
+    def save_app_state(self, state):
+        self.save_document("app_state", state)
+
+    def load_restriction_config(self):
+        return self.load_document("restrict_config")
+
+    def save_restriction_config(self, data):
+        self.save_document("restrict_config", data)
+
+    def append_session_log(self, entry):
+        with self.conn:
+            self.conn.execute("INSERT INTO sessions (timestamp, outcome, duration_mins) VALUES (?, ?, ?)",
+                              (entry.get("timestamp"), entry.get("outcome"), entry.get("duration_mins")))
+
+    def iter_session_logs(self, start=None, end=None):
+        """Streams session reviews whose day is within [start, end] (dates or ISO strings)."""
+        start_day = SessionLog._as_day(start) or ""
+        end_day = SessionLog._as_day(end)
+        # Timestamps are ISO strings, so "< the next day" covers every time on end_day
+        stop = (datetime.date.fromisoformat(end_day) + datetime.timedelta(days=1)).isoformat() if end_day else "\uffff"
+        cursor = self.conn.execute(
+            "SELECT timestamp, outcome, duration_mins FROM sessions WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+            (start_day, stop))
+        for t, o, d in cursor:
+            yield {"timestamp": t, "outcome": o, "duration_mins": d}
+
+    # --- History (HistoryRecorder store) ---
+    def append_history(self, points):
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO history VALUES (?, ?, ?, ?, ?, ?)",
+                                  [tuple(pt) + (None,) * (6 - len(pt)) for pt in points])
+
+    def load_history(self, since):
+        return self.conn.execute("SELECT * FROM history WHERE ts >= ? ORDER BY ts", (since,)).fetchall()
+
+    # --- Migration ---
+    def migrate_from_json(self):
+        """
+        One-shot import of the JSON files into an empty database.
+        The files are left in place; a marker document makes later calls no-ops.
+        """
+        if self.load_document("migrated_from_json"):
+            return False
+
+        def _read(path):
+            if not os.path.exists(path):
+                return None
+            try:
+                return read_file(path)
+            except (OSError, SerializationError) as e:
+                print(f"SqliteRepository: Skipping {path} during migration: {e}")
+                return None
+
+        for tree, path in (("problems", TREE_DATA_PATH), ("values", VALUES_DATA_PATH)):
+            try:
+                data = TreeJournal(path).load_tree() # Checkpoint plus anything journaled after it
+            except (OSError, SerializationError) as e:
+                print(f"SqliteRepository: Skipping {path} during migration: {e}")
+                data = None
+            if data:
+                self.tree_store(tree).import_roots(data if isinstance(data, list) else [data])
+
+        focus = _read(FOCUS_DATA_PATH)
+        if focus:
+            self.save_document("focus", focus)
+        history = _read(STATS_HISTORY_PATH)
+        if history:
+            self.append_history(history)
+        with self.conn:
+            self.conn.executemany("INSERT INTO sessions (timestamp, outcome, duration_mins) VALUES (?, ?, ?)",
+                                  [(e.get("timestamp"), e.get("outcome"), e.get("duration_mins"))
+                                   for e in SessionLog(SESSION_LOG_PATH, legacy_path=SESSION_LOGS_PATH).iter_entries()])
+        app_state = _read(APP_STATE_PATH)
+        if app_state:
+            self.save_app_state(app_state)
+        restrict = _read(RESTRICT_CONFIG_PATH) or _read(LEGACY_RESTRICT_CONFIG_PATH)
+        if restrict:
+            self.save_restriction_config(restrict)
+
+        self.save_document("migrated_from_json", {"date": datetime.datetime.now().isoformat()})
+        print(f"SqliteRepository: Migrated JSON data into {self.db_path}")
+        return True
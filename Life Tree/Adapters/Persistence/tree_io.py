@@ -0,0 +1,176 @@
+import os
+import csv
+import json
+import uuid
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
+from Core.Services.node_service import TreeFormatError # Also raised for malformed records by import_records
+
+CSV_COLUMNS = ["uid", "parent", "label", "status", "description"]
+INDENT = "    "
+
+
+def _decoded(f):
+    """Lines of a text file; bytes that aren't UTF-8 fail the import like any other malformed content."""
+    try:
+        yield from f
+    except UnicodeDecodeError as e:
+        raise TreeFormatError(f"Not a UTF-8 text file: {e}") from e
+
+
+# --- Readers: stream flat records {"uid", "parent", "label", ...} in file order ---
+def read_opml(f):
+    """<outline text=... _uid=... _status=... _note=...> elements, nested for children."""
+    stack = [] # Source uids of the open outlines
+    body = None
+    try:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if elem.tag == "body":
+                body = elem
+            if elem.tag != "outline":
+                continue
+            if event == "start":
+                uid = elem.get("_uid") or str(uuid.uuid4()) # Outlines from other tools carry no uid
+                yield {"uid": uid, "parent": stack[-1] if stack else None,
+                       "label": elem.get("text") or elem.get("title") or "Unknown",
+                       "status": elem.get("_status", "neutral"), "description": elem.get("_note", "")}
+                stack.append(uid)
+            else:
+                stack.pop()
+                elem.clear()
+                if not stack and body is not None:
+                    body.clear() # Finished top-level outlines are dropped, so memory stays flat
+    except ET.ParseError as e:
+        raise TreeFormatError(f"Invalid OPML: {e}") from e
+
+
+def read_indented(f):
+    """One label per line; children are indented deeper than their parent (tabs count as 4 spaces)."""
+    stack = [] # (indent, uid) of the current ancestors
+    for line in _decoded(f):
+        line = line.rstrip("\r\n").expandtabs(4)
+        label = line.strip()
+        if not label:
+            continue
+        indent = len(line) - len(line.lstrip(" "))
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        if label[:2] in ("- ", "* "):
+            label = label[2:].strip()
+        uid = str(uuid.uuid4())
+        yield {"uid": uid, "parent": stack[-1][1] if stack else None, "label": label}
+        stack.append((indent, uid))
+
+
+def read_csv(f):
+    """Edge list with a header row: uid, parent, label[, status, description]. Rows may come in any order."""
+    reader = csv.DictReader(_decoded(f))
+    try:
+        if not reader.fieldnames or "label" not in reader.fieldnames:
+            raise TreeFormatError("CSV needs a header row with at least a 'label' column")
+        for row in reader:
+            record = {"uid": row.get("uid") or None, "parent": row.get("parent") or row.get("parent_uid") or None,
+                      "label": row.get("label") or "Unknown"}
+            for field in ("status", "description"):
+                if row.get(field):
+                    record[field] = row[field]
+            yield record
+    except csv.Error as e:
+        raise TreeFormatError(f"Invalid CSV: {e}") from e
+
+
+def read_jsonl(f):
+    """One JSON object per line: Node fields plus "parent" (the parent's uid). Torn lines are skipped."""
+    for line in _decoded(f):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            record.pop("children", None)
+            yield record
+
+
+# --- Writers: take (depth, parent uid, fields) in pre-order, see NodeService.iter_export ---
+def write_opml(f, rows, title="Life Tree"):
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n<opml version="2.0">\n')
+    f.write(f"  <head><title>{escape(title)}</title></head>\n  <body>\n")
+    open_depths = [] # Depths of outlines whose closing tag is still due
+    for depth, _, fields in rows:
+        while open_depths and open_depths[-1] >= depth:
+            f.write(f"{'  ' * (open_depths.pop() + 2)}</outline>\n")
+        attributes = f"text={quoteattr(fields.get('label', ''))} _uid={quoteattr(fields.get('uid', ''))}"
+        attributes += f" _status={quoteattr(fields.get('status', 'neutral'))}"
+        if fields.get("description"):
+            attributes += f" _note={quoteattr(fields['description'])}"
+        f.write(f"{'  ' * (depth + 2)}<outline {attributes}>\n")
+        open_depths.append(depth)
+    while open_depths:
+        f.write(f"{'  ' * (open_depths.pop() + 2)}</outline>\n")
+    f.write("  </body>\n</opml>\n")
+
+
+def write_indented(f, rows):
+    for depth, _, fields in rows:
+        f.write(INDENT * depth + " ".join(fields.get("label", "").split()) + "\n")
+
+
+def write_csv(f, rows):
+    writer = csv.writer(f)
+    writer.writerow(CSV_COLUMNS)
+    for _, parent_uid, fields in rows:
+        writer.writerow([fields.get("uid", ""), parent_uid or "", fields.get("label", ""),
+                         fields.get("status", "neutral"), fields.get("description", "")])
+
+
+def write_jsonl(f, rows):
+    for _, parent_uid, fields in rows:
+        record = {"parent": parent_uid}
+        record.update(fields)
+        f.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+
+# Extension -> (reader, writer, open in binary for reading)
+FORMATS = {
+    ".opml": (read_opml, write_opml, True),
+    ".txt": (read_indented, write_indented, False),
+    ".csv": (read_csv, write_csv, False),
+    ".jsonl": (read_jsonl, write_jsonl, False),
+}
+FILE_FILTER = "Trees (*.opml *.txt *.csv *.jsonl)"
+
+
+def _format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise TreeFormatError(f"Unsupported tree format '{ext}' (use {', '.join(FORMATS)})")
+    return FORMATS[ext]
+
+
+def import_tree(service, path, parent=None):
+    """Streams path (format picked by extension) into service below parent. Returns the number of nodes added."""
+    reader, _, binary = _format(path)
+    if binary:
+        with open(path, 'rb') as f:
+            return service.import_records(reader(f), parent)
+    newline = "" if reader is read_csv else None
+    with open(path, 'r', encoding='utf-8-sig', newline=newline) as f:
+        return service.import_records(reader(f), parent)
+
+
+def export_tree(service, path, node=None):
+    """Writes node's subtree (the whole tree below the root by default) to path. Returns the number of nodes written."""
+    _, writer, _ = _format(path)
+    count = 0
+
+    def _rows():
+        nonlocal count
+        for row in service.iter_export(node):
+            count += 1
+            yield row
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline="" if writer is write_csv else None) as f:
+        writer(f, _rows())
+    os.replace(tmp_path, path)
+    return count
@@ -0,0 +1,110 @@
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import Qt, QTimer
+from collections import deque
+import csv
+import time
+from Infrastructure.variables import CANVAS_STATS_PATH, CANVAS_STATS_MAX_ROWS
+
+CSV_FIELDS = ["timestamp", "paint_ms_avg", "paint_ms_max", "fps", "scene_items",
+              "layout_ms", "percentage_ms", "items_ms"]
+
+
+class CanvasStatsOverlay(QLabel):
+    """
+    Frame-time and scene statistics drawn over the Tree view (toggled with F3).
+    Samples once per second and keeps the last CANVAS_STATS_MAX_ROWS samples as a rolling CSV.
+    """
+    def __init__(self, tree):
+        super().__init__(tree)
+        self.tree = tree
+        self.csv_path = CANVAS_STATS_PATH
+        
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.setStyleSheet("""
+            QLabel {
+                background-color: rgba(30, 30, 30, 200);
+                border: 1px solid #444;
+                border-radius: 6px;
+                color: #e0e0e0;
+                font-family: 'Consolas', monospace;
+                font-size: 11px;
+                padding: 6px 10px;
+            }
+        """)
+        
+        self.paint_times = [] # Seconds per frame since the last sample
+        self.frame_stamps = deque(maxlen=1000) # perf_counter() of frames painted during pan/zoom
+        self.samples = deque(maxlen=CANVAS_STATS_MAX_ROWS)
+        self._unsaved = 0
+        
+        self.sample_timer = QTimer(self)
+        self.sample_timer.timeout.connect(self.sample)
+        self.hide()
+
+    def set_enabled(self, enabled):
+        if enabled:
+            self.paint_times = []
+            self.frame_stamps.clear()
+            self.sample()
+            self.move(10, 10)
+            self.show()
+            self.raise_()
+            self.sample_timer.start(1000)
+        else:
+            self.sample_timer.stop()
+            self.hide()
+            self.export_csv()
+
+    def record_frame(self, seconds, interacting):
+        self.paint_times.append(seconds)
+        if interacting:
+            self.frame_stamps.append(time.perf_counter())
+
+    def fps(self):
+        """Frames painted in the last second of panning/zooming (0 when idle)."""
+        now = time.perf_counter()
+        return sum(1 for stamp in self.frame_stamps if now - stamp <= 1.0)
+
+    def sample(self):
+        paint_times, self.paint_times = self.paint_times, []
+        timings = self.tree.last_layout_timings
+        row = {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "paint_ms_avg": round(sum(paint_times) / len(paint_times) * 1000, 2) if paint_times else 0,
+            "paint_ms_max": round(max(paint_times) * 1000, 2) if paint_times else 0,
+            "fps": self.fps(),
+            "scene_items": len(self.tree.scene.items()),
+            "layout_ms": round(timings.get("layout", 0) * 1000, 2),
+            "percentage_ms": round(timings.get("percentage", 0) * 1000, 2),
+            "items_ms": round(timings.get("items", 0) * 1000, 2),
+        }
+        self.samples.append(row)
+        
+        self.setText(
+            f"paint   {row['paint_ms_avg']:.2f} ms (max {row['paint_ms_max']:.2f})\n"
+            f"fps     {row['fps']} (pan/zoom)\n"
+            f"items   {row['scene_items']}\n"
+            f"layout  {row['layout_ms']:.2f} ms\n"
+            f"percent {row['percentage_ms']:.2f} ms\n"
+            f"create  {row['items_ms']:.2f} ms"
+        )
+        self.adjustSize()
+        
+        # Flush every 10 samples so a crash loses at most a few seconds
+        self._unsaved += 1
+        if self._unsaved >= 10:
+            self.export_csv()
+
+    def export_csv(self):
+        """Rewrites the CSV with the rolling window of samples."""
+        if not self.samples:
+            return
+        try:
+            with open(self.csv_path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.samples)
+            self._unsaved = 0
+        except Exception as e:
+            print(f"CanvasStatsOverlay: Failed to export stats: {e}")
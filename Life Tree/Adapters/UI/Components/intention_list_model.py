@@ -0,0 +1,166 @@
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt6.QtGui import QBrush, QColor, QFont, QFontMetrics, QLinearGradient, QPainter
+
+# Same role numbers the dashboard used to keep on its QListWidgetItems
+StatusRole = Qt.ItemDataRole.UserRole
+StatsRole = Qt.ItemDataRole.UserRole + 1
+NodeRole = Qt.ItemDataRole.UserRole + 2
+TextRole = Qt.ItemDataRole.UserRole + 3
+CompletedAtRole = Qt.ItemDataRole.UserRole + 4
+IntentionRole = Qt.ItemDataRole.UserRole + 5
+
+
+class IntentionListModel(QAbstractListModel):
+    """
+    The dashboard's intentions as (source node, Intention) rows. Rows reference the Intention
+    objects themselves, and the view only asks for the rows it shows.
+    Rows are kept stably partitioned, completed first: a status change is one row move (see settle()),
+    which the view's selection and current index follow on their own.
+    """
+    def __init__(self, owner_node=None, tooltip=None, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.completed_count = 0 # Rows [0, completed_count) are the completed block
+        self.owner_node = owner_node # Rows from other nodes get a "[label]" prefix (root dashboard)
+        self.tooltip = tooltip # (source node, Intention) -> rich text, built on hover only
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.rows):
+            return None
+        source_node, intention = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.label(index.row())
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.tooltip(source_node, intention) if self.tooltip else None
+        if role == StatusRole:
+            return intention.status
+        if role == StatsRole:
+            return intention.stats
+        if role == NodeRole:
+            return source_node
+        if role == TextRole:
+            return intention.text
+        if role == CompletedAtRole:
+            return intention.completed_at
+        if role == IntentionRole:
+            return intention
+        return None
+
+    def label(self, row):
+        source_node, intention = self.rows[row]
+        if self.owner_node is not None and self.owner_node.parent is None and source_node is not self.owner_node:
+            return f"[{source_node.label}] • {intention.text}"
+        return f"• {intention.text}"
+
+    def row_of(self, intention):
+        """Row holding this Intention object (identity, not text), or -1."""
+        return next((row for row, (_, it) in enumerate(self.rows) if it is intention), -1)
+
+    @staticmethod
+    def _is_completed(row_data):
+        return row_data[1].status == "completed"
+
+    # --- Changes ---
+    def set_rows(self, rows):
+        """Replaces every row (one reset), partitioned with completed first and order otherwise kept."""
+        completed = [r for r in rows if self._is_completed(r)]
+        self.beginResetModel()
+        self.rows = completed + [r for r in rows if not self._is_completed(r)]
+        self.completed_count = len(completed)
+        self.endResetModel()
+
+    def append(self, source_node, intention):
+        row = len(self.rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.append((source_node, intention))
+        self.endInsertRows()
+        return self.settle(row)
+
+    def remove(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        removed = self.rows.pop(row)
+        if row < self.completed_count:
+            self.completed_count -= 1
+        self.endRemoveRows()
+        return removed
+
+    def settle(self, row):
+        """
+        Call after the status of row's intention changed: moves the row to the edge of its new
+        block, which is where a stable partition puts it. Returns the row it ended up in.
+        """
+        in_completed_block = row < self.completed_count
+        if self._is_completed(self.rows[row]) == in_completed_block:
+            return row
+        if in_completed_block:
+            # Last completed row: everything that was before it stays before it
+            self.completed_count -= 1
+            target = self.completed_count
+        else:
+            # First after the completed rows it came after
+            target = self.completed_count
+            self.completed_count += 1
+        self.move_row(row, target)
+        return target
+
+    def move_row(self, row, target):
+        if row == target:
+            return
+        # beginMoveRows takes the destination in pre-move coordinates, so moving down is off by one
+        if not self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), target + 1 if target > row else target):
+            return
+        self.rows.insert(target, self.rows.pop(row))
+        self.endMoveRows()
+
+    def row_changed(self, row):
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+
+class IntentionDelegate(QStyledItemDelegate):
+    """Paints intention rows directly (no widget per row): selection gradient, completed rows struck through."""
+    ROW_HEIGHT = 34
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.row_font = QFont("Segoe UI", 10)
+        self.done_font = QFont(self.row_font)
+        self.done_font.setStrikeOut(True)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = option.rect
+        completed = index.data(StatusRole) == "completed"
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+
+        if completed:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(0, 230, 118, 20))
+            painter.drawRoundedRect(rect.adjusted(1, 1, -1, -1), 4, 4)
+        if selected:
+            alpha = 140 if option.state & QStyle.StateFlag.State_Active else 40
+            gradient = QLinearGradient(rect.left(), 0, rect.right(), 0)
+            gradient.setColorAt(0, QColor(255, 152, 0, alpha))
+            gradient.setColorAt(1, QColor(43, 43, 43, 0))
+            painter.fillRect(rect, QBrush(gradient))
+            painter.fillRect(QRect(rect.left(), rect.top(), 6, rect.height()), QColor("#FF9800"))
+
+        painter.setPen(QColor("#333333"))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+
+        font = self.done_font if completed else self.row_font
+        text_rect = rect.adjusted(12 if selected else 6, 0, -6, 0)
+        text = QFontMetrics(font).elidedText(index.data(Qt.ItemDataRole.DisplayRole) or "",
+                                            Qt.TextElideMode.ElideRight, text_rect.width())
+        painter.setFont(font)
+        painter.setPen(QColor("#00E676" if completed else "#e0e0e0"))
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, text)
+        painter.restore()
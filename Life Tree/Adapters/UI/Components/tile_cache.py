@@ -0,0 +1,216 @@
+from PyQt6.QtWidgets import QGraphicsRectItem, QGraphicsLineItem, QGraphicsSimpleTextItem, QGraphicsTextItem
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QRectF, pyqtSignal
+from PyQt6.QtGui import QImage, QPainter, QPixmap, QPen, QBrush, QColor, QFont
+from collections import OrderedDict
+import math
+from Infrastructure.variables import BG_COLOR
+
+TILE_SIZE = 512 # Tile edge in device pixels
+MAX_TILES = 256 # LRU bound on cached pixmaps (~256 MB worst case at 512px ARGB)
+
+
+def capture_items(items):
+    """
+    Converts graphics items into plain, thread-safe drawing primitives.
+    Only static node graphics (boxes, connections, labels, badges) are captured.
+    """
+    prims = []
+    for item in items:
+        if isinstance(item, QGraphicsRectItem):
+            rect = item.sceneBoundingRect()
+            pen = item.pen()
+            prims.append(("box", rect.x(), rect.y(), rect.width(), rect.height(),
+                          item.brush().color().name(), pen.color().name(), pen.widthF(),
+                          pen.style() == Qt.PenStyle.DashLine))
+        elif isinstance(item, QGraphicsLineItem):
+            line = item.line()
+            offset = item.pos()
+            prims.append(("line", line.x1() + offset.x(), line.y1() + offset.y(),
+                          line.x2() + offset.x(), line.y2() + offset.y(),
+                          item.pen().color().name(), item.pen().widthF()))
+        elif isinstance(item, (QGraphicsSimpleTextItem, QGraphicsTextItem)):
+            rect = item.sceneBoundingRect()
+            if isinstance(item, QGraphicsTextItem):
+                text, color = item.toPlainText(), item.defaultTextColor().name()
+            else:
+                text, color = item.text(), item.brush().color().name()
+            font = item.font()
+            prims.append(("text", rect.x(), rect.y(), rect.width(), rect.height(),
+                          text, font.family(), font.pointSizeF(), font.bold(), color))
+    return prims
+
+
+def primitives_bounds(prims):
+    bounds = QRectF()
+    for prim in prims:
+        if prim[0] == "line":
+            rect = QRectF(min(prim[1], prim[3]), min(prim[2], prim[4]),
+                          abs(prim[3] - prim[1]), abs(prim[4] - prim[2]))
+            rect.adjust(-prim[6], -prim[6], prim[6], prim[6])
+        else:
+            rect = QRectF(prim[1], prim[2], prim[3], prim[4])
+        bounds = bounds.united(rect)
+    return bounds
+
+
+class _TileSignals(QObject):
+    finished = pyqtSignal(object, int, object) # key, epoch, QImage
+
+
+class _TileJob(QRunnable):
+    """Paints one tile onto a QImage in a worker thread."""
+    def __init__(self, key, epoch, scene_rect, scale, records, signals):
+        super().__init__()
+        self.key = key
+        self.epoch = epoch
+        self.scene_rect = scene_rect
+        self.scale = scale
+        self.records = records # Immutable snapshot: tuple of (bounds, prims)
+        self.signals = signals
+
+    def run(self):
+        image = QImage(TILE_SIZE, TILE_SIZE, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QColor(BG_COLOR))
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.scale(self.scale, self.scale)
+        painter.translate(-self.scene_rect.x(), -self.scene_rect.y())
+
+        # Lines first so boxes cover them, like the scene's z-order
+        visible = [prims for bounds, prims in self.records if bounds.intersects(self.scene_rect)]
+        for prims in visible:
+            for prim in prims:
+                if prim[0] == "line":
+                    painter.setPen(QPen(QColor(prim[5]), prim[6]))
+                    painter.drawLine(int(prim[1]), int(prim[2]), int(prim[3]), int(prim[4]))
+
+        for prims in visible:
+            for prim in prims:
+                if prim[0] == "box":
+                    pen = QPen(QColor(prim[6]), prim[7])
+                    if prim[8]:
+                        pen.setStyle(Qt.PenStyle.DashLine)
+                    painter.setPen(pen)
+                    painter.setBrush(QBrush(QColor(prim[5])))
+                    painter.drawRect(QRectF(prim[1], prim[2], prim[3], prim[4]))
+                elif prim[0] == "text":
+                    font = QFont(prim[6])
+                    font.setPointSizeF(prim[7])
+                    font.setBold(prim[8])
+                    painter.setFont(font)
+                    painter.setPen(QColor(prim[9]))
+                    painter.drawText(QRectF(prim[1], prim[2], prim[3], prim[4]), Qt.AlignmentFlag.AlignCenter, prim[5])
+        painter.end()
+
+        self.signals.finished.emit(self.key, self.epoch, image)
+
+
+class TileCache(QObject):
+    """
+    Pre-rendered pixmap tiles of the static tree layer, per zoom bucket.
+    Tiles are painted off the GUI thread and invalidated by the region of changed nodes.
+    """
+    tile_ready = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = {} # uid -> (bounds, prims)
+        self.tiles = OrderedDict() # (bucket, tx, ty) -> QPixmap (LRU order)
+        self.pending = set()
+        self.epochs = {} # (bucket, tx, ty) -> int, bumped on invalidation
+        self._snapshot = None
+
+        self.signals = _TileSignals()
+        self.signals.finished.connect(self._on_tile_finished)
+
+    # --- Content ---
+    def update_node(self, uid, items):
+        """(Re)captures a node's static graphics and invalidates old + new regions."""
+        prims = capture_items(items)
+        old = self.records.get(uid)
+        bounds = primitives_bounds(prims)
+        self.records[uid] = (bounds, tuple(prims))
+        self._snapshot = None
+        if old:
+            self.invalidate_rect(old[0])
+        self.invalidate_rect(bounds)
+
+    def remove_node(self, uid):
+        old = self.records.pop(uid, None)
+        if old:
+            self._snapshot = None
+            self.invalidate_rect(old[0])
+
+    def clear(self):
+        self.records.clear()
+        self.tiles.clear()
+        self.pending.clear()
+        self.epochs.clear()
+        self._snapshot = None
+
+    # --- Tiles ---
+    @staticmethod
+    def bucket_for(scale):
+        # Half-octave buckets, rounded up so tiles are never rendered below screen resolution
+        return math.ceil(math.log2(max(scale, 0.01)) * 2)
+
+    @staticmethod
+    def tile_rect(bucket, tx, ty):
+        span = TILE_SIZE / (2 ** (bucket / 2))
+        return QRectF(tx * span, ty * span, span, span)
+
+    def tile_keys(self, scene_rect, scale):
+        bucket = self.bucket_for(scale)
+        span = TILE_SIZE / (2 ** (bucket / 2))
+        x0, x1 = math.floor(scene_rect.left() / span), math.floor(scene_rect.right() / span)
+        y0, y1 = math.floor(scene_rect.top() / span), math.floor(scene_rect.bottom() / span)
+        return [(bucket, tx, ty) for ty in range(y0, y1 + 1) for tx in range(x0, x1 + 1)]
+
+    def covers(self, scene_rect, scale):
+        return all(key in self.tiles for key in self.tile_keys(scene_rect, scale))
+
+    def request(self, scene_rect, scale):
+        """Queues rendering of every missing tile intersecting scene_rect."""
+        if self._snapshot is None:
+            self._snapshot = tuple(self.records.values())
+        for key in self.tile_keys(scene_rect, scale):
+            if key in self.tiles or key in self.pending:
+                continue
+            self.pending.add(key)
+            bucket, tx, ty = key
+            job = _TileJob(key, self.epochs.get(key, 0), self.tile_rect(bucket, tx, ty),
+                           2 ** (bucket / 2), self._snapshot, self.signals)
+            QThreadPool.globalInstance().start(job)
+
+    def paint(self, painter, scene_rect, scale):
+        """Blits cached tiles over scene_rect. Returns False if any tile is still missing."""
+        complete = True
+        for key in self.tile_keys(scene_rect, scale):
+            pixmap = self.tiles.get(key)
+            if pixmap is None:
+                complete = False
+                continue
+            self.tiles.move_to_end(key)
+            painter.drawPixmap(self.tile_rect(*key), pixmap, QRectF(pixmap.rect()))
+        return complete
+
+    def invalidate_rect(self, rect):
+        if rect.isEmpty():
+            return
+        for key in list(self.tiles.keys()) + list(self.pending):
+            if self.tile_rect(*key).intersects(rect):
+                self.tiles.pop(key, None)
+                self.pending.discard(key)
+                self.epochs[key] = self.epochs.get(key, 0) + 1
+
+    def _on_tile_finished(self, key, epoch, image):
+        # Drop results for tiles invalidated while the job was running
+        if epoch != self.epochs.get(key, 0) or key not in self.pending:
+            return
+        self.pending.discard(key)
+        self.tiles[key] = QPixmap.fromImage(image)
+        while len(self.tiles) > MAX_TILES:
+            self.tiles.popitem(last=False)
+        self.tile_ready.emit()
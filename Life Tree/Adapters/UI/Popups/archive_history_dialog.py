@@ -0,0 +1,84 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from Infrastructure.variables import BG_COLOR, CARD_BG_COLOR
+
+PAGE_SIZE = 50
+
+
+class ArchiveHistoryDialog(QDialog):
+    """
+    Completed intentions that NodeService.archive_completed() moved out of the tree,
+    newest first. Only the visible page is read from the archive.
+    """
+    def __init__(self, state_manager, node, parent=None):
+        super().__init__(parent)
+        self.state_manager = state_manager
+        self.node = node
+        self.start = 0
+        self.total = 0
+
+        self.setWindowTitle(f"Archived History - {node.label}")
+        self.resize(460, 520)
+        self.setStyleSheet(f"""
+            QDialog {{ background-color: {BG_COLOR}; }}
+            QLabel {{ color: #cccccc; background: transparent; }}
+            QListWidget {{
+                background-color: {CARD_BG_COLOR};
+                color: #e0e0e0;
+                border: 1px solid #333;
+                border-radius: 8px;
+                padding: 4px;
+            }}
+            QPushButton {{
+                background-color: #2a2a35;
+                border: 1px solid #3a3a45;
+                border-radius: 4px;
+                padding: 6px 12px;
+                color: white;
+            }}
+            QPushButton:hover {{ background-color: #3a3a45; }}
+            QPushButton:disabled {{ color: #666; }}
+        """)
+
+        layout = QVBoxLayout(self)
+        self.list = QListWidget()
+        self.list.setFont(QFont("Segoe UI", 10))
+        layout.addWidget(self.list)
+
+        nav = QHBoxLayout()
+        self.btn_prev = QPushButton("< Newer")
+        self.btn_prev.clicked.connect(lambda: self.show_page(self.start - PAGE_SIZE))
+        self.btn_next = QPushButton("Older >")
+        self.btn_next.clicked.connect(lambda: self.show_page(self.start + PAGE_SIZE))
+        self.lbl_range = QLabel()
+        self.lbl_range.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        nav.addWidget(self.btn_prev)
+        nav.addWidget(self.lbl_range, 1)
+        nav.addWidget(self.btn_next)
+        layout.addLayout(nav)
+
+        self.show_page(0)
+
+    def show_page(self, start):
+        self.total = self.state_manager.archived_count(self.node)
+        self.start = max(0, min(start, self.total - 1)) if self.total else 0
+        entries = self.state_manager.archived_intentions(self.node, self.start, PAGE_SIZE)
+
+        self.list.clear()
+        for entry in entries:
+            stats = entry.get("stats") or {}
+            minutes = int(stats.get("time", 0) // 60)
+            completed = (entry.get("completed_at") or "")[:10]
+            source = self.state_manager.get(entry.get("uid"))
+            prefix = f"[{source.label}] " if source and source is not self.node else ""
+            item = QListWidgetItem(f"{completed}  {prefix}{entry.get('text', '')}")
+            item.setToolTip(f"Time: {minutes}m\nWords: {stats.get('words', 0)}\nChars: {stats.get('chars', 0)}")
+            self.list.addItem(item)
+
+        if self.total:
+            self.lbl_range.setText(f"{self.start + 1}–{self.start + len(entries)} of {self.total}")
+        else:
+            self.lbl_range.setText("Nothing archived yet")
+        self.btn_prev.setEnabled(self.start > 0)
+        self.btn_next.setEnabled(self.start + PAGE_SIZE < self.total)
@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import QGraphicsRectItem, QGraphicsSimpleTextItem, QGraphic
 from PyQt6.QtGui import QBrush, QPen, QColor, QFont
 from PyQt6.QtCore import Qt
 import datetime
+from Core.Entities.tree_traversal import iter_preorder
 from Infrastructure.variables import BG_COLOR, CARD_BG_COLOR, TEXT_COLOR, PRIMARY_COLOR, SECONDARY_COLOR, BORDER_COLOR
 
 class NodeHoverPopup(QGraphicsRectItem):
@@ -38,7 +39,7 @@ class NodeHoverPopup(QGraphicsRectItem):
             status = "Information"
         
         # Always aggregate stats recursively so parents show subtree totals
-        stats = self._aggregate_stats_recursive(node)
+        stats = self._aggregate_subtree_stats(node)
         
         # Determine Prefix based on root label or depth
         if node.parent is None:
@@ -47,11 +48,11 @@ class NodeHoverPopup(QGraphicsRectItem):
              prefix = ""
 
         # Dynamic Time Formatting
-        time_sec = stats["time"]
+        time_sec = stats.time
         time_str = self.format_time(time_sec)
         
-        words = stats["words"]
-        chars = stats["chars"]
+        words = stats.words
+        chars = stats.chars
 
         self.title_item.setText(f"{prefix}{status}")
         if show_status:
@@ -81,29 +82,17 @@ class NodeHoverPopup(QGraphicsRectItem):
             self.setRect(0, 0, 160, 85)
 
     def _get_node_intentions_stats(self, node):
-        totals = {"time": 0, "words": 0, "chars": 0}
+        # Start from archived stats (from cleared intentions and deleted children)
+        totals = node.archived_stats.copy()
         
-        # Add archived stats (from cleared intentions and deleted children)
-        archived = getattr(node, 'archived_stats', {"time": 0, "words": 0, "chars": 0})
-        totals['time'] += archived.get('time', 0)
-        totals['words'] += archived.get('words', 0)
-        totals['chars'] += archived.get('chars', 0)
-        
-        # Add stats from active intentions
-        for intent in getattr(node, 'intentions', []):
-            stats = intent.get('stats', {})
-            totals['time'] += stats.get('time', 0)
-            totals['words'] += stats.get('words', 0)
-            totals['chars'] += stats.get('chars', 0)
+        # Add stats from active intentions (cached aggregate, so hovering doesn't load every descendant)
+        totals.add(node.intention_totals())
         return totals
 
-    def _aggregate_stats_recursive(self, node):
+    def _aggregate_subtree_stats(self, node):
         totals = self._get_node_intentions_stats(node)
-        for child in node.children:
-            child_totals = self._aggregate_stats_recursive(child)
-            totals['time'] += child_totals['time']
-            totals['words'] += child_totals['words']
-            totals['chars'] += child_totals['chars']
+        for descendant in iter_preorder(node.children):
+            totals.add(self._get_node_intentions_stats(descendant))
         return totals
 
     def format_time(self, seconds):
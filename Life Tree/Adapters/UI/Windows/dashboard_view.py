@@ -1,16 +1,21 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QFrame, QLineEdit, QListWidget, QListWidgetItem, QGridLayout, QSizePolicy, QMenu
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QFrame, QLineEdit, QListView, QGridLayout, QSizePolicy, QMenu
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QPoint
 from PyQt6.QtGui import QFont, QColor, QAction
-import os
 
 from Core.Services.timer_engine import TimerEngine, PomodoroPhase
 from Adapters.Sensors.idle_detector import IdleDetector
 from Adapters.Sensors.keyboard_listener import KeyboardListener
 from Core.Services.percentage_engine import calculate_node_percentage
+from Core.Entities.intention import Stats
+from Core.Entities.tree_traversal import iter_preorder
 from Adapters.UI.Components.percentage_ui import RotatingProgressCircle
+from Adapters.UI.Components.intention_list_model import IntentionListModel, IntentionDelegate, StatusRole
+from Adapters.Persistence.json_repository import JsonRepository
+from Core.Services.settings_store import SettingsStore
 from Infrastructure.variables import BG_COLOR, CARD_BG_COLOR, TEXT_COLOR, ACCENT_COLOR, PRIMARY_COLOR, SECONDARY_COLOR, DANGER_COLOR
 import pygetwindow as gw
 from Adapters.UI.Popups.distraction_ui import DistractionWarning
+from Adapters.UI.Popups.archive_history_dialog import ArchiveHistoryDialog
 
 class PomodoroWindow(QWidget):
     moved = pyqtSignal()
@@ -21,7 +26,7 @@ class PomodoroWindow(QWidget):
 
     focus_started = pyqtSignal()
 
-    def __init__(self, node, roots, active_tracker, word_tracker, state_manager=None, pomodoro_session=None, show_percentages=True, parent=None):
+    def __init__(self, node, roots, active_tracker, word_tracker, state_manager=None, pomodoro_session=None, show_percentages=True, settings=None, parent=None):
         super().__init__(parent)
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True) # Required for background-color to work
         if parent:
@@ -30,6 +35,7 @@ class PomodoroWindow(QWidget):
         self.node = node
         self.roots = roots
         self.state_manager = state_manager
+        self.settings = settings if settings else SettingsStore(JsonRepository()) # Restriction config
         node_label = node.label if hasattr(node, 'label') else str(node)
         
         # Logic Initialization
@@ -62,12 +68,9 @@ class PomodoroWindow(QWidget):
         self.distraction_warning.add_allowed_requested.connect(self.add_allowed_window)
         
         # Restriction Feature Initialization
-        self._load_restriction_config()
-        # Initialize engine state from config if not already set (e.g. if switching nodes)
         # Note: self.restriction_armed is still used for local UI tracking if needed, 
         # but we primary use self.pomodoro_session.restriction_armed
-        self.restricted_keywords = ["facebook", "spank", "antigravity", "zoechip", "youtube"]
-        self._load_restriction_config() # Re-load to get keywords and potentially 'armed' state
+        self._load_restriction_config() # Keywords and potentially 'armed' state (cached, no disk read)
         
         self.restrict_timer = QTimer(self)
         self.restrict_timer.timeout.connect(self._check_restrictions)
@@ -425,33 +428,23 @@ class PomodoroWindow(QWidget):
             self.btn_add_intention.setEnabled(False)
             self.btn_add_intention.setStyleSheet("background-color: #1a1a1a; color: #444;")
         
-        # List Area
-        self.intentions_list = QListWidget()
+        # List Area: a model over the Intention objects, painted by a delegate (only visible rows cost anything)
+        self.intentions_model = IntentionListModel(self.node, tooltip=self.intention_tooltip, parent=self)
+        self.intentions_list = QListView()
+        self.intentions_list.setModel(self.intentions_model)
+        self.intentions_list.setItemDelegate(IntentionDelegate(self.intentions_list))
+        self.intentions_list.setUniformItemSizes(True)
         self.intentions_list.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.intentions_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 background-color: #2b2b2b;
                 border: 1px solid #3d3d3d;
                 border-radius: 4px;
                 padding: 5px;
                 outline: none;
             }
-            QListWidget::item {
-                border-bottom: 1px solid #333;
-                padding: 4px;
-                background-color: transparent;
-            }
-
-            QListWidget::item:selected {
-                background: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 rgba(255, 152, 0, 140), stop:1 rgba(43, 43, 43, 0));
-                border-left: 6px solid #FF9800;
-            }
-            QListWidget::item:selected:!active {
-                background: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 rgba(255, 152, 0, 40), stop:1 rgba(43, 43, 43, 0));
-                border-left: 6px solid #FF9800;
-            }
         """)
-        self.intentions_list.currentItemChanged.connect(self.update_active_intention)
+        self.intentions_list.selectionModel().currentChanged.connect(self.update_active_intention)
         self.intentions_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.intentions_list.customContextMenuRequested.connect(self.show_context_menu)
         layout.addWidget(self.intentions_list)
@@ -459,39 +452,38 @@ class PomodoroWindow(QWidget):
         # Load existing intentions
         self._is_loading = True
         self.load_intentions()
-        self.intentions_list.setCurrentRow(-1) # Ensure nothing is selected on load
+        self.set_current_row(-1) # Ensure nothing is selected on load
         self._is_loading = False
+
+    # --- Intention list selection ---
+    def current_row(self):
+        """Row of the selected intention, or -1."""
+        return self.intentions_list.currentIndex().row()
+
+    def set_current_row(self, row):
+        if 0 <= row < self.intentions_model.rowCount():
+            self.intentions_list.setCurrentIndex(self.intentions_model.index(row))
+        else:
+            self.intentions_list.selectionModel().clear()
+
+    def current_intention(self):
+        """(source node, Intention) of the selected row, or None."""
+        row = self.current_row()
+        return self.intentions_model.rows[row] if row >= 0 else None
     
     def clear_intentions(self):
-        # Archive stats from all intentions before clearing
-        for i in range(self.intentions_list.count()):
-            item = self.intentions_list.item(i)
-            stats = item.data(Qt.ItemDataRole.UserRole + 1)
-            source_node = item.data(Qt.ItemDataRole.UserRole + 2)
-            
-            # Determine which node to archive stats to
-            target_node = source_node if source_node else self.node
-            if target_node.parent is None:
-                # Skip archiving to root - stats should go to source nodes
-                continue
-                
-            if stats:
-                # Ensure archived_stats exists
-                if not hasattr(target_node, 'archived_stats'):
-                    target_node.archived_stats = {"time": 0, "words": 0, "chars": 0}
-                target_node.archived_stats["time"] += stats.get("time", 0)
-                target_node.archived_stats["words"] += stats.get("words", 0)
-                target_node.archived_stats["chars"] += stats.get("chars", 0)
-
-        self.intentions_list.clear()
-        self.node.intentions = []
+        # Every node with a row here (all of them on the root dashboard); their stats are kept as archived_stats
+        source_nodes = list({id(n): n for n, _ in self.intentions_model.rows}.values())
+        if self.node.parent is not None and self.node not in source_nodes:
+            source_nodes.append(self.node)
+        self.intentions_model.set_rows([])
+        self.state_manager.clear_intentions(source_nodes)
         
         # Update UI state
         self.lbl_current_intention.setText("Ready to Focus")
         self.btn_complete.setEnabled(False)
         
         self.update_ui()
-        self.save_intentions_to_node()
 
     def show_context_menu(self, position: QPoint):
         menu = QMenu(self)
@@ -500,11 +492,11 @@ class PomodoroWindow(QWidget):
             QMenu::item:selected { background-color: #3d3d3d; }
         """)
         
-        item = self.intentions_list.itemAt(position)
+        index = self.intentions_list.indexAt(position)
         
-        if item:
+        if index.isValid():
             action_clear = QAction("Clear", self)
-            action_clear.triggered.connect(lambda: self.remove_intention(item))
+            action_clear.triggered.connect(lambda: self.remove_intention(index.row()))
             menu.addAction(action_clear)
         
         # Always show Clear All
@@ -512,18 +504,22 @@ class PomodoroWindow(QWidget):
         action_clear_all.triggered.connect(self.clear_intentions)
         menu.addAction(action_clear_all)
         
-        menu.exec(self.intentions_list.mapToGlobal(position))
+        if self.state_manager:
+            menu.addSeparator()
+            action_history = QAction("Archived History...", self)
+            action_history.triggered.connect(self.show_archived_history)
+            menu.addAction(action_history)
+        
+        menu.exec(self.intentions_list.viewport().mapToGlobal(position))
+
+    def show_archived_history(self):
+        """Pages through the completed intentions archived out of this node (and its children)."""
+        dialog = ArchiveHistoryDialog(self.state_manager, self.node, parent=self)
+        dialog.exec()
 
     def has_incomplete_intentions(self):
-        # Check if there's any item that is NOT completed
-        count = self.intentions_list.count()
-        for i in range(count):
-            item = self.intentions_list.item(i)
-            # We track completion by checking if widget has strikethrough logic or data
-            # Since we are moving to custom widget, we should store state on the item itself
-            if item.data(Qt.ItemDataRole.UserRole) != "completed":
-                return True
-        return False
+        # Check if there's any intention that is NOT completed
+        return any(intention.status != "completed" for _, intention in self.intentions_model.rows)
         
     def format_dynamic_time(self, seconds):
         if seconds < 60:
@@ -537,19 +533,20 @@ class PomodoroWindow(QWidget):
             hours = int((seconds % 86400) // 3600)
             return f"{days}d {hours}h"
 
-    def update_intention_tooltip(self, item):
-        stats = item.data(Qt.ItemDataRole.UserRole + 1)
+    def intention_tooltip(self, source_node, intention):
+        """Rich tooltip of an intention row (asked for by the model on hover)."""
+        stats = intention.stats
         if stats is None:
-             stats = {'time': 0, 'words': 0, 'chars': 0}
+             stats = Stats()
         
         if self.show_percentages:
-            status = "Completed" if item.data(Qt.ItemDataRole.UserRole) == "completed" else "Active"
+            status = "Completed" if intention.status == "completed" else "Active"
             status_color = "#4CAF50" if status == "Completed" else "#FF9800"
         else:
             status = "Information"
             status_color = TEXT_COLOR
 
-        time_sec = stats.get('time', 0)
+        time_sec = stats.time
         time_str = self.format_dynamic_time(time_sec)
         
         # Use status-aware border color
@@ -561,81 +558,26 @@ class PomodoroWindow(QWidget):
                f"<div style='height: 2px;'></div>"
                f"<span style='color: #cccccc; font-size: 8pt;'>"
                f"Time: {time_str}<br/>"
-               f"Words: {stats.get('words', 0)}<br/>"
-               f"Chars: {stats.get('chars', 0)}</span>"
+               f"Words: {stats.words}<br/>"
+               f"Chars: {stats.chars}</span>"
                f"</div>")
-        
-        item.setToolTip(tip)
-        
-        # We NO LONGER set tooltip on children. Instead, we make the widget 
-        # transparent for mouse events in add_intention_to_ui, 
-        # allowing the item's native tooltip to trigger.
-        widget = self.intentions_list.itemWidget(item)
-        if widget:
-            widget.setToolTip("") # Clear widget tooltip to avoid conflicts
-            for child in widget.findChildren(QWidget):
-                child.setToolTip("")
-                child.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
-            widget.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        return tip
 
     def add_intention(self):
         if self.node.parent is None:
             return
         text = self.intention_input.text().strip()
         if text:
-            self.add_intention_to_ui(text, "active", {'time': 0, 'words': 0, 'chars': 0}, self.node)
+            intention = self.state_manager.add_intention(self.node, text)
+            self.add_intention_to_ui(intention, self.node)
             self.intention_input.clear()
-            self.save_intentions_to_node()
 
-    def add_intention_to_ui(self, text, status="active", stats=None, source_node=None):
-        if stats is None:
-            stats = {'time': 0, 'words': 0, 'chars': 0}
-        
-        # Create Item
-        item = QListWidgetItem(self.intentions_list)
-        # container for custom widget (simplified, no delete button)
-        widget = QWidget()
-        widget.setObjectName("intention_container")
-        widget.setStyleSheet("background: transparent;")
-        widget.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
-        widget_layout = QHBoxLayout(widget)
-        widget_layout.setContentsMargins(5, 6, 5, 6) # Smaller vertical margin
-        
-        # If it's from a different node (in root view), show which node
-        prefix = "• "
-        if self.node.parent is None and source_node and source_node != self.node:
-             prefix = f"[{source_node.label}] • "
-             
-        lbl = QLabel(f"{prefix}{text}")
-        lbl.setObjectName("intention_text")
-        lbl.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
-        
-        if status == "completed":
-             lbl.setStyleSheet("color: #00E676; border: none; background: transparent; text-decoration: line-through;")
-             widget.setStyleSheet("background-color: rgba(0, 230, 118, 20); border-radius: 4px;")
-        else:
-             lbl.setStyleSheet("color: #e0e0e0; border: none; background: transparent;")
-        
-        lbl.setFont(QFont("Segoe UI", 10))
-        
-        widget_layout.addWidget(lbl)
-        widget_layout.addStretch()
-        
-        # Ensure it's tall enough for text + margin
-        size = widget.sizeHint()
-        size.setHeight(max(34, size.height() + 4)) # Compact but safe
-        item.setSizeHint(size)
-        item.setData(Qt.ItemDataRole.UserRole, status)
-        item.setData(Qt.ItemDataRole.UserRole + 1, stats)
-        item.setData(Qt.ItemDataRole.UserRole + 2, source_node) # Store source node
-        item.setData(Qt.ItemDataRole.UserRole + 3, text) # Store raw text
-        
-        self.intentions_list.setItemWidget(item, widget)
-        self.update_intention_tooltip(item)
+    def add_intention_to_ui(self, intention, source_node=None):
+        row = self.intentions_model.append(source_node or self.node, intention)
         
         # Auto-select if none selected (Disabled during load to fulfill user request)
-        if not getattr(self, '_is_loading', False) and self.intentions_list.currentRow() == -1:
-            self.intentions_list.setCurrentRow(self.intentions_list.count() - 1)
+        if not getattr(self, '_is_loading', False) and self.current_row() == -1:
+            self.set_current_row(row)
 
     def load_intentions(self):
         is_root = self.node.parent is None
@@ -643,68 +585,34 @@ class PomodoroWindow(QWidget):
         if is_root:
              intentions_data = self.collect_all_intentions(self.node)
         else:
-             intentions_data = [(self.node, i) for i in getattr(self.node, 'intentions', [])]
+             intentions_data = [(self.node, i) for i in self.node.intentions]
         
-        for source_node, data in intentions_data:
-             self.add_intention_to_ui(data['text'], data.get('status', 'active'), data.get('stats', {}), source_node)
-             
-        self.reorder_intentions()
+        self.intentions_model.set_rows(intentions_data) # Completed first (stable partition)
 
 
+    def reload_intentions(self):
+        """Rebuilds the list from the node(s) after NodeService changed their intentions (e.g. archival)."""
+        current = self.current_intention()
+        self._is_loading = True # Restoring the selection must not start a focus session
+        self.load_intentions()
+        if current:
+            self.set_current_row(self.intentions_model.row_of(current[1]))
+        self._is_loading = False
+
     def collect_all_intentions(self, node):
         all_data = []
-        # Own intentions (skip for root itself)
-        if node.parent is not None:
-            for i in getattr(node, 'intentions', []):
-                all_data.append((node, i))
-        
-        # Children intentions
-        for child in node.children:
-            all_data.extend(self.collect_all_intentions(child))
-        
+        for n in iter_preorder([node]):
+            # Own intentions (skip for root itself)
+            if n.parent is not None:
+                for i in n.intentions:
+                    all_data.append((n, i))
         return all_data
 
     def save_intentions_to_node(self):
-        # We need to distribute intentions back to their source nodes
-        # Collect all nodes involved
-        involved_nodes = set()
-        if self.node.parent is None:
-             # Recursively find all nodes
-             def get_all(n):
-                 if n.parent is not None:
-                     involved_nodes.add(n)
-                 for c in n.children: get_all(c)
-             get_all(self.node)
-        else:
-             involved_nodes.add(self.node)
-             
-        # Clear their current intention lists locally before repopulating
-        for n in involved_nodes:
-            n.intentions = []
-            
-        # Repopulate from UI
-        for i in range(self.intentions_list.count()):
-            item = self.intentions_list.item(i)
-            source_node = item.data(Qt.ItemDataRole.UserRole + 2)
-            
-            # Skip saving to root node itself
-            if source_node and source_node.parent is None:
-                 continue
-                 
-            if not source_node: 
-                source_node = self.node # Fallback
-            
-            if source_node.parent is None:
-                 continue # Double safety
-            
-            # If for some reason source_node is not in involved_nodes (unlikely), add it anyway
-            data = {
-                "text": item.data(Qt.ItemDataRole.UserRole + 3),
-                "status": item.data(Qt.ItemDataRole.UserRole),
-                "stats": item.data(Qt.ItemDataRole.UserRole + 1)
-            }
-            source_node.intentions.append(data)
-            
+        """
+        Writes what the session changed since the last save (mostly tracked stats). Intention edits go
+        through NodeService as they happen, so this writes nothing when nothing changed.
+        """
         if self.state_manager:
             self.state_manager.save()
 
@@ -740,105 +648,34 @@ class PomodoroWindow(QWidget):
         line.setStyleSheet("background-color: #333; margin-top: 10px; margin-bottom: 10px;")
         layout.addWidget(line)
 
-    def remove_intention(self, item):
-        # Archive stats before removing
-        stats = item.data(Qt.ItemDataRole.UserRole + 1)
-        source_node = item.data(Qt.ItemDataRole.UserRole + 2)
-        
-        # Determine which node to archive stats to
-        target_node = source_node if source_node else self.node
-        if target_node.parent is not None and stats:
-            # Ensure archived_stats exists
-            if not hasattr(target_node, 'archived_stats'):
-                target_node.archived_stats = {"time": 0, "words": 0, "chars": 0}
-            target_node.archived_stats["time"] += stats.get("time", 0)
-            target_node.archived_stats["words"] += stats.get("words", 0)
-            target_node.archived_stats["chars"] += stats.get("chars", 0)
-        
-        row = self.intentions_list.row(item)
-        self.intentions_list.takeItem(row)
-        if self.intentions_list.count() == 0:
+    def remove_intention(self, row):
+        # Its stats stay counted in the source node's archived_stats
+        source_node, intention = self.intentions_model.remove(row)
+        self.state_manager.remove_intention(source_node, intention)
+        if self.intentions_model.rowCount() == 0:
             self.lbl_current_intention.setText("Ready to Focus")
             self.btn_complete.setEnabled(False)
-        self.save_intentions_to_node()
 
     def complete_current_intention(self):
         # 1. Visual change for completion
-        current_row = self.intentions_list.currentRow()
+        current_row = self.current_row()
         if current_row < 0: return
         
-        item = self.intentions_list.item(current_row)
-        item.setData(Qt.ItemDataRole.UserRole, "completed")
-        
-        widget = self.intentions_list.itemWidget(item)
-        if widget:
-            lbl = widget.findChild(QLabel, "intention_text")
-            if lbl:
-                # Apply cross-out (strikethrough) and color change
-                lbl.setStyleSheet("color: #00E676; border: none; background: transparent; text-decoration: line-through;")
-                widget.setStyleSheet("background-color: rgba(0, 230, 118, 20); border-radius: 4px;")
-        
-        self.update_intention_tooltip(item)
-        
-        # 2. Re-order and Save
-        self.reorder_intentions()
-        self.save_intentions_to_node()
-        
-        # 3. Handle selection: Move to the first "active" intention automatically
-        for i in range(self.intentions_list.count()):
-            it = self.intentions_list.item(i)
-            if it.data(Qt.ItemDataRole.UserRole) != "completed":
-                self.intentions_list.setCurrentRow(i)
-                return
-        
-        self.intentions_list.setCurrentRow(-1) # Nothing active left
-
-    def reorder_intentions(self):
-        """Sorts intentions: Completed at TOP, Active at BOTTOM."""
-        self._is_loading = True # Suppress focus start during re-sort
-        
-        # Store current state
-        items_data = []
-        current_item = self.intentions_list.currentItem()
-        current_text = current_item.data(Qt.ItemDataRole.UserRole + 3) if current_item else None
-        
-        for i in range(self.intentions_list.count()):
-            it = self.intentions_list.item(i)
-            items_data.append({
-                'text': it.data(Qt.ItemDataRole.UserRole + 3),
-                'status': it.data(Qt.ItemDataRole.UserRole),
-                'stats': it.data(Qt.ItemDataRole.UserRole + 1),
-                'source': it.data(Qt.ItemDataRole.UserRole + 2)
-            })
-            
-        # Sort: completed (0) comes before active (1)
-        items_data.sort(key=lambda x: 0 if x['status'] == 'completed' else 1)
+        source_node, intention = self.intentions_model.rows[current_row]
+        self.state_manager.complete_intention(source_node, intention) # Saves only source_node
+        self.intentions_model.row_changed(current_row) # Repainted struck through by the delegate
         
-        # Rebuild
-        self.intentions_list.clear()
-        for d in items_data:
-            self.add_intention_to_ui(d['text'], d['status'], d['stats'], d['source'])
-            
-        # Try to restore selection
-        if current_text:
-            for i in range(self.intentions_list.count()):
-                if self.intentions_list.item(i).data(Qt.ItemDataRole.UserRole+3) == current_text:
-                    self.intentions_list.setCurrentRow(i)
-                    break
+        # 2. Move it to the end of the completed block (one row move, the current index follows it)
+        self.intentions_model.settle(current_row)
         
-        self._is_loading = False
-
+        # 3. Handle selection: the first "active" intention is the one right after the completed block
+        # (past the end when nothing active is left, which clears the selection)
+        self.set_current_row(self.intentions_model.completed_count)
 
-    def update_active_intention(self, current_item, previous_item):
-        if current_item:
-            is_completed = current_item.data(Qt.ItemDataRole.UserRole) == "completed"
-            
-            widget = self.intentions_list.itemWidget(current_item)
-            text = ""
-            if widget:
-                lbl = widget.findChild(QLabel, "intention_text")
-                if lbl:
-                    text = lbl.text().replace("• ", "")
+    def update_active_intention(self, current, previous):
+        if current.isValid():
+            is_completed = current.data(StatusRole) == "completed"
+            text = (current.data(Qt.ItemDataRole.DisplayRole) or "").replace("• ", "")
             
             self.lbl_current_intention.setText(text if text else "Intention selected")
             
@@ -884,6 +721,7 @@ class PomodoroWindow(QWidget):
     def add_allowed_window(self, title):
         if title not in self.node.allowed_windows:
             self.node.allowed_windows.append(title)
+            self.state_manager.mark_dirty(self.node)
             self.state_manager.save()
 
     def update_ui(self):
@@ -903,7 +741,7 @@ class PomodoroWindow(QWidget):
             self.lbl_stats["chars"].setText(str(chars))
 
         # Update Per-Intention Stats Deltas
-        current_item = self.intentions_list.currentItem()
+        current = self.current_intention()
         is_focus = self.pomodoro_session.is_running and self.pomodoro_session.phase == PomodoroPhase.FOCUS
         # AFK Focus: Count as active even if idle_ms is high
         is_active = self.active_tracker.is_user_active() or self.afk_active
@@ -911,14 +749,20 @@ class PomodoroWindow(QWidget):
         # LOCKDOWN: Stop counting if node is already solved
         node_solved = getattr(self.node, 'status', 'neutral') == 'solved'
 
-        if current_item and is_focus and is_active and not node_solved:
-            stats = current_item.data(Qt.ItemDataRole.UserRole + 1)
+        if current and is_focus and is_active and not node_solved:
+            source_node, intention = current
+            stats = intention.stats
             if stats:
-                stats['time'] += max(0, active_sec - self.last_active_sec)
-                stats['words'] += max(0, words - self.last_words)
-                stats['chars'] += max(0, chars - self.last_chars)
-                current_item.setData(Qt.ItemDataRole.UserRole + 1, stats)
-                self.update_intention_tooltip(current_item)
+                d_time = max(0, active_sec - self.last_active_sec)
+                d_words = max(0, words - self.last_words)
+                d_chars = max(0, chars - self.last_chars)
+                if self.state_manager:
+                    # Published as STATS_CHANGED so open hover popups follow along
+                    self.state_manager.record_stats(source_node or self.node, stats, d_time, d_words, d_chars)
+                else:
+                    stats.time += d_time
+                    stats.words += d_words
+                    stats.chars += d_chars
         
         self.last_active_sec = active_sec
         self.last_words = words
@@ -931,11 +775,16 @@ class PomodoroWindow(QWidget):
              if not hasattr(self.node, 'cycle_time'): self.node.cycle_time = 0
              if not hasattr(self.node, 'cycle_count'): self.node.cycle_count = 0
              
-             self.node.cycle_time += 1
+             if self.state_manager:
+                 cycle_completed = self.state_manager.tick_cycle(self.node)
+             else:
+                 self.node.cycle_time += 1
+                 cycle_completed = self.node.cycle_time >= CYCLE_TIME_LIMIT
+                 if cycle_completed:
+                     self.node.cycle_count += 1
+                     self.node.cycle_time = max(0, self.node.cycle_time - CYCLE_TIME_LIMIT)
              
-             if self.node.cycle_time >= CYCLE_TIME_LIMIT:
-                  self.node.cycle_count += 1
-                  self.node.cycle_time = max(0, self.node.cycle_time - CYCLE_TIME_LIMIT)
+             if cycle_completed:
                   # Remote/Local Notification for cycle completion
                   if hasattr(self.window(), 'tray_manager'):
                       self.window().tray_manager.notify("Level Up!", f"You've completed an 8-hour block on '{self.node.label}'!")
@@ -962,7 +811,10 @@ class PomodoroWindow(QWidget):
         if self.show_percentages:
             # Dynamically find the main root name
             main_root = self.roots[0] if self.roots else None
-            if main_root:
+            # Only statuses and structure move the percentage, so skip the walk until they change
+            generation = self.state_manager.structure_generation if self.state_manager else None
+            if main_root and (generation is None or generation != getattr(self, '_life_generation', None)):
+                self._life_generation = generation
                 life_perc = calculate_node_percentage(main_root)
                 self.life_circle.set_percentage(life_perc)
             
@@ -1204,31 +1056,14 @@ class PomodoroWindow(QWidget):
             print(f"Restriction Error: {e}")
 
     def _load_restriction_config(self):
-        import json
-        try:
-            path = os.path.join("progress_logs", "restrict_config.json")
-            if os.path.exists(path):
-                with open(path, 'r') as f:
-                    data = json.load(f)
-                    self.restricted_keywords = data.get("keywords", self.restricted_keywords)
-                    # Sync armed state to engine
-                    if "armed" in data:
-                        self.pomodoro_session.restriction_armed = data.get("armed", False)
-        except:
-            pass
+        self.restricted_keywords = self.settings.restricted_keywords()
+        # Sync armed state to engine
+        armed = self.settings.restriction_armed()
+        if armed is not None:
+            self.pomodoro_session.restriction_armed = armed
 
     def _save_restriction_config(self):
-        import json
-        try:
-            os.makedirs("progress_logs", exist_ok=True)
-            path = os.path.join("progress_logs", "restrict_config.json")
-            with open(path, 'w') as f:
-                json.dump({
-                    "keywords": self.restricted_keywords,
-                    "armed": self.pomodoro_session.restriction_armed
-                }, f)
-        except:
-            pass
+        self.settings.set_restriction_config(self.restricted_keywords, self.pomodoro_session.restriction_armed)
 
     def handle_resolution_click(self):
         import webbrowser
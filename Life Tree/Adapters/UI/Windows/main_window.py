@@ -1,5 +1,5 @@
-from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QFrame, QPushButton, QLabel
-from PyQt6.QtCore import Qt, QTimer, QCoreApplication
+from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QFrame, QPushButton, QLabel, QLineEdit, QComboBox, QCompleter
+from PyQt6.QtCore import Qt, QTimer, QCoreApplication, QStringListModel, QModelIndex
 import keyboard
 import datetime
 
@@ -9,10 +9,14 @@ from Adapters.Sensors.idle_detector import IdleDetector
 from Adapters.Sensors.keyboard_listener import KeyboardListener
 from Core.Services.timer_engine import TimerEngine, PomodoroPhase
 from Core.Services.history_recorder import HistoryRecorder
+from Core.Services.settings_store import SettingsStore
 from Core.Services.node_service import NodeService
+from Core.Services.change_events import ChangeKind
 from Application.app_initializer import AppInitializer
 from Application.orchestrator import Orchestrator
 from Adapters.Persistence.json_repository import JsonRepository
+from Adapters.Persistence.sqlite_repository import SqliteRepository
+from Adapters.Persistence.serializers import install_serializers
 from Adapters.UI.tray_adapter import WindowTrayManager
 from PyQt6.QtGui import QIcon
 
@@ -67,9 +71,18 @@ class MainWindow(QMainWindow):
         """)
         
         # 1. Initialize Adapters (Sensors / Storage)
+        install_serializers(SERIALIZER_BACKEND) # Before anything loads or saves
         self.idle_detector = IdleDetector()
         self.keyboard_listener = KeyboardListener()
-        self.repository = JsonRepository()
+        if STORAGE_BACKEND == "sqlite":
+            self.repository = SqliteRepository(SQLITE_DB_PATH)
+            self.repository.migrate_from_json() # No-op after the first run
+        else:
+            self.repository = JsonRepository()
+        self.settings = SettingsStore(self.repository) # View states, window geometry, restriction config
+        geometry = self.settings.window_geometry("main")
+        if geometry:
+            self.setGeometry(*geometry)
         
         self.idle_detector.start()
         self.keyboard_listener.start()
@@ -81,7 +94,8 @@ class MainWindow(QMainWindow):
             long_break_min=LONG_BREAK_TIME,
             long_break_interval=LONG_BREAK_INTERVAL
         )
-        self.history_recorder = HistoryRecorder(self.idle_detector, self.keyboard_listener)
+        self.history_recorder = HistoryRecorder(self.idle_detector, self.keyboard_listener,
+                                                store=self.repository if hasattr(self.repository, 'append_history') else None)
         
         # 3. Initialize Application Layer (Bootstrapper / Orchestrator)
         self.bootstrapper = AppInitializer(self, self.repository, self.history_recorder)
@@ -113,8 +127,24 @@ class MainWindow(QMainWindow):
             print(f"Failed to bind global hotkeys: {e}")
 
         # 5. Initialize Managers
-        self.problems_manager = NodeService(TREE_DATA_PATH, "My Problems")
-        self.values_manager = NodeService(VALUES_DATA_PATH, "My Values")
+        tree_store = getattr(self.repository, 'tree_store', None) # Row stores only exist for SQLite
+        self.problems_manager = NodeService(TREE_DATA_PATH, "My Problems", store=tree_store("problems") if tree_store else None)
+        self.values_manager = NodeService(VALUES_DATA_PATH, "My Values", store=tree_store("values") if tree_store else None)
+        
+        # Remote intention list is only rebuilt when intentions actually changed
+        self._remote_list_dirty = True
+        self._remote_list_node = None
+        self.problems_manager.subscribe(self.on_state_changed)
+        self.values_manager.subscribe(self.on_state_changed)
+        
+        # Move old completed intentions to the archive before any dashboard lists them
+        self.problems_manager.archive_completed()
+        self.values_manager.archive_completed()
+        
+        # Skeleton trees (TREE_LAZY_DETAILS): search-index their intentions in small steps after startup
+        self.details_index_timer = QTimer(self)
+        self.details_index_timer.timeout.connect(self.index_pending_details)
+        self.details_index_timer.start(0)
         
         # Analytics Window Setup
         self.graphs_window = GraphsWidget(self.history_recorder, self.timer_engine)
@@ -190,7 +220,46 @@ class MainWindow(QMainWindow):
         sc_layout.addWidget(self.btn_values)
 
         lh_layout.addWidget(self.switcher_container)
-        lh_layout.addStretch()
+        lh_layout.addSpacing(10)
+        
+        # Search (nodes + intentions of the current perspective)
+        field_style = f"""
+            background-color: {CARD_BG_COLOR};
+            border: 1px solid {BORDER_COLOR};
+            border-radius: 4px;
+            padding: 4px 8px;
+            color: {TEXT_COLOR};
+        """
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search nodes & intentions...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setStyleSheet(f"QLineEdit {{ {field_style} }}")
+        self.search_input.textChanged.connect(self.schedule_search)
+        self.search_input.returnPressed.connect(self.jump_to_next_result)
+        lh_layout.addWidget(self.search_input, 1)
+        
+        self.search_status = QComboBox()
+        self.search_status.addItems(["All", "Neutral", "Solving", "Solved"])
+        self.search_status.setStyleSheet(f"QComboBox {{ {field_style} }}")
+        self.search_status.currentIndexChanged.connect(self.run_search)
+        lh_layout.addSpacing(6)
+        lh_layout.addWidget(self.search_status)
+        
+        # Results popup: attached with setWidget (not setCompleter) so picking one doesn't rewrite the query
+        self.search_model = QStringListModel(self)
+        self.search_completer = QCompleter(self.search_model, self)
+        self.search_completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.search_completer.setWidget(self.search_input)
+        self.search_completer.activated[QModelIndex].connect(self.jump_to_result)
+        self.search_results = [] # uids, best match first
+        self.search_result_index = -1
+        
+        # Debounce: query once typing pauses, the index itself is maintained incrementally
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        lh_layout.addSpacing(10)
         
         self.btn_left_expand = QPushButton("⛶")
         self.btn_left_expand.setCheckable(True)
@@ -210,7 +279,7 @@ class MainWindow(QMainWindow):
         lh_layout.addWidget(self.btn_left_expand)
         
         left_layout.addWidget(left_header)
-        self.tree = Tree(state_manager=self.problems_manager, show_percentages=True)
+        self.tree = Tree(state_manager=self.problems_manager, show_percentages=True, settings=self.settings)
         self.tree.node_double_clicked.connect(self.show_pomodoro)
         left_layout.addWidget(self.tree)
         self.splitter.addWidget(self.left_container)
@@ -258,6 +327,7 @@ class MainWindow(QMainWindow):
             state_manager=self.tree.state_manager,
             pomodoro_session=self.timer_engine,
             show_percentages=self.tree.show_percentages,
+            settings=self.settings,
             parent=self.right_container
         )
         
@@ -303,18 +373,12 @@ class MainWindow(QMainWindow):
         if self.tree.state_manager == self.problems_manager:
             return # Already on Problems, do nothing
 
-        # Save current state (switching from values)
-        self.tree.save_state()
-
         self.btn_problems.setChecked(True)
         self.btn_values.setChecked(False)
-        self.tree.state_manager = self.problems_manager
-        self.tree.perspective_name = "problems"
-        self.tree.show_percentages = True
-        self.tree.build_and_layout()
         
-        # Restore state from persistence
-        self.tree.load_initial_view()
+        # Cached scene swap: no rebuild, no disk round-trip
+        self.tree.switch_perspective("problems", self.problems_manager, show_percentages=True)
+        self.run_search() # Same query against this perspective's index
 
         # PERSIST DASHBOARD: Keep it open on the current node even if switching trees.
         # The user wants to stay focused on the task while browsing.
@@ -324,22 +388,53 @@ class MainWindow(QMainWindow):
         if self.tree.state_manager == self.values_manager:
             return # Already on Values, do nothing
 
-        # Save current state (switching from problems)
-        self.tree.save_state()
-
         self.btn_values.setChecked(True)
         self.btn_problems.setChecked(False)
-        self.tree.state_manager = self.values_manager
-        self.tree.perspective_name = "values"
-        self.tree.show_percentages = False
-        self.tree.build_and_layout()
         
-        # Restore state from persistence
-        self.tree.load_initial_view()
+        # Cached scene swap: no rebuild, no disk round-trip
+        self.tree.switch_perspective("values", self.values_manager, show_percentages=False)
+        self.run_search() # Same query against this perspective's index
 
         # PERSIST DASHBOARD: Keep it open on the current node even if switching trees.
         pass
 
+    def schedule_search(self):
+        self.search_timer.start()
+
+    def run_search(self):
+        """Queries the current perspective's search index and highlights the matches."""
+        text = self.search_input.text().strip()
+        status = self.search_status.currentText().lower()
+        statuses = None if status == "all" else [status]
+        results = self.tree.state_manager.search(text, statuses=statuses) if text else []
+        
+        self.search_results = [node.uid for node, _ in results]
+        self.search_result_index = -1
+        self.tree.highlight_nodes(self.search_results)
+        
+        self.search_model.setStringList([node.label for node, _ in results])
+        if results and self.search_input.hasFocus():
+            self.search_completer.complete()
+        else:
+            self.search_completer.popup().hide()
+
+    def jump_to_result(self, index):
+        row = index.row()
+        if 0 <= row < len(self.search_results):
+            self.search_result_index = row
+            self.tree.focus_node(self.search_results[row])
+
+    def jump_to_next_result(self):
+        """Enter cycles through the matches."""
+        if self.search_timer.isActive():
+            self.search_timer.stop()
+            self.run_search()
+        if not self.search_results:
+            return
+        self.search_result_index = (self.search_result_index + 1) % len(self.search_results)
+        self.search_completer.popup().hide()
+        self.tree.focus_node(self.search_results[self.search_result_index])
+
     def handle_left_expand(self):
         sizes = self.splitter.sizes()
         total_width = sum(sizes)
@@ -367,8 +462,7 @@ class MainWindow(QMainWindow):
         if self.tree.active_node:
             current_status = getattr(self.tree.active_node, 'status', 'neutral')
             new_status = "neutral" if current_status == "solved" else "solved"
-            self.tree.state_manager.update_node_status(self.tree.active_node, new_status)
-            self.tree.build_and_layout()
+            self.tree.state_manager.update_node_status(self.tree.active_node, new_status) # Tree relayouts itself
 
     def show_graphs_window(self):
         if self.graphs_window:
@@ -391,6 +485,29 @@ class MainWindow(QMainWindow):
         else:
             self.show_graphs_window()
 
+    def on_state_changed(self, events):
+        """NodeService listener: marks the mini status bar's intention list stale."""
+        for event in events:
+            if event.kind in (ChangeKind.INTENTIONS_CHANGED, ChangeKind.RELOADED):
+                self._remote_list_dirty = True
+                if event.kind == ChangeKind.RELOADED:
+                    self.details_index_timer.start(0) # Undo/redo rebuilt the search index
+                return
+
+    def index_pending_details(self):
+        pending = self.problems_manager.index_pending_details() + self.values_manager.index_pending_details()
+        if not pending:
+            self.details_index_timer.stop()
+            if self.problems_manager.lazy or self.values_manager.lazy:
+                self.archive_completed_intentions() # Skeleton nodes holding completed intentions are known now
+
+    def archive_completed_intentions(self):
+        """Archival sweep on both trees. The open dashboard is rebuilt, since its list model still holds the archived Intention objects."""
+        self.problems_manager.archive_completed()
+        self.values_manager.archive_completed()
+        if self.current_pomodoro_view and hasattr(self.current_pomodoro_view, 'reload_intentions'):
+            self.current_pomodoro_view.reload_intentions()
+
     def record_and_check(self):
         try:
             # 1. Autosave Heartbeat (Every 60 seconds)
@@ -428,9 +545,9 @@ class MainWindow(QMainWindow):
                     current_label = None
                 
                 # Extract Intention Label
-                item = self.current_pomodoro_view.intentions_list.currentItem()
-                if item:
-                    intention_label = item.data(Qt.ItemDataRole.UserRole + 3)
+                current = self.current_pomodoro_view.current_intention()
+                if current:
+                    intention_label = current[1].text
                 
             self.history_recorder.record(node_label=current_label, intention_label=intention_label)
             
@@ -485,7 +602,10 @@ class MainWindow(QMainWindow):
                 # Sync Remote List if visible
                 if self.status_bar.remote.isVisible() and self.current_pomodoro_view:
                     node = self.current_pomodoro_view.node
-                    self.status_bar.remote.update_list(getattr(node, 'intentions', []))
+                    if self._remote_list_dirty or node is not self._remote_list_node:
+                        self._remote_list_dirty = False
+                        self._remote_list_node = node
+                        self.status_bar.remote.update_list(getattr(node, 'intentions', []))
             
             # 5. Midnight Transition Check
             today = datetime.date.today().isoformat()
@@ -517,6 +637,20 @@ class MainWindow(QMainWindow):
             self.typewriter_window.editor.setFocus()
 
 
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self._remember_geometry()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._remember_geometry()
+
+    def _remember_geometry(self):
+        # Coalesced by the settings store, so a drag costs a single write
+        if hasattr(self, 'settings') and not self.isMaximized() and not self.isFullScreen():
+            geom = self.geometry()
+            self.settings.set_window_geometry("main", geom.x(), geom.y(), geom.width(), geom.height())
+
     def closeEvent(self, event):
         if not getattr(self, '_force_quit', False):
             self.hide()
@@ -561,4 +695,4 @@ class MainWindow(QMainWindow):
     def handle_mini_clear_intentions(self):
         """Relay clear command to active view."""
         if self.current_pomodoro_view:
-             self.current_pomodoro_view.clear_intentions()
\ No newline at end of file
+             self.current_pomodoro_view.clear_intentions()
\ No newline at end of file
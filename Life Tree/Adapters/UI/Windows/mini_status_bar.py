@@ -135,8 +135,8 @@ class IntentionRemote(QWidget):
         self.list.clear()
         for i, task in enumerate(intentions):
             item = QListWidgetItem(self.list)
-            text = task.get('text', '')
-            status = task.get('status', 'active')
+            text = task.text
+            status = task.status
             
             # Simple item widget with complete button
             widget = QWidget()
@@ -1,14 +1,50 @@
-from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsRectItem, QGraphicsLineItem, QGraphicsSimpleTextItem, QGraphicsTextItem, QMenu, QGraphicsDropShadowEffect, QInputDialog
-from PyQt6.QtGui import QPen, QBrush, QColor, QFont, QPainter, QLinearGradient, QTextCursor
-from PyQt6.QtCore import Qt, QSettings, QTimer, pyqtSignal
-import json
+from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsRectItem, QGraphicsLineItem, QGraphicsSimpleTextItem, QGraphicsTextItem, QMenu, QGraphicsDropShadowEffect, QInputDialog, QFileDialog
+from PyQt6.QtGui import QPen, QBrush, QColor, QFont, QFontMetrics, QPainter, QLinearGradient, QTextCursor
+from PyQt6.QtCore import Qt, QSettings, QTimer, QRectF, QObject, QRunnable, QThreadPool, pyqtSignal
 import os
 import math
+import time
 from Core.Entities.node import Node
 from Core.Services.node_service import NodeService
-from Core.Services.percentage_engine import calculate_node_percentage
+from Core.Services.change_events import ChangeKind, LAYOUT_KINDS
+from Core.Services.spatial_index import GridIndex
+from Core.Services.tree_layout import snapshot_tree, compute_layout, LayoutCancelled
+from Core.Entities.tree_traversal import iter_preorder, count_descendants
 from Adapters.UI.Popups.node_hover_popup import NodeHoverPopup
-from Infrastructure.variables import APP_STATE_PATH, BG_COLOR, TREE_DATA_PATH
+from Adapters.UI.Components.tile_cache import TileCache
+from Adapters.UI.Components.canvas_stats_overlay import CanvasStatsOverlay
+from Adapters.Persistence.json_repository import JsonRepository
+from Adapters.Persistence import tree_io
+from Core.Services.settings_store import SettingsStore
+from Infrastructure.variables import BG_COLOR, TREE_DATA_PATH, TREE_TILE_CACHE_ENABLED, CYCLE_TIME_LIMIT
+
+def cycle_percentage(cycle_time):
+    """Whole-percent value shown on a node's cycle badge."""
+    return int((cycle_time / CYCLE_TIME_LIMIT) * 100)
+
+class _LayoutSignals(QObject):
+    finished = pyqtSignal(int, object) # job id, LayoutResult
+
+
+class _LayoutJob(QRunnable):
+    """Runs compute_layout() over a tree snapshot in a worker thread."""
+    def __init__(self, job_id, snapshots, anchors, with_percentages, signals):
+        super().__init__()
+        self.job_id = job_id
+        self.snapshots = snapshots
+        self.anchors = anchors
+        self.with_percentages = with_percentages
+        self.signals = signals
+        self.cancelled = False # Set from the UI thread when a newer layout is requested
+
+    def run(self):
+        try:
+            result = compute_layout(self.snapshots, self.anchors, 80, self.with_percentages,
+                                    is_cancelled=lambda: self.cancelled)
+        except LayoutCancelled:
+            return
+        self.signals.finished.emit(self.job_id, result)
+
 
 class EditableTextItem(QGraphicsTextItem):
     def __init__(self, node, tree_view):
@@ -21,20 +57,10 @@ class EditableTextItem(QGraphicsTextItem):
         
         self.setData(0, node)
         
-        # Initially strictly read-only and ignores mouse (except hover now)
+        # Initially strictly read-only and ignores mouse
+        # (hover is resolved by Tree.node_at, so the popup doesn't die when hovering text)
         self.setAcceptedMouseButtons(Qt.MouseButton.NoButton) 
         self.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
-        
-        # Enable hover events so the popup doesn't die when hovering text
-        self.setAcceptHoverEvents(True)
-
-    def hoverEnterEvent(self, event):
-        self.tree_view.show_hover_popup(self.node)
-        super().hoverEnterEvent(event)
-
-    def hoverLeaveEvent(self, event):
-        self.tree_view.hide_hover_popup(self.node)
-        super().hoverLeaveEvent(event)
 
     def start_editing(self):
         self.setAcceptedMouseButtons(Qt.MouseButton.LeftButton | Qt.MouseButton.RightButton)
@@ -68,9 +94,8 @@ class EditableTextItem(QGraphicsTextItem):
         # Check if changed
         new_text = self.toPlainText().strip()
         if new_text and new_text != self.original_text:
-            self.tree_view.state_manager.rename_node(self.node, new_text)
+            self.tree_view.state_manager.rename_node(self.node, new_text) # Relayout via on_state_changed
             self.original_text = new_text
-            QTimer.singleShot(0, self.tree_view.build_and_layout)
         else:
             self.setPlainText(self.original_text)
 
@@ -80,7 +105,6 @@ class NodeBox(QGraphicsRectItem):
         super().__init__(x, y, w, h)
         self.node = node
         self.tree_view = tree_view
-        self.setAcceptHoverEvents(True)
         # Style
         self.setBrush(QBrush(QColor("#3c3c3c")))
         self.setPen(QPen(QColor("#d4d4d4"), 2))
@@ -109,6 +133,16 @@ class NodeBox(QGraphicsRectItem):
             self.setPen(QPen(QColor("#d4d4d4"), 2))
             target_glow_color = None
 
+        # Search matches get a yellow outline on top of their status colors
+        if self.node.uid in self.tree_view.highlighted_uids:
+            self.setPen(QPen(QColor("#FFEB3B"), 3))
+
+        # Collapsed subtrees are drawn as a single summary box with a dashed outline
+        if getattr(self.node, 'collapsed', False) and self.node.children:
+            pen = self.pen()
+            pen.setStyle(Qt.PenStyle.DashLine)
+            self.setPen(pen)
+
         # Optimize Effect Update
         current_effect = self.graphicsEffect()
         if target_glow_color:
@@ -126,18 +160,17 @@ class NodeBox(QGraphicsRectItem):
             if current_effect:
                 self.setGraphicsEffect(None)
 
-    def hoverEnterEvent(self, event):
-        self.tree_view.show_hover_popup(self.node)
-        super().hoverEnterEvent(event)
-
-    def hoverLeaveEvent(self, event):
-        self.tree_view.hide_hover_popup(self.node)
-        super().hoverLeaveEvent(event)
-
 class Tree(QGraphicsView):
     node_double_clicked = pyqtSignal(object) # Carries the Node object
 
-    def __init__(self, state_manager=None, show_percentages=True):
+    # Per-perspective scene bookkeeping, swapped as a unit by switch_perspective()
+    SCENE_STATE_ATTRS = (
+        "scene", "roots", "hover_popup", "node_items", "text_items",
+        "node_graphics", "connection_items", "drawn_positions", "content_rect", "_styled_active_uid",
+        "tile_cache", "node_index", "drawn_signatures", "node_percentages", "highlighted_uids"
+    )
+
+    def __init__(self, state_manager=None, show_percentages=True, settings=None):
         super().__init__()
         self.show_percentages = show_percentages
         self.scene = QGraphicsScene()
@@ -156,18 +189,55 @@ class Tree(QGraphicsView):
         self._pan_click_pos = None
 
         # Persistence
-        self.state_file_path = APP_STATE_PATH
+        self.settings = settings if settings else SettingsStore(JsonRepository()) # View state (zoom / center per perspective)
         if state_manager:
             self.state_manager = state_manager
         else:
             self.state_manager = NodeService(TREE_DATA_PATH, "My Problems")
         
         self.perspective_name = self.state_manager.initial_root_label.lower().replace("my ", "") # e.g. 'problems' or 'values'
+        self.roots = []
+        
+        # Scene Cache: perspective name -> stashed scene state (see switch_perspective)
+        self.perspective_scenes = {}
         
         # Active State
         self.active_node = None
         self.active_beam = None
         
+        # Scene Index (rebuilt with the scene, queried instead of scene.items())
+        self.node_items = {} # uid -> NodeBox
+        self.text_items = {} # uid -> EditableTextItem
+        self.node_graphics = {} # uid -> every item drawn for that node (box, text, badges)
+        self.connection_items = {} # child uid -> line to its parent
+        self.drawn_positions = {} # uid -> (x, y) the node's items were drawn at
+        self.content_rect = QRectF() # United bounds of all node graphics
+        self._styled_active_uid = None
+        self.node_index = GridIndex() # uid -> hit rectangle (box + badges), for node_at()
+        self.drawn_signatures = {} # uid -> node_signature() the items were drawn with
+        self.node_percentages = {} # uid -> subtree completion %, from the last layout
+        self.highlighted_uids = set() # Search matches, outlined by NodeBox.update_color
+        
+        # Background Layout: snapshot -> worker -> one batched apply_layout()
+        self.layout_signals = _LayoutSignals()
+        self.layout_signals.finished.connect(self._on_layout_finished)
+        self._layout_job = None
+        self._layout_job_id = 0
+        self._layout_nodes = {} # uid -> Node captured with the pending job's snapshot
+        self._layout_callbacks = []
+        self.last_layout_timings = {}
+        self._label_metrics = QFontMetrics(QFont("Segoe UI", 10))
+        self._label_widths = {} # label -> pixel width
+        
+        # Performance Overlay (F3)
+        self.stats_overlay = CanvasStatsOverlay(self)
+        self._last_zoom_time = 0.0
+        
+        # Tile Cache (optional): static layer blitted from pixmaps while panning
+        self.tile_cache_enabled = TREE_TILE_CACHE_ENABLED
+        self.tile_cache = None
+        self._tiles_active = False
+        
         # Connection State
         self.connecting_node = None
         self.temp_connection_line = None
@@ -178,23 +248,54 @@ class Tree(QGraphicsView):
         self.scene.addItem(self.hover_popup)
         self.current_hovered_node = None
 
-        # Hover Refresh Timer
-        self.hover_refresh_timer = QTimer(self)
-        self.hover_refresh_timer.timeout.connect(self.refresh_hover_content)
-        self.hover_refresh_timer.start(1000)
-
-    def refresh_hover_content(self):
-        """Periodically refreshes the hover popup if it is visible."""
-        if self.current_hovered_node and self.hover_popup.isVisible():
-            self.hover_popup.update_node(self.current_hovered_node, show_status=self.show_percentages)
+        # Change Events: relayout and hover refresh are driven by the service, not polled
+        self.state_manager.subscribe(self.on_state_changed)
+
+    def on_state_changed(self, events):
+        """NodeService listener: relayout on structural changes, otherwise refresh only what was touched."""
+        relayout = False
+        touched = set()
+        stats_touched = set()
+        for event in events:
+            if event.kind in LAYOUT_KINDS:
+                relayout = True
+            elif event.kind == ChangeKind.CYCLE_CHANGED:
+                # Cycle badges only change once per whole percent (~5 minutes of focus)
+                relayout = relayout or cycle_percentage(event.old) != cycle_percentage(event.new)
+            elif event.kind == ChangeKind.STATS_CHANGED:
+                stats_touched.add(event.uid)
+            if event.uid:
+                touched.add(event.uid)
+            if event.kind == ChangeKind.RELOADED and self.current_hovered_node:
+                # Node objects were replaced; the popup would show stale data
+                self.hover_popup.hide()
+                self.current_hovered_node = None
+        
+        if relayout:
+            self.request_layout()
+        elif stats_touched:
+            # Collapsed summaries aggregate the time of everything below them
+            summarized = set(stats_touched)
+            for uid in stats_touched:
+                summarized.update(ancestor.uid for ancestor in self.state_manager.ancestors(uid) if ancestor.collapsed)
+            self.redraw_nodes(summarized) # Only drawn nodes whose summary text actually changed
+        self.refresh_hover_content(touched)
+
+    def refresh_hover_content(self, touched_uids):
+        """Refreshes the hover popup if its node, or anything aggregated into it, changed."""
+        node = self.current_hovered_node
+        if not node or not self.hover_popup.isVisible() or not touched_uids:
+            return
+        affected = node.uid in touched_uids or any(
+            any(ancestor.uid == node.uid for ancestor in self.state_manager.ancestors(uid))
+            for uid in touched_uids
+        )
+        if affected:
+            self.hover_popup.update_node(node, show_status=self.show_percentages)
 
 
     def mouseDoubleClickEvent(self, event):
-        item = self.itemAt(event.pos())
-        
-        clicked_node = None
-        if isinstance(item, (NodeBox, QGraphicsSimpleTextItem, EditableTextItem)):
-             clicked_node = item.data(0)
+        clicked_node = self.node_at(self.mapToScene(event.pos()))
              
         if clicked_node:
             # Emit signal for Main Window to handle
@@ -222,42 +323,33 @@ class Tree(QGraphicsView):
     def keyPressEvent(self, event):
         # Undo: Ctrl + Z
         if event.key() == Qt.Key.Key_Z and (event.modifiers() & Qt.KeyboardModifier.ControlModifier):
-            if self.state_manager.undo():
-                self.build_and_layout()
+            self.state_manager.undo() # Relayout via on_state_changed
         # Redo: Ctrl + Y
         elif event.key() == Qt.Key.Key_Y and (event.modifiers() & Qt.KeyboardModifier.ControlModifier):
-            if self.state_manager.redo():
-                self.build_and_layout()
+            self.state_manager.redo()
         # Select All: Ctrl + A
         elif event.key() == Qt.Key.Key_A and (event.modifiers() & Qt.KeyboardModifier.ControlModifier):
             self.select_all()
         # Delete: Del Key
         elif event.key() == Qt.Key.Key_Delete:
             self.delete_selected()
+        # Canvas Stats Overlay: F3
+        elif event.key() == Qt.Key.Key_F3:
+            self.toggle_stats_overlay()
         else:
             super().keyPressEvent(event)
 
     def mousePressEvent(self, event):
+        hit_node = self.node_at(self.mapToScene(event.pos()))
+        
         # Clear focus on any potential click to ensure editing commits (if logic allows)
-        if not self.itemAt(event.pos()):
+        if not hit_node:
              self.scene.clearFocus()
              
         # Handle Connection Mode Click
         if self.connecting_node:
-            # We use items() because itemAt() might hit the connection line itself
-            items = self.items(event.pos())
-            target_node = None
-            
-            for item in items:
-                if item == self.temp_connection_line:
-                    continue
-                    
-                if isinstance(item, (NodeBox, QGraphicsSimpleTextItem, EditableTextItem)):
-                    # Check if this item carries a node
-                    potential_node = item.data(0)
-                    if potential_node:
-                        target_node = potential_node
-                        break
+            # The spatial index only knows nodes, so the temporary line can never be hit
+            target_node = hit_node
             
             if target_node and target_node != self.connecting_node:
                 # Complete Connection
@@ -269,10 +361,8 @@ class Tree(QGraphicsView):
             event.accept()
             return
 
-        # Check if clicking on an item
-        item = self.itemAt(event.pos())
-        
-        if item:
+        # Check if clicking on a node
+        if hit_node:
             # Let standard event handle selection/interaction
             super().mousePressEvent(event)
         else:
@@ -291,6 +381,7 @@ class Tree(QGraphicsView):
                 if event.button() == Qt.MouseButton.LeftButton:
                     self._pan_click_pos = event.pos() # Track click for potential deselect
                 self.setCursor(Qt.CursorShape.ClosedHandCursor)
+                self.begin_tile_pan()
                 event.accept()
 
     def mouseReleaseEvent(self, event):
@@ -302,6 +393,7 @@ class Tree(QGraphicsView):
 
         if self._is_panning:
             self._is_panning = False
+            self.end_tile_pan()
             
             # Check for Click vs Drag logic (Deselect on Background Click)
             if event.button() == Qt.MouseButton.LeftButton and self._pan_click_pos:
@@ -309,7 +401,7 @@ class Tree(QGraphicsView):
                     self.scene.clearSelection()
 
             # Reset cursor based on current position
-            if self.itemAt(event.pos()):
+            if self.node_at(self.mapToScene(event.pos())):
                 self.setCursor(Qt.CursorShape.ArrowCursor)
             else:
                 self.setCursor(Qt.CursorShape.OpenHandCursor)
@@ -353,10 +445,19 @@ class Tree(QGraphicsView):
             self._pan_start = event.pos()
             self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
             self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
+            if self._tiles_active:
+                self.prefetch_tiles()
             event.accept()
         else:
-            # Automatic Cursor Switching
-            if self.itemAt(event.pos()):
+            # Automatic Cursor Switching + Hover Popup (one index lookup per move)
+            hovered = self.node_at(self.mapToScene(event.pos()))
+            if hovered != self.current_hovered_node:
+                if self.current_hovered_node:
+                    self.hide_hover_popup(self.current_hovered_node)
+                if hovered:
+                    self.show_hover_popup(hovered)
+            
+            if hovered:
                 self.setCursor(Qt.CursorShape.ArrowCursor)
             else:
                 # If Shift is held, maybe show Cross? 
@@ -366,9 +467,27 @@ class Tree(QGraphicsView):
                      self.setCursor(Qt.CursorShape.OpenHandCursor)
             super().mouseMoveEvent(event)
 
+    def leaveEvent(self, event):
+        if self.current_hovered_node:
+            self.hide_hover_popup(self.current_hovered_node)
+        super().leaveEvent(event)
+
+    def node_at(self, scene_pos):
+        """Returns the node whose box or badges contain scene_pos, via the spatial index."""
+        hits = self.node_index.query_point(scene_pos.x(), scene_pos.y())
+        if not hits:
+            return None
+        # Overlapping badges: the node whose own box contains the point wins
+        for uid in hits:
+            box = self.node_items[uid]
+            if box.sceneBoundingRect().contains(scene_pos):
+                return box.node
+        return self.node_items[hits[0]].node
+
     def wheelEvent(self, event):
         # Calculate smooth zoom factor based on scroll delta
         zoom_factor = 1.0015 ** event.angleDelta().y()
+        self._last_zoom_time = time.perf_counter()
         
         # Clamp Scale
         current_scale = self.transform().m11()
@@ -379,6 +498,7 @@ class Tree(QGraphicsView):
             
         self.scale(zoom_factor, zoom_factor)
         self.check_visibility()
+        self.prefetch_tiles()
         
     def showEvent(self, event):
         super().showEvent(event)
@@ -389,7 +509,23 @@ class Tree(QGraphicsView):
             self._initialized = True
 
     def build_and_layout(self):
+        """Full synchronous rebuild: clears the scene and draws every visible node."""
+        self.cancel_layout()
+        self.end_tile_pan()
         self.scene.clear()
+        self.node_items = {}
+        self.text_items = {}
+        self.node_graphics = {}
+        self.connection_items = {}
+        self.drawn_positions = {}
+        self.drawn_signatures = {}
+        self.node_percentages = {}
+        self.content_rect = QRectF()
+        self._styled_active_uid = None
+        self.node_index = GridIndex()
+        if self.tile_cache:
+            self.tile_cache.clear()
+        self.ensure_tile_cache()
         
         # Re-create persistent UI elements after clear
         self.hover_popup = NodeHoverPopup()
@@ -397,37 +533,209 @@ class Tree(QGraphicsView):
         self.current_hovered_node = None
         
         # Use roots from manager
+        snapshots, anchors, nodes = self.snapshot_layout()
+        result = compute_layout(snapshots, anchors, 80, self.show_percentages)
+        self.apply_layout(result, nodes)
+
+    def measure_label(self, label):
+        width = self._label_widths.get(label)
+        if width is None:
+            width = self._label_metrics.horizontalAdvance(label)
+            self._label_widths[label] = width
+        return width
+
+    def snapshot_layout(self):
+        """Freezes the current tree for compute_layout(). Returns (snapshots, anchors, uid -> Node)."""
         self.roots = self.state_manager.roots
+        snapshots, anchors = snapshot_tree(self.roots, self.measure_label)
+        nodes = {node.uid: node for node in iter_preorder(self.roots)}
+        return snapshots, anchors, nodes
+
+    def request_layout(self, then=None):
+        """
+        Recomputes the layout in a worker thread and applies it when done.
+        A newer request cancels the pending one; `then` runs after the scene is updated.
+        """
+        if then:
+            self._layout_callbacks.append(then)
+        self.cancel_layout()
         
-        # Calculate Layout
-        if self.roots:
-            for root in self.roots:
-                 # Anchor Strategy: 
-                 # We want the root to stay exactly where it is (root.x, root.y).
-                 # But we need to layout its children relative to it.
-                 target_x = root.x
-                 target_y = root.y
-                 
-                 # 1. Calculate the layout of the subtree starting at 0,0 (virtual space)
-                 # This sets root.x to the visual center of the subtree
-                 self.layout_tree(root, 0, 0, 80)
-                 
-                 # 2. Calculate shift needed to move root back to target
-                 dx = target_x - root.x
-                 dy = target_y - root.y
-                 
-                 # 3. Apply shift to entire subtree
-                 root.translate(dx, dy)
-                 
-                 self.draw_node(root)
-            
+        snapshots, anchors, nodes = self.snapshot_layout()
+        self._layout_job_id += 1
+        self._layout_nodes = nodes
+        self._layout_job = _LayoutJob(self._layout_job_id, snapshots, anchors,
+                                      self.show_percentages, self.layout_signals)
+        QThreadPool.globalInstance().start(self._layout_job)
+
+    def after_layout(self, callback):
+        """Runs callback once the pending layout is applied, or right away if none is pending."""
+        if self._layout_job:
+            self._layout_callbacks.append(callback)
+        else:
+            callback()
+
+    def cancel_layout(self):
+        if self._layout_job:
+            self._layout_job.cancelled = True
+            self._layout_job = None
+            self._layout_nodes = {}
+
+    def _on_layout_finished(self, job_id, result):
+        # Results of superseded jobs (or of another perspective's scene) are dropped
+        if not self._layout_job or job_id != self._layout_job.job_id:
+            return
+        nodes = self._layout_nodes
+        self._layout_job = None
+        self._layout_nodes = {}
+        self.apply_layout(result, nodes)
+
+    def node_signature(self, node):
+        """Everything baked into a node's items besides its position. A change means redraw."""
+        percentage = int(self.node_percentages.get(node.uid, 0))
+        return (id(node), node.label, node.width, node.status, node.collapsed,
+                bool(node.children), percentage, cycle_percentage(node.cycle_time), self.summary_text(node))
+
+    def summary_text(self, node):
+        """Line drawn under a collapsed node: hidden count + aggregated time (None when expanded)."""
+        if not (node.collapsed and node.children):
+            return None
+        stats = self.state_manager.get_subtree_stats(node)
+        return f"▸ {count_descendants(node)} hidden • {self.hover_popup.format_time(stats.time)}"
+
+    def redraw_nodes(self, uids):
+        """Redraws drawn nodes whose signature changed outside a layout (stats, cycle ticks); positions stay."""
+        restyle = False
+        for uid in uids:
+            node = self.state_manager.get(uid)
+            if node is None or uid not in self.node_graphics:
+                continue
+            signature = self.node_signature(node)
+            if self.drawn_signatures.get(uid) == signature:
+                continue
+            self.remove_node_graphics(uid, keep_connection=True)
+            self.draw_single_node(node)
+            self.drawn_signatures[uid] = signature
+            self.refresh_tile_record(uid)
+            restyle = restyle or uid == self._styled_active_uid
+        if restyle:
+            self._styled_active_uid = None # The new box is drawn inactive
             self.update_node_styles()
-            
-            # Set scene rect so scrolling knows the boundaries
-            rect = self.scene.itemsBoundingRect()
-            margin = 50000 # Massive bound for effectively infinite panning
-            rect.adjust(-margin, -margin, margin, margin)
-            self.setSceneRect(rect)
+
+    def apply_layout(self, result, nodes):
+        """Applies a LayoutResult to the scene in one batch: drop, redraw or move items, then restyle."""
+        start = time.perf_counter()
+        self.end_tile_pan()
+        
+        # 1. Write the computed geometry back onto the nodes
+        for uid, (x, y, width) in result.positions.items():
+            node = nodes[uid]
+            if (node.x, node.y, node.width) != (x, y, width):
+                node.x, node.y, node.width = x, y, width
+                self.state_manager.mark_dirty(node) # Geometry is persisted with the next save
+        self.node_percentages = result.percentages
+        
+        # 2. Drop graphics of nodes that were deleted or got hidden by a collapse
+        for uid in [uid for uid in self.node_graphics if uid not in result.positions]:
+            self.remove_node_graphics(uid)
+        
+        # 3. Redraw nodes whose content changed, only move the others
+        touched = set()
+        for uid in result.order:
+            node = nodes[uid]
+            signature = self.node_signature(node)
+            if uid in self.node_graphics and self.drawn_signatures.get(uid) != signature:
+                self.remove_node_graphics(uid, keep_connection=True)
+            if uid not in self.node_graphics:
+                self.draw_single_node(node)
+                touched.add(uid)
+            elif self.move_node_graphics(node):
+                touched.add(uid)
+            self.drawn_signatures[uid] = signature
+        
+        # 4. Connections (lines of nodes that became roots are removed)
+        linked = set()
+        for parent_uid, child_uid in result.edges:
+            linked.add(child_uid)
+            line = self.connection_items.get(child_uid)
+            if line and parent_uid not in touched and child_uid not in touched:
+                continue
+            parent, child = nodes[parent_uid], nodes[child_uid]
+            if line:
+                line.setLine(parent.x + parent.width / 2, parent.y + parent.height,
+                             child.x + child.width / 2, child.y)
+            else:
+                self.draw_connection(parent, child)
+            touched.add(child_uid)
+        for uid in [uid for uid in self.connection_items if uid not in linked]:
+            self.scene.removeItem(self.connection_items.pop(uid))
+            touched.add(uid)
+        
+        # Only tiles under nodes that actually changed are invalidated
+        for uid in touched:
+            self.refresh_tile_record(uid)
+        
+        # 5. Styles and bounds (connections always lie between their nodes' hit rects)
+        self._styled_active_uid = None
+        self.update_node_styles()
+        self.content_rect = QRectF()
+        if self.node_index.rects:
+            rects = self.node_index.rects.values()
+            left = min(r[0] for r in rects)
+            top = min(r[1] for r in rects)
+            right = max(r[0] + r[2] for r in rects)
+            bottom = max(r[1] + r[3] for r in rects)
+            self.content_rect = QRectF(left, top, right - left, bottom - top)
+        self.update_scene_rect()
+        self.prefetch_tiles()
+        
+        self.last_layout_timings = dict(result.timings)
+        self.last_layout_timings["items"] = time.perf_counter() - start
+        
+        callbacks, self._layout_callbacks = self._layout_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def update_scene_rect(self):
+        # Set scene rect so scrolling knows the boundaries
+        rect = QRectF(self.content_rect)
+        margin = 50000 # Massive bound for effectively infinite panning
+        rect.adjust(-margin, -margin, margin, margin)
+        self.setSceneRect(rect)
+
+    def toggle_collapsed(self, node):
+        """Collapses or expands a subtree; the next layout drops or draws only the affected nodes."""
+        self.state_manager.set_collapsed(node, not node.collapsed) # Relayout via on_state_changed
+
+    def move_node_graphics(self, node):
+        drawn_x, drawn_y = self.drawn_positions[node.uid]
+        dx = node.x - drawn_x
+        dy = node.y - drawn_y
+        if not (dx or dy):
+            return False
+        for item in self.node_graphics[node.uid]:
+            item.moveBy(dx, dy)
+        self.drawn_positions[node.uid] = (node.x, node.y)
+        hx, hy, hw, hh = self.node_index.rects[node.uid]
+        self.node_index.insert(node.uid, hx + dx, hy + dy, hw, hh)
+        return True
+
+    def remove_node_graphics(self, uid, keep_connection=False):
+        for item in self.node_graphics.pop(uid, []):
+            self.scene.removeItem(item)
+        if not keep_connection:
+            line = self.connection_items.pop(uid, None)
+            if line:
+                self.scene.removeItem(line)
+        self.node_items.pop(uid, None)
+        self.text_items.pop(uid, None)
+        self.drawn_positions.pop(uid, None)
+        self.drawn_signatures.pop(uid, None)
+        self.node_index.remove(uid)
+        if self.tile_cache:
+            self.tile_cache.remove_node(uid)
+        if self.current_hovered_node and self.current_hovered_node.uid == uid:
+            self.hover_popup.hide()
+            self.current_hovered_node = None
             
     def get_view_state(self):
         center = self.mapToScene(self.viewport().rect().center())
@@ -449,77 +757,81 @@ class Tree(QGraphicsView):
         self.setTransform(matrix)
         self.centerOn(center_x, center_y)
 
-    def save_state(self):
-        state = self.get_view_state()
-        
-        # Load existing full state to preserve other perspectives
-        full_state = {}
-        if os.path.exists(self.state_file_path):
-            try:
-                with open(self.state_file_path, 'r') as f:
-                    full_state = json.load(f)
-            except:
-                full_state = {}
-        
-        # Update current perspective
-        full_state[self.perspective_name] = {
-            "view_center_x": state["center_x"],
-            "view_center_y": state["center_y"],
-            "view_zoom": state["zoom"]
-        }
+    def switch_perspective(self, name, state_manager, show_percentages):
+        """Swaps to another perspective's cached scene instead of rebuilding it."""
+        if name == self.perspective_name:
+            return
         
-        try:
-            with open(self.state_file_path, 'w') as f:
-                json.dump(full_state, f, indent=4)
-        except Exception as e:
-            print(f"Failed to save state: {e}")
+        self.cancel_connection()
+        self.end_tile_pan()
+        self.stash_perspective()
+        self._layout_callbacks = [] # Pending callbacks belong to the scene being hidden
+        
+        # Hidden perspectives are caught up through structure_generation instead of events
+        self.state_manager.unsubscribe(self.on_state_changed)
+        state_manager.subscribe(self.on_state_changed)
+        
+        self.perspective_name = name
+        self.state_manager = state_manager
+        self.show_percentages = show_percentages
+        self.current_hovered_node = None
+        
+        cached = self.perspective_scenes.get(name)
+        if not cached:
+            # First visit: build a fresh scene and restore the persisted view
+            self.tile_cache = None
+            self.scene = QGraphicsScene()
+            self.setScene(self.scene)
+            self.load_initial_view()
+            return
+        
+        for attr in self.SCENE_STATE_ATTRS:
+            setattr(self, attr, cached[attr])
+        self.setScene(self.scene)
+        
+        # Only rebuild if the structure was modified while this scene was hidden
+        if cached["generation"] != state_manager.structure_generation:
+            self.build_and_layout()
+        else:
+            if cached["service_generation"] != state_manager.generation:
+                # Cycle ticks and stats may have moved a badge percent or a collapsed summary;
+                # the signature covers both, so only those nodes are redrawn
+                self.redraw_nodes(list(self.node_graphics))
+            self.update_node_styles() # Active node may have changed in the other perspective
+        self.set_view_state(cached["view_state"])
+
+    def stash_perspective(self):
+        cached = {attr: getattr(self, attr) for attr in self.SCENE_STATE_ATTRS}
+        # A layout still pending for this scene is dropped, so force a rebuild on return
+        cached["generation"] = -1 if self._layout_job else self.state_manager.structure_generation
+        cached["service_generation"] = self.state_manager.generation # Cycle ticks and stats skip structure_generation
+        self.cancel_layout()
+        cached["view_state"] = self.get_view_state()
+        self.perspective_scenes[self.perspective_name] = cached
+
+    def save_state(self):
+        """Hands the view of every perspective to the settings store (written on its next flush)."""
+        view_states = {name: cached["view_state"] for name, cached in self.perspective_scenes.items()}
+        view_states[self.perspective_name] = self.get_view_state()
+        for name, view_state in view_states.items():
+            self.settings.set_view_state(name, view_state)
 
     def load_initial_view(self):
         self.build_and_layout()
         
-        full_state = {}
-        if os.path.exists(self.state_file_path):
-            try:
-                with open(self.state_file_path, 'r') as f:
-                    full_state = json.load(f)
-            except:
-                pass
-        
-        # Check for specific perspective state
-        state = full_state.get(self.perspective_name, {})
-        
-        if "view_zoom" in state:
-            # Restore previous state
-            zoom = float(state.get("view_zoom", 1.0))
-            center_x = float(state.get("view_center_x", 0.0))
-            center_y = float(state.get("view_center_y", 0.0))
-
-            # Apply Zoom
-            matrix = self.transform()
-            matrix.reset()
-            matrix.scale(zoom, zoom)
-            self.setTransform(matrix)
-
-            # Apply Pan
-            self.centerOn(center_x, center_y)
+        # Perspective state (or the older shared global one)
+        state = self.settings.view_state(self.perspective_name)
+        if state:
+            self.set_view_state(state)
         else:
-            # Fallback to shared global if perspective doesn't exist yet
-            global_zoom = full_state.get("view_zoom")
-            if global_zoom is not None:
-                self.set_view_state({
-                    "zoom": float(global_zoom),
-                    "center_x": float(full_state.get("view_center_x", 0)),
-                    "center_y": float(full_state.get("view_center_y", 0))
-                })
-            else:
-                # First time run: Fit everything
-                if self.scene.itemsBoundingRect().width() > 0:
-                    self.fitInView(self.scene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
+            # First time run: Fit everything
+            if self.content_rect.width() > 0:
+                self.fitInView(self.content_rect, Qt.AspectRatioMode.KeepAspectRatio)
 
     def check_visibility(self):
         """Ensure the content hasn't been panned/zoomed completely off-screen."""
         view_rect_scene = self.mapToScene(self.viewport().rect()).boundingRect()
-        items_rect = self.scene.itemsBoundingRect()
+        items_rect = self.content_rect # Maintained while drawing, no scene scan
         
         # If items are empty (no nodes), nothing to do
         if items_rect.width() == 0:
@@ -539,18 +851,18 @@ class Tree(QGraphicsView):
             pass
 
     def contextMenuEvent(self, event):
-        item = self.scene.itemAt(self.mapToScene(event.pos()), self.transform())
-        
         # Check if we clicked a node
-        clicked_node = None
-        if isinstance(item, (NodeBox, QGraphicsSimpleTextItem, EditableTextItem)):
-             clicked_node = item.data(0)
+        clicked_node = self.node_at(self.mapToScene(event.pos()))
 
         menu = QMenu(self)
 
         if clicked_node:
             add_child_action = menu.addAction("Add Child")
             connect_action = menu.addAction("Connect")
+            if clicked_node.children:
+                collapse_action = menu.addAction("Expand" if clicked_node.collapsed else "Collapse")
+            else:
+                collapse_action = None
             menu.addSeparator()
             
             # Toggle Solved/Neutral
@@ -576,20 +888,25 @@ class Tree(QGraphicsView):
             delete_all_action = menu.addAction("Delete All")
             delete_all_action.setEnabled(not is_life)
             
+            menu.addSeparator()
+            import_here_action = menu.addAction("Import Here...")
+            export_branch_action = menu.addAction("Export Branch...")
+            
             action = menu.exec(event.globalPos())
             
             # Check for multi-selection first
             selected_items = self.scene.selectedItems()
-            is_multi_select = item.isSelected() and len(selected_items) > 1
+            is_multi_select = self.node_items[clicked_node.uid].isSelected() and len(selected_items) > 1
 
             if action == add_child_action:
                 self.add_child_node(clicked_node)
             elif action == connect_action:
                 self.start_connection(clicked_node)
+            elif collapse_action and action == collapse_action:
+                self.toggle_collapsed(clicked_node)
             elif action == toggle_solved_action:
                 new_status = "neutral" if current_status == "solved" else "solved"
                 self.state_manager.update_node_status(clicked_node, new_status)
-                self.build_and_layout()
             elif action == rename_action:
                 self.rename_node(clicked_node)
             elif action == delete_action:
@@ -602,26 +919,67 @@ class Tree(QGraphicsView):
                      self.delete_selected(keep_children=False)
                  else:
                      self.delete_node(clicked_node, keep_children=False)
+            elif action == import_here_action:
+                self.import_tree(clicked_node)
+            elif action == export_branch_action:
+                self.export_tree(clicked_node)
         else:
             # Background Context Menu
             add_node_action = menu.addAction("Add Node")
+            menu.addSeparator()
+            tile_cache_action = menu.addAction("Tile Cache (Fast Panning)")
+            tile_cache_action.setCheckable(True)
+            tile_cache_action.setChecked(self.tile_cache_enabled)
+            stats_action = menu.addAction("Canvas Stats (F3)")
+            stats_action.setCheckable(True)
+            stats_action.setChecked(self.stats_overlay.isVisible())
+            menu.addSeparator()
+            import_action = menu.addAction("Import Tree...")
+            export_action = menu.addAction("Export Tree...")
             action = menu.exec(event.globalPos())
             
             if action == add_node_action:
                 # Pass the global position, we need to map it nicely
                 self.add_node(event.pos())
+            elif action == tile_cache_action:
+                self.set_tile_cache_enabled(not self.tile_cache_enabled)
+            elif action == stats_action:
+                self.toggle_stats_overlay()
+            elif action == import_action:
+                self.import_tree()
+            elif action == export_action:
+                self.export_tree()
+
+    def import_tree(self, parent_node=None):
+        """OPML, indented text, CSV edge list or JSON lines, added below parent_node (the root by default)."""
+        path, _ = QFileDialog.getOpenFileName(self, "Import Tree", "", tree_io.FILE_FILTER)
+        if not path:
+            return
+        try:
+            count = tree_io.import_tree(self.state_manager, path, parent_node)
+            print(f"TreeCanvas: Imported {count} node(s) from {os.path.basename(path)}")
+        except (OSError, tree_io.TreeFormatError) as e:
+            print(f"TreeCanvas: Import failed: {e}") # The transaction already rolled the tree back
+
+    def export_tree(self, node=None):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Tree", "", tree_io.FILE_FILTER)
+        if not path:
+            return
+        try:
+            count = tree_io.export_tree(self.state_manager, path, node)
+            print(f"TreeCanvas: Exported {count} node(s) to {os.path.basename(path)}")
+        except (OSError, tree_io.TreeFormatError) as e:
+            print(f"TreeCanvas: Export failed: {e}")
                 
     def add_child_node(self, parent_node):
         new_node = self.state_manager.add_child_node(parent_node, "New Child")
-        self.build_and_layout()
-        self.centerOn(new_node.x + new_node.width/2, new_node.y + new_node.height/2)
+        self.after_layout(lambda: self.centerOn(new_node.x + new_node.width/2, new_node.y + new_node.height/2))
                 
     def add_node(self, pos):
         # Convert view position (mouse) to scene position
         scene_pos = self.mapToScene(pos)
         new_node = self.state_manager.add_root_node("New Node", scene_pos.x(), scene_pos.y())
-        self.build_and_layout()
-        self.centerOn(new_node.x + new_node.width/2, new_node.y + new_node.height/2)
+        self.after_layout(lambda: self.centerOn(new_node.x + new_node.width/2, new_node.y + new_node.height/2))
 
     def start_connection(self, node):
         self.connecting_node = node
@@ -649,11 +1007,8 @@ class Tree(QGraphicsView):
 
     def finish_connection(self, target_parent):
         # Logic to reparent
-        success = self.state_manager.reparent_node(self.connecting_node, target_parent)
+        self.state_manager.reparent_node(self.connecting_node, target_parent)
         self.cancel_connection() # Clean up UI state
-        
-        if success:
-             self.build_and_layout()
 
     def cancel_connection(self):
         if self.temp_connection_line:
@@ -669,15 +1024,13 @@ class Tree(QGraphicsView):
 
     def rename_node(self, node):
         # Find the text item for this node
-        for item in self.scene.items():
-            if isinstance(item, EditableTextItem) and item.data(0) == node:
-                 item.start_editing()
-                 break
+        item = self.text_items.get(node.uid)
+        if item:
+            item.start_editing()
 
     def select_all(self):
-        for item in self.scene.items():
-            if isinstance(item, NodeBox):
-                item.setSelected(True)
+        for item in self.node_items.values():
+            item.setSelected(True)
 
     def delete_selected(self, keep_children=False):
         selected_items = self.scene.selectedItems()
@@ -691,68 +1044,29 @@ class Tree(QGraphicsView):
         if not nodes_to_delete:
             return
 
-        # Delegate to manager
-        success = False
-        if keep_children:
-            success = self.state_manager.delete_nodes_keep_children(nodes_to_delete)
-        else:
-            success = self.state_manager.delete_nodes(nodes_to_delete)
-
-        if success:
-            self.build_and_layout()
+        # Delegate to manager: one undo entry, one write and one relayout for the whole selection
+        with self.state_manager.transaction():
+            if keep_children:
+                self.state_manager.delete_nodes_keep_children(nodes_to_delete)
+            else:
+                self.state_manager.delete_nodes(nodes_to_delete)
 
     def delete_node(self, node, keep_children=False):
-        # Delegate to manager
-        success = False
+        # Delegate to manager (relayout via on_state_changed)
         if keep_children:
-            success = self.state_manager.delete_nodes_keep_children([node])
+            self.state_manager.delete_nodes_keep_children([node])
         else:
-            success = self.state_manager.delete_nodes([node])
-
-        if success:
-            self.build_and_layout()
+            self.state_manager.delete_nodes([node])
 
-    def layout_tree(self, node, x, y, level_height):
-        """Simple recursive layout. Returns the total width of this node's subtree."""
-        node.y = y
-        
-        # Calculate dynamic width based on text
-        from PyQt6.QtGui import QFontMetrics
-        metrics = QFontMetrics(QFont("Segoe UI", 10))
-        text_width = metrics.horizontalAdvance(node.label)
-        node.width = max(100, text_width + 40) # Min 100, add 40px padding
-        
-        if not node.children:
-            node.x = x
-            return node.width + 40 # 40px margin
-            
-        total_width = 0
-        child_x = x
-        
-        # Calculate subtree widths
-        subtree_widths = []
-        for child in node.children:
-            w = self.layout_tree(child, child_x, y + level_height, level_height)
-            subtree_widths.append(w)
-            child_x += w
-            total_width += w
-            
-        # Center parent over its children's subtree
-        # Use the total_width to center, not just the children's positions
-        node.x = x + (total_width - node.width) / 2
+    def draw_single_node(self, node):
+        items = []
         
-        return max(total_width, node.width + 40)
-
-
-    def draw_node(self, node):
-        # Draw connections first (so lines are behind boxes)
-        for child in node.children:
-            self.draw_connection(node, child)
-            self.draw_node(child)
-
         # Draw Box
         rect_item = NodeBox(node.x, node.y, node.width, node.height, node, self)
-        self.scene.addItem(rect_item)
+        rect_item.update_color(False) # Active highlight is applied by update_node_styles
+        self.add_scene_item(rect_item)
+        items.append(rect_item)
+        self.node_items[node.uid] = rect_item
 
         # Draw Text
         text_item = EditableTextItem(node, self)
@@ -763,11 +1077,13 @@ class Tree(QGraphicsView):
         text_y = node.y + (node.height - text_rect.height()) / 2
         text_item.setPos(text_x, text_y)
         
-        self.scene.addItem(text_item)
+        self.add_scene_item(text_item)
+        items.append(text_item)
+        self.text_items[node.uid] = text_item
 
         # Draw Percentage Badge (Top-Right)
         if self.show_percentages:
-            percentage = calculate_node_percentage(node)
+            percentage = self.node_percentages.get(node.uid, 0)
             perc_item = QGraphicsSimpleTextItem(f"{int(percentage)}%")
             perc_item.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
             
@@ -792,14 +1108,12 @@ class Tree(QGraphicsView):
             shadow.setColor(QColor(0, 0, 0, 200))
             perc_item.setGraphicsEffect(shadow)
             
-            self.scene.addItem(perc_item)
+            self.add_scene_item(perc_item)
+            items.append(perc_item)
 
         # Draw Cycle Percentage Badge (Bottom-Right) - Blue
         if hasattr(node, 'cycle_time'):
-            from Infrastructure.variables import CYCLE_TIME_LIMIT
-            cycle_perc = (node.cycle_time / CYCLE_TIME_LIMIT) * 100
-            
-            c_perc_item = QGraphicsSimpleTextItem(f"{int(cycle_perc)}%")
+            c_perc_item = QGraphicsSimpleTextItem(f"{cycle_percentage(node.cycle_time)}%")
             c_perc_item.setFont(QFont("Segoe UI", 7, QFont.Weight.Bold))
             c_perc_item.setBrush(QBrush(QColor("#2196F3"))) # Electric Blue
             
@@ -816,7 +1130,31 @@ class Tree(QGraphicsView):
             c_shadow.setColor(QColor(0, 0, 0, 180))
             c_perc_item.setGraphicsEffect(c_shadow)
             
-            self.scene.addItem(c_perc_item)
+            self.add_scene_item(c_perc_item)
+            items.append(c_perc_item)
+
+        # Summary line under a collapsed node: hidden count + aggregated time
+        summary = self.summary_text(node)
+        if summary:
+            summary_item = QGraphicsSimpleTextItem(summary)
+            summary_item.setFont(QFont("Segoe UI", 8))
+            summary_item.setBrush(QBrush(QColor("#aaaaaa")))
+            summary_item.setData(0, node)
+            
+            s_rect = summary_item.boundingRect()
+            summary_item.setPos(node.x + (node.width - s_rect.width()) / 2, node.y + node.height + 4)
+            
+            self.add_scene_item(summary_item)
+            items.append(summary_item)
+
+        self.node_graphics[node.uid] = items
+        self.drawn_positions[node.uid] = (node.x, node.y)
+        
+        # Hit area for node_at(): box plus its badges
+        hit_rect = QRectF()
+        for item in items:
+            hit_rect = hit_rect.united(item.sceneBoundingRect())
+        self.node_index.insert(node.uid, hit_rect.x(), hit_rect.y(), hit_rect.width(), hit_rect.height())
 
     def draw_connection(self, parent, child):
         start_x = parent.x + parent.width / 2
@@ -828,16 +1166,156 @@ class Tree(QGraphicsView):
         path = QGraphicsLineItem(start_x, start_y, end_x, end_y)
         pen = QPen(QColor("#888888"), 2)
         path.setPen(pen)
-        self.scene.addItem(path)
+        path.setZValue(-1) # Keep lines behind boxes, even when drawn after them
+        self.add_scene_item(path)
+        self.connection_items[child.uid] = path
+
+    def add_scene_item(self, item):
+        """Adds a node graphic to the scene and grows the cached content bounds."""
+        self.scene.addItem(item)
+        self.content_rect = self.content_rect.united(item.sceneBoundingRect())
+
+    def resolve_active_uid(self):
+        """Returns the uid of the box representing the active node in this scene, if any."""
+        if not self.active_node:
+            return None
+        # By uid, so the box is still found after undo/redo rebuilt the Node objects.
+        # An active node from the other perspective's service is simply not in this scene.
+        uid = self.active_node.uid
+        if self.state_manager.get(uid) and uid in self.node_items:
+            return uid
+        return None
 
     def update_node_styles(self):
-        active_label = self.active_node.label if self.active_node else None
+        """Restyles only the previously active and the newly active box."""
+        active_uid = self.resolve_active_uid()
+        if active_uid == self._styled_active_uid:
+            return
         
-        for item in self.scene.items():
-            if isinstance(item, NodeBox):
-                # Identity check first, then Label check as fallback for shared nodes between perspectives
-                is_active = (item.node == self.active_node) or (active_label and item.node.label == active_label)
-                item.update_color(is_active)
+        for uid in (self._styled_active_uid, active_uid):
+            item = self.node_items.get(uid)
+            if item:
+                item.update_color(uid == active_uid)
+                self.refresh_tile_record(uid)
+        self._styled_active_uid = active_uid
+
+    # --- Search ---
+    def highlight_nodes(self, uids):
+        """Outlines the given nodes (search matches); only boxes whose state changed are restyled."""
+        uids = set(uids)
+        changed = uids ^ self.highlighted_uids
+        self.highlighted_uids = uids
+        for uid in changed:
+            item = self.node_items.get(uid)
+            if item:
+                item.update_color(uid == self._styled_active_uid)
+                self.refresh_tile_record(uid)
+
+    def focus_node(self, uid):
+        """Centres the view on a node, expanding collapsed ancestors first if it is hidden."""
+        node = self.state_manager.get(uid)
+        if not node:
+            return
+        
+        def _center():
+            self.scene.clearSelection()
+            item = self.node_items.get(uid)
+            if item:
+                item.setSelected(True)
+            self.centerOn(node.x + node.width / 2, node.y + node.height / 2)
+            self.prefetch_tiles()
+        
+        # One transaction, so expanding several ancestors costs a single relayout
+        with self.state_manager.transaction():
+            for ancestor in self.state_manager.ancestors(uid):
+                if ancestor.collapsed:
+                    self.state_manager.set_collapsed(ancestor, False)
+        self.after_layout(_center)
+
+    # --- Tile Cache ---
+    def set_tile_cache_enabled(self, enabled):
+        self.tile_cache_enabled = enabled
+        if enabled:
+            self.ensure_tile_cache()
+            for uid in self.node_graphics:
+                self.refresh_tile_record(uid)
+            self.prefetch_tiles()
+        elif self.tile_cache:
+            self.end_tile_pan()
+            self.tile_cache.clear()
+            self.tile_cache = None
+
+    def ensure_tile_cache(self):
+        if self.tile_cache_enabled and not self.tile_cache:
+            self.tile_cache = TileCache(self)
+            self.tile_cache.tile_ready.connect(self.viewport().update)
+
+    def refresh_tile_record(self, uid):
+        """Re-captures one node's static graphics; only tiles under its old/new region are dropped."""
+        if not self.tile_cache:
+            return
+        items = list(self.node_graphics.get(uid, []))
+        line = self.connection_items.get(uid)
+        if line:
+            items.append(line)
+        self.tile_cache.update_node(uid, items)
+
+    def prefetch_tiles(self):
+        """Requests tiles for the viewport plus one viewport of margin on every side."""
+        if not self.tile_cache:
+            return
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        margin = visible.adjusted(-visible.width(), -visible.height(), visible.width(), visible.height())
+        self.tile_cache.request(margin, self.transform().m11())
+
+    def begin_tile_pan(self):
+        if not self.tile_cache:
+            return
+        self.prefetch_tiles()
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        if not self.tile_cache.covers(visible, self.transform().m11()):
+            return # Tiles not ready yet, pan with live items this time
+        self.set_static_layer_visible(False)
+        self._tiles_active = True
+
+    def end_tile_pan(self):
+        if not self._tiles_active:
+            return
+        self._tiles_active = False
+        self.set_static_layer_visible(True)
+
+    def set_static_layer_visible(self, visible):
+        for uid, items in self.node_graphics.items():
+            box = self.node_items.get(uid)
+            if box and box.isSelected():
+                continue # Selection stays live as a dynamic overlay
+            for item in items:
+                item.setVisible(visible)
+            line = self.connection_items.get(uid)
+            if line:
+                line.setVisible(visible)
+
+    # --- Canvas Stats ---
+    def toggle_stats_overlay(self):
+        self.stats_overlay.set_enabled(not self.stats_overlay.isVisible())
+
+    def paintEvent(self, event):
+        if not self.stats_overlay.isVisible():
+            super().paintEvent(event)
+            return
+        start = time.perf_counter()
+        super().paintEvent(event)
+        interacting = self._is_panning or time.perf_counter() - self._last_zoom_time < 0.5
+        self.stats_overlay.record_frame(time.perf_counter() - start, interacting)
+
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        if self._tiles_active and self.tile_cache:
+            scale = self.transform().m11()
+            if not self.tile_cache.paint(painter, rect, scale):
+                # Panned past the prefetched area: fetch it and fall back to live items
+                self.tile_cache.request(rect, scale)
+                QTimer.singleShot(0, self.end_tile_pan)
 
 
     def show_hover_popup(self, node):
@@ -61,6 +61,8 @@ class AppInitializer:
             self.main_window.tree.save_state()
             self.main_window.problems_manager.save()
             self.main_window.values_manager.save()
+        if hasattr(self.main_window, 'settings'):
+            self.main_window.settings.flush() # No-op unless something changed since the last flush
 
     def autosave(self):
         """Periodic background save (Heartbeat)."""
@@ -80,6 +82,7 @@ class AppInitializer:
         self.history_recorder.reset()
         
         self.last_reset_date = today
+        self.main_window.archive_completed_intentions()
         
         # 3. Refresh UI if view is active
         if self.main_window.current_pomodoro_view:
@@ -1,11 +1,9 @@
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer, Qt
 from PyQt6.QtGui import QFont
-import json
-import os
 from datetime import datetime
 
-from Infrastructure.variables import SESSION_LOGS_PATH, NTFY_PRIORITY_URGENT, NTFY_PRIORITY_DEFAULT, FOCUS_TIME, SHORT_BREAK_TIME, LONG_BREAK_TIME
+from Infrastructure.variables import NTFY_PRIORITY_URGENT, NTFY_PRIORITY_DEFAULT, FOCUS_TIME, SHORT_BREAK_TIME, LONG_BREAK_TIME
 from Adapters.External.ntfy_notifier import NtfyNotifier
 
 # --- Hexagonal UI Adapters (Popups) ---
@@ -71,17 +69,7 @@ class Orchestrator(QObject):
             "duration_mins": self.main_window.timer_engine.config.get("focus_minutes", 25)
         }
         
-        logs = []
-        if os.path.exists(SESSION_LOGS_PATH):
-            try:
-                with open(SESSION_LOGS_PATH, 'r') as f:
-                    logs = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError, PermissionError):
-                logs = []
-        
-        logs.append(log_entry)
-        with open(SESSION_LOGS_PATH, 'w') as f:
-            json.dump(logs, f, indent=4)
+        self.main_window.repository.append_session_log(log_entry)
 
     def show_break_end(self):
         """Called when the break timer finishes."""
@@ -114,7 +102,7 @@ class Orchestrator(QObject):
             if self.main_window.current_pomodoro_view:
                 view = self.main_window.current_pomodoro_view
                 self.main_window.timer_engine.stop()
-                view.intentions_list.setCurrentRow(-1)
+                view.set_current_row(-1)
 
     def handle_focus_start(self):
         """Called when a focus session starts."""
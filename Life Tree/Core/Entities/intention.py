@@ -0,0 +1,48 @@
+class Stats:
+    """Time (seconds), words and chars tracked for an intention or archived on a node."""
+    __slots__ = ("time", "words", "chars")
+
+    def __init__(self, time=0, words=0, chars=0):
+        self.time = time
+        self.words = words
+        self.chars = chars
+
+    def add(self, other):
+        """Accumulates another Stats into this one (in place)."""
+        self.time += other.time
+        self.words += other.words
+        self.chars += other.chars
+        return self
+
+    def copy(self):
+        return Stats(self.time, self.words, self.chars)
+
+    def to_dict(self):
+        return {"time": self.time, "words": self.words, "chars": self.chars}
+
+    @classmethod
+    def from_dict(cls, data):
+        if not data:
+            return cls()
+        return cls(data.get("time", 0), data.get("words", 0), data.get("chars", 0))
+
+
+class Intention:
+    __slots__ = ("text", "status", "stats", "completed_at")
+
+    def __init__(self, text, status="active", stats=None, completed_at=None):
+        self.text = text
+        self.status = status # active, completed
+        self.stats = stats if stats is not None else Stats()
+        self.completed_at = completed_at # ISO timestamp, set when completed (drives archival)
+
+    def to_dict(self):
+        data = {"text": self.text, "status": self.status, "stats": self.stats.to_dict()}
+        if self.completed_at:
+            data["completed_at"] = self.completed_at
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("text", ""), data.get("status", "active"), Stats.from_dict(data.get("stats")),
+                   data.get("completed_at"))
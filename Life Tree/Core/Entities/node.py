@@ -1,14 +1,30 @@
 import uuid
+from Core.Entities.intention import Intention, Stats
+from Core.Entities.tree_traversal import iter_preorder, iter_postorder
 
 class Node:
+    # Slots: no per-instance __dict__, which matters with tens of thousands of nodes
+    __slots__ = (
+        "label", "uid", "status", "_description", "children", "_intentions", "archived_stats",
+        "_allowed_windows", "parent", "x", "y", "width", "height", "cycle_time", "cycle_count", "collapsed",
+        "_details", "_loader", "_intention_stats"
+    )
+
+    # Detail fields (description, intentions, allowed_windows) of a node loaded from a skeleton
+    # stay on disk until first access: _details is their storage reference, _loader(node) reads them
+    DETAIL_FIELDS = ("description", "intentions", "allowed_windows")
+
     def __init__(self, label, uid=None, status="neutral", description=""):
+        self._details = None
+        self._loader = None
+        self._intention_stats = None # Cached sum of intention Stats while not hydrated
         self.label = label
         self.uid = uid if uid else str(uuid.uuid4()) # Unique Identifier
         self.status = status # status: solved, solving, neutral
         self.description = description
         self.children = []
-        self.intentions = [] # List of dicts: {"text": str, "status": str, "stats": dict}
-        self.archived_stats = {"time": 0, "words": 0, "chars": 0} # Accumulated stats from cleared intentions/deleted children
+        self.intentions = [] # List of Intention
+        self.archived_stats = Stats() # Accumulated stats from cleared intentions/deleted children
         self.allowed_windows = [] # Whitelist for Deep Focus
         self.parent = None
         self.x = 0
@@ -17,6 +33,84 @@ class Node:
         self.height = 40
         self.cycle_time = 0 # Seconds spent in current 8-hour cycle
         self.cycle_count = 0 # Number of completed 8-hour cycles
+        self.collapsed = False # Subtree hidden in the tree view (drawn as a summary node)
+
+    # --- Detail fields (hydrated on first access) ---
+    @property
+    def is_hydrated(self):
+        return self._details is None
+
+    def hydrate(self):
+        """Loads the detail fields if they are still on disk."""
+        if self._details is None:
+            return
+        loader, self._loader = self._loader, None
+        if loader:
+            loader(self) # Expected to call set_details()
+        if self._details is not None:
+            print(f"Node: No details available for {self.uid}")
+            self.set_details({})
+
+    def set_details(self, data):
+        """Fills the detail fields from a details dict and marks the node hydrated."""
+        self._details = None
+        self._intention_stats = None
+        self._description = data.get("description", "")
+        self._intentions = [Intention.from_dict(i) for i in data.get("intentions", [])]
+        self._allowed_windows = data.get("allowed_windows", [])
+
+    def details_dict(self):
+        return {
+            "uid": self.uid,
+            "description": self.description,
+            "intentions": [intention.to_dict() for intention in self.intentions],
+            "allowed_windows": self.allowed_windows,
+        }
+
+    def intention_totals(self):
+        """Sum of this node's intention Stats, without hydrating it."""
+        if self._details is not None:
+            return self._intention_stats.copy() if self._intention_stats else Stats()
+        totals = Stats()
+        for intention in self._intentions:
+            totals.add(intention.stats)
+        return totals
+
+    @property
+    def description(self):
+        if self._details is not None:
+            self.hydrate()
+        return self._description
+
+    @description.setter
+    def description(self, value):
+        if self._details is not None:
+            self.hydrate()
+        self._description = value
+
+    @property
+    def intentions(self):
+        if self._details is not None:
+            self.hydrate()
+        return self._intentions
+
+    @intentions.setter
+    def intentions(self, value):
+        if self._details is not None:
+            self.hydrate()
+        self._intentions = value
+
+    @property
+    def allowed_windows(self):
+        if self._details is not None:
+            self.hydrate()
+        return self._allowed_windows
+
+    @allowed_windows.setter
+    def allowed_windows(self, value):
+        if self._details is not None:
+            self.hydrate()
+        self._allowed_windows = value
 
     def add_child(self, node):
         node.parent = self
@@ -46,47 +140,96 @@ class Node:
 
     def translate(self, dx, dy):
         """Moves this node and all its descendants by dx, dy."""
-        self.x += dx
-        self.y += dy
-        for child in self.children:
-            child.translate(dx, dy)
+        for node in iter_preorder([self]):
+            node.x += dx
+            node.y += dy
 
-    def to_dict(self):
+    def to_dict(self, skeleton=False):
+        # Children are serialized before their parent, so no recursion is needed
+        built = {}
+        for node in iter_postorder([self]):
+            data = node._skeleton_dict() if skeleton else node._fields_dict()
+            data["children"] = [built.pop(id(child)) for child in node.children]
+            built[id(node)] = data
+        return built[id(self)]
+
+    def _fields_dict(self):
+        """This node's own fields, without children. A node that isn't hydrated keeps its details reference."""
+        if self._details is not None:
+            return self._skeleton_dict()
         return {
             "label": self.label,
             "uid": self.uid,
             "status": self.status,
-            "description": self.description,
+            "description": self._description,
             "x": self.x,
             "y": self.y,
             "width": self.width,
             "height": self.height,
-            "intentions": self.intentions,
-            "archived_stats": self.archived_stats,
-            "allowed_windows": self.allowed_windows,
+            "intentions": [intention.to_dict() for intention in self._intentions],
+            "archived_stats": self.archived_stats.to_dict(),
+            "allowed_windows": self._allowed_windows,
+            "cycle_time": self.cycle_time,
+            "cycle_count": self.cycle_count,
+            "collapsed": self.collapsed,
+        }
+
+    def _skeleton_dict(self, details=None):
+        """Own fields minus the detail fields, plus their reference and cached aggregates."""
+        return {
+            "label": self.label,
+            "uid": self.uid,
+            "status": self.status,
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "archived_stats": self.archived_stats.to_dict(),
             "cycle_time": self.cycle_time,
             "cycle_count": self.cycle_count,
-            "children": [child.to_dict() for child in self.children]
+            "collapsed": self.collapsed,
+            "details": details if details is not None else self._details,
+            "intention_stats": self.intention_totals().to_dict(),
         }
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, loader=None):
+        """loader(node) -> details dict, for skeleton nodes (saved with a "details" reference instead of intentions)."""
+        root = None
+        stack = [(data, None)]
+        while stack:
+            node_data, parent = stack.pop()
+            node = cls._from_fields(node_data, loader)
+            if parent:
+                parent.add_child(node)
+            else:
+                root = node
+            # Reversed so children are popped, and therefore appended, in their original order
+            stack.extend((child_data, node) for child_data in reversed(node_data.get("children", [])))
+        return root
+
+    @classmethod
+    def _from_fields(cls, data, loader=None):
+        """Builds a single node from its own fields, ignoring children."""
         node = cls(
             data.get("label", "Unknown"),
             uid=data.get("uid"),
             status=data.get("status", "neutral"),
             description=data.get("description", "")
         )
-        node.intentions = data.get("intentions", [])
-        node.archived_stats = data.get("archived_stats", {"time": 0, "words": 0, "chars": 0})
-        node.allowed_windows = data.get("allowed_windows", [])
+        if data.get("details") is not None and "intentions" not in data:
+            node._details = data["details"]
+            node._loader = loader
+            node._intention_stats = Stats.from_dict(data.get("intention_stats"))
+        else:
+            node._intentions = [Intention.from_dict(i) for i in data.get("intentions", [])]
+            node._allowed_windows = data.get("allowed_windows", [])
+        node.archived_stats = Stats.from_dict(data.get("archived_stats"))
         node.x = data.get("x", 0)
         node.y = data.get("y", 0)
         node.width = data.get("width", 100)
         node.height = data.get("height", 40)
         node.cycle_time = data.get("cycle_time", 0)
         node.cycle_count = data.get("cycle_count", 0)
-        for child_data in data.get("children", []):
-            child_node = cls.from_dict(child_data)
-            node.add_child(child_node)
+        node.collapsed = data.get("collapsed", False)
         return node
@@ -0,0 +1,42 @@
+"""
+Explicit-stack tree walks. No recursion, so depth is only bounded by memory,
+and there is no per-level Python call overhead.
+
+`children(node)` overrides which children are followed (default: node.children),
+e.g. to stop at collapsed nodes or to walk plain dicts.
+"""
+
+def _default_children(node):
+    return node.children
+
+
+def iter_preorder(roots, children=None):
+    """Yields every node under roots, parents before children, siblings in order."""
+    children = children or _default_children
+    stack = list(reversed(roots))
+    while stack:
+        node = stack.pop()
+        yield node
+        kids = children(node)
+        if kids:
+            stack.extend(reversed(kids))
+
+
+def iter_postorder(roots, children=None):
+    """Yields every node under roots, children before their parent, siblings in order."""
+    children = children or _default_children
+    stack = [(node, False) for node in reversed(roots)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            yield node
+            continue
+        stack.append((node, True))
+        kids = children(node)
+        if kids:
+            stack.extend((child, False) for child in reversed(kids))
+
+
+def count_descendants(node):
+    """Number of nodes below node (node itself excluded)."""
+    return sum(1 for _ in iter_preorder(node.children))
@@ -0,0 +1,104 @@
+import os
+import json
+
+class SerializationError(ValueError):
+    """Raised when stored bytes cannot be decoded by any registered backend."""
+    pass
+
+
+class Serializer:
+    """
+    Port: turns plain data (dicts, lists, str, numbers, bool, None) into bytes and back.
+    format names the on-disk encoding ("json" or "msgpack") so load_bytes() can pick a decoder.
+    """
+    name = "abstract"
+    format = "json"
+
+    def dumps(self, obj, pretty=False):
+        raise NotImplementedError
+
+    def loads(self, data):
+        raise NotImplementedError
+
+
+class StdlibJsonSerializer(Serializer):
+    """Default backend: the standard library json module."""
+    name = "json"
+    format = "json"
+
+    def dumps(self, obj, pretty=False):
+        if pretty:
+            return json.dumps(obj, indent=2).encode("utf-8")
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+# Active backend for writing, and one decoder per known format for reading
+_serializer = StdlibJsonSerializer()
+_decoders = {"json": _serializer}
+
+
+def get_serializer():
+    return _serializer
+
+
+def set_serializer(serializer):
+    """Selects the backend every store writes with. Its format also becomes decodable."""
+    global _serializer
+    _serializer = serializer
+    _decoders[serializer.format] = serializer
+
+
+def register_decoder(serializer):
+    """Makes files in serializer.format readable (replacing the previous decoder for that format)."""
+    _decoders[serializer.format] = serializer
+
+
+def sniff_format(data):
+    """
+    Guesses the encoding of stored bytes from the first significant byte.
+    JSON documents start with whitespace, a UTF-8 BOM, [ { " or a scalar; MessagePack
+    maps/arrays start with a 0x80-0x9f fixmap/fixarray or 0xdc-0xdf array16/32 and map16/32 marker.
+    """
+    for byte in data[:64]:
+        if byte in b" \t\r\n":
+            continue
+        if byte == 0xEF or byte in b'[{"-0123456789tfn':
+            return "json"
+        return "msgpack"
+    return "json"
+
+
+def load_bytes(data):
+    """Decodes bytes written by any backend (old indented JSON included)."""
+    fmt = sniff_format(data)
+    decoder = _decoders.get(fmt)
+    if decoder is None:
+        raise SerializationError(f"No decoder installed for {fmt} data")
+    if fmt == "json" and data[:3] == b"\xef\xbb\xbf":
+        data = data[3:]
+    try:
+        return decoder.loads(data)
+    except Exception as e:
+        raise SerializationError(f"{decoder.name}: {e}") from e
+
+
+def read_file(path):
+    """Reads and decodes a stored file. Raises OSError or SerializationError."""
+    with open(path, 'rb') as f:
+        return load_bytes(f.read())
+
+
+def write_file(path, obj, pretty=False, atomic=False):
+    """
+    Encodes obj with the active backend and writes it.
+    atomic writes a temporary file and renames it over path, so readers never see a partial file.
+    """
+    data = _serializer.dumps(obj, pretty=pretty)
+    target = path + ".tmp" if atomic else path
+    with open(target, 'wb') as f:
+        f.write(data)
+    if atomic:
+        os.replace(target, path)
@@ -0,0 +1,36 @@
+from enum import Enum
+
+class ChangeKind(Enum):
+    NODE_ADDED = "node_added"
+    NODE_REMOVED = "node_removed" # The whole subtree went with it
+    NODE_MOVED = "node_moved" # old/new = previous/new parent uid
+    NODE_RENAMED = "node_renamed"
+    STATUS_CHANGED = "status_changed"
+    COLLAPSED_CHANGED = "collapsed_changed"
+    INTENTIONS_CHANGED = "intentions_changed" # Texts or statuses of a node's intentions
+    STATS_CHANGED = "stats_changed" # delta = Stats added to one of the node's intentions
+    CYCLE_CHANGED = "cycle_changed" # old/new = cycle_time before/after
+    RELOADED = "reloaded" # Every Node object was replaced (undo, redo, rollback)
+
+# Kinds that change what the tree draws (positions, labels, badges)
+LAYOUT_KINDS = frozenset({
+    ChangeKind.NODE_ADDED, ChangeKind.NODE_REMOVED, ChangeKind.NODE_MOVED,
+    ChangeKind.NODE_RENAMED, ChangeKind.STATUS_CHANGED, ChangeKind.COLLAPSED_CHANGED,
+    ChangeKind.RELOADED,
+})
+
+
+class ChangeEvent:
+    """One change published by NodeService. generation is the service generation it produced."""
+    __slots__ = ("kind", "uid", "old", "new", "delta", "generation")
+
+    def __init__(self, kind, uid=None, old=None, new=None, delta=None, generation=0):
+        self.kind = kind
+        self.uid = uid
+        self.old = old
+        self.new = new
+        self.delta = delta
+        self.generation = generation
+
+    def __repr__(self):
+        return f"ChangeEvent({self.kind.value}, uid={self.uid}, gen={self.generation})"
@@ -1,19 +1,21 @@
 import time
-import json
 import os
 import datetime
 from collections import deque
+from Core.Ports.serializer import read_file, write_file
 from Infrastructure.variables import STATS_HISTORY_PATH
 
 class HistoryRecorder:
     """
     Core service for recording and retrieving time-series productivity data.
     """
-    def __init__(self, active_tracker, word_tracker, max_history=86400):
+    def __init__(self, active_tracker, word_tracker, max_history=86400, store=None):
         self.active_tracker = active_tracker
         self.word_tracker = word_tracker
         self.max_history = max_history
         self.filepath = STATS_HISTORY_PATH
+        self.store = store # Optional row store (append_history/load_history) used instead of filepath
+        self._saved_until = None # Timestamp of the last point handed to the store
         
         # Data structure: list of tuples (timestamp, active_seconds, word_count, char_count, node_label, intention_label)
         self.data_points = deque(maxlen=max_history)
@@ -53,20 +55,33 @@ class HistoryRecorder:
 
     def save(self):
         try:
-            with open(self.filepath, 'w') as f:
-                json.dump(list(self.data_points), f)
+            if self.store:
+                # Rows are appended, so only points recorded since the last save are written
+                new_points = [pt for pt in self.data_points if self._saved_until is None or pt[0] > self._saved_until]
+                if new_points:
+                    self.store.append_history(new_points)
+                    self._saved_until = new_points[-1][0]
+                return
+            write_file(self.filepath, list(self.data_points))
         except Exception as e:
             print(f"HistoryRecorder: Failed to save history: {e}")
 
     def load(self):
+        today_start = datetime.datetime.combine(datetime.date.today(), datetime.time.min).timestamp()
+        if self.store:
+            try:
+                self.data_points.clear()
+                self.data_points.extend(tuple(pt) for pt in self.store.load_history(today_start))
+                self._saved_until = self.data_points[-1][0] if self.data_points else None
+            except Exception as e:
+                print(f"HistoryRecorder: Failed to load history: {e}")
+            return
+        
         if not os.path.exists(self.filepath):
             return
             
         try:
-            with open(self.filepath, 'r') as f:
-                loaded = json.load(f)
-                
-            today_start = datetime.datetime.combine(datetime.date.today(), datetime.time.min).timestamp()
+            loaded = read_file(self.filepath)
             
             self.data_points.clear()
             for pt in loaded:
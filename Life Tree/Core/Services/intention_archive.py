@@ -0,0 +1,100 @@
+import os
+import json
+
+
+class IntentionArchive:
+    """
+    Cold storage for completed intentions moved out of the tree (see NodeService.archive_completed).
+    Append-only JSON lines, one {"uid", "text", "status", "stats", "completed_at", "archived_at"} per intention.
+    Lines are indexed by node uid on first use, so paging one node's history only reads its own lines.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._by_uid = None # uid -> [(offset, length), ...] in file order (oldest archived first)
+        self._keys = set() # (uid, text, completed_at) already archived, so a retried sweep can't duplicate
+        self._indexed_bytes = 0
+
+    # --- Writing ---
+    def append(self, uid, intentions, archived_at):
+        """Archives Intention objects of node uid. Returns how many were new."""
+        self._ensure_index()
+        lines = []
+        for intention in intentions:
+            key = (uid, intention.text, intention.completed_at)
+            if key in self._keys:
+                continue
+            self._keys.add(key)
+            entry = intention.to_dict()
+            entry["uid"] = uid
+            entry["archived_at"] = archived_at
+            lines.append(json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n")
+        if not lines:
+            return 0
+
+        if os.path.exists(self.path) and os.path.getsize(self.path) > self._indexed_bytes:
+            with open(self.path, 'r+b') as f:
+                f.truncate(self._indexed_bytes) # Torn line from a crash; the next append must start clean
+        with open(self.path, 'ab') as f:
+            offset = f.tell()
+            for line in lines:
+                f.write(line)
+                self._by_uid.setdefault(uid, []).append((offset, len(line)))
+                offset += len(line)
+            self._indexed_bytes = offset
+        return len(lines)
+
+    # --- Reading ---
+    def count(self, uids=None):
+        """Number of archived intentions, for all nodes or only the given uids."""
+        self._ensure_index()
+        if uids is None:
+            return sum(len(refs) for refs in self._by_uid.values())
+        return sum(len(self._by_uid.get(uid, ())) for uid in uids)
+
+    def page(self, uids=None, start=0, limit=50):
+        """
+        Archived entries (dicts) newest archived first, skipping start and returning at most limit.
+        uids restricts the page to those nodes (e.g. a node and its descendants).
+        """
+        self._ensure_index()
+        if uids is None:
+            refs = [ref for node_refs in self._by_uid.values() for ref in node_refs]
+        else:
+            refs = [ref for uid in uids for ref in self._by_uid.get(uid, ())]
+        refs.sort(reverse=True) # File order is archive order
+        refs = refs[start:start + limit]
+        if not refs:
+            return []
+
+        entries = []
+        with open(self.path, 'rb') as f:
+            for offset, length in refs:
+                f.seek(offset)
+                try:
+                    entries.append(json.loads(f.read(length)))
+                except ValueError:
+                    continue
+        return entries
+
+    def _ensure_index(self):
+        """Indexes lines appended since the last call (all of them the first time)."""
+        if self._by_uid is None:
+            self._by_uid = {}
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size <= self._indexed_bytes:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self._indexed_bytes)
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break # Missing or torn last line
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                uid = entry.get("uid")
+                self._by_uid.setdefault(uid, []).append((offset, len(line)))
+                self._keys.add((uid, entry.get("text"), entry.get("completed_at")))
+            self._indexed_bytes = offset
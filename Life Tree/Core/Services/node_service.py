@@ -1,34 +1,154 @@
-import json
 import os
+import math
+import uuid
+import datetime
+import itertools
+from contextlib import contextmanager
 from Core.Entities.node import Node
+from Core.Entities.intention import Intention, Stats
+from Core.Services.change_events import ChangeKind, ChangeEvent, LAYOUT_KINDS
+from Core.Entities.tree_traversal import iter_preorder
+from Core.Services.search_index import SearchIndex
+from Core.Services.tree_serializer import FragmentCache
+from Core.Services.tree_journal import TreeJournal
+from Core.Services.intention_archive import IntentionArchive
+from Core.Ports.serializer import StdlibJsonSerializer, SerializationError, get_serializer, read_file, load_bytes
+from Infrastructure.variables import (CYCLE_TIME_LIMIT, TREE_SAVE_PRETTY, TREE_JOURNAL_ENABLED, TREE_LAZY_DETAILS,
+                                      INTENTION_ARCHIVE_DAYS, TREE_IMPORT_BATCH_SIZE)
+
+_FRAGMENT_FALLBACK = StdlibJsonSerializer()
+
+
+class TreeFormatError(ValueError):
+    """Raised for tree files or import records that can't be imported (unknown extension, malformed content)."""
+
+
+def _import_text(value, field, default=""):
+    if value is None:
+        return default
+    if isinstance(value, (dict, list, bool)):
+        raise TreeFormatError(f"Import record field '{field}' should be text, got {value!r:.60}")
+    return str(value)
+
+
+def _import_number(value, field, default=0, integer=False):
+    """Numbers, or numeric text (CSV and OPML carry strings)."""
+    if value is None or value == "":
+        return default
+    number = value
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            number = None
+    if isinstance(number, bool) or not isinstance(number, (int, float)) or not math.isfinite(number):
+        raise TreeFormatError(f"Import record field '{field}' should be a number, got {value!r:.60}")
+    return int(number) if integer or (isinstance(value, str) and number.is_integer()) else number
+
+
+def _import_stats(value, field):
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise TreeFormatError(f"Import record field '{field}' should be an object, got {value!r:.60}")
+    return {key: _import_number(value.get(key), f"{field}.{key}") for key in ("time", "words", "chars")}
+
+
+def _clean_import_record(record):
+    """
+    record checked and coerced to what Node.from_dict expects (own fields only), so a bad file fails
+    the import with a TreeFormatError instead of breaking later. Unknown keys are dropped.
+    """
+    if not isinstance(record, dict):
+        raise TreeFormatError(f"Import record should be an object, got {record!r:.60}")
+    fields = {"label": _import_text(record.get("label"), "label", "Unknown") or "Unknown",
+              "uid": _import_text(record.get("uid"), "uid") or None,
+              "parent": _import_text(record.get("parent"), "parent") or None,
+              "status": _import_text(record.get("status"), "status", "neutral") or "neutral",
+              "description": _import_text(record.get("description"), "description")}
+    for field in ("x", "y", "width", "height"):
+        if field in record:
+            fields[field] = _import_number(record[field], field)
+    for field in ("cycle_time", "cycle_count"):
+        fields[field] = _import_number(record.get(field), field, integer=field == "cycle_count")
+    fields["archived_stats"] = _import_stats(record.get("archived_stats"), "archived_stats")
+    collapsed = record.get("collapsed", False)
+    if not isinstance(collapsed, bool):
+        raise TreeFormatError(f"Import record field 'collapsed' should be true or false, got {collapsed!r:.60}")
+    fields["collapsed"] = collapsed
+
+    intentions = record.get("intentions") or []
+    windows = record.get("allowed_windows") or []
+    if not isinstance(intentions, list) or not all(isinstance(i, dict) for i in intentions):
+        raise TreeFormatError(f"Import record field 'intentions' should be a list of objects, got {intentions!r:.60}")
+    if not isinstance(windows, list):
+        raise TreeFormatError(f"Import record field 'allowed_windows' should be a list, got {windows!r:.60}")
+    fields["intentions"] = [{"text": _import_text(i.get("text"), "intentions.text"),
+                             "status": _import_text(i.get("status"), "intentions.status", "active") or "active",
+                             "stats": _import_stats(i.get("stats"), "intentions.stats"),
+                             "completed_at": _import_text(i.get("completed_at"), "intentions.completed_at") or None}
+                            for i in intentions]
+    fields["allowed_windows"] = [_import_text(w, "allowed_windows") for w in windows]
+    return fields
 
 class NodeService:
     """
     Core service for managing the tree structure and its state.
     (Derived from the original NodeStateManager)
     """
-    def __init__(self, file_path, initial_root_label="My Life"):
+    def __init__(self, file_path, initial_root_label="My Life", pretty=TREE_SAVE_PRETTY, store=None,
+                 journal=TREE_JOURNAL_ENABLED, lazy=TREE_LAZY_DETAILS, archive_days=INTENTION_ARCHIVE_DAYS):
         self.file_path = file_path
         self.initial_root_label = initial_root_label
+        self.pretty = pretty # Indented output, always fully re-encoded
+        if store is None and journal:
+            store = TreeJournal(file_path, encode=self._encode_tree, lazy=lazy) # file_path becomes its checkpoint
+        self.store = store # Row store (SqliteTreeStore, TreeJournal) used instead of rewriting file_path
+        # Skeleton checkpoints: details (description, intentions, allowed_windows) load on first access
+        self.lazy = lazy and isinstance(store, TreeJournal)
+        self._unindexed_details = [] # uids whose details the search index hasn't seen yet
+        self.archive = IntentionArchive(file_path + ".archive") # Completed intentions moved out of the tree
+        self.archive_days = archive_days
+        self._archive_candidates = set() # Skeleton nodes found holding completed intentions (see archive_completed)
+        self.fragments = FragmentCache() # Serialized subtrees, invalidated by ChangeEvents and mark_dirty()
         self.roots = []
+        self.nodes = {} # uid -> Node, kept in sync by every structural change
+        self.search_index = SearchIndex() # Labels, descriptions, intention texts
         self.undo_stack = []
         self.redo_stack = []
+        self.generation = 0 # Bumped by every ChangeEvent, lets views skip work when nothing moved
+        self.structure_generation = 0 # Only bumped by LAYOUT_KINDS events
+        self.listeners = [] # Called with each committed batch of ChangeEvents (see subscribe)
+        self._pending_events = []
+        self._intention_signatures = {} # uid -> ((text, status), ...) last published
+        
+        # Row-level Save State (with a store only these rows are written; without one, save() skips clean trees)
+        self._dirty_uids = set() # Nodes whose own row or intentions changed
+        self._removed_uids = set()
+        self._store_full = False # Rewrite the whole tree (load fix-ups, undo, redo)
+        
+        # Transaction State (see transaction())
+        self._transaction_depth = 0
+        self._transaction_pushed = False # A mutation asked for an undo entry
+        self._transaction_dirty = False # A mutation asked for a save
         self.load()
 
     def load(self):
+        data = None
         try:
-            if os.path.exists(self.file_path):
-                with open(self.file_path, 'r') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        self.roots = [Node.from_dict(d) for d in data]
-                    else:
-                        self.roots = [Node.from_dict(data)]
-            else:
-                self.roots = [Node(self.initial_root_label)]
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            if self.store:
+                data = self.store.load_tree() # None when nothing is stored yet
+            elif os.path.exists(self.file_path):
+                data = read_file(self.file_path) # Any backend's format, see Core.Ports.serializer
+        except (FileNotFoundError, SerializationError) as e:
             print(f"Error loading tree data: {e}")
+        
+        if data is None:
             self.roots = [Node(self.initial_root_label)]
+        elif isinstance(data, list):
+            self.roots = [Node.from_dict(d, loader=self._hydrate_node) for d in data]
+        else:
+            self.roots = [Node.from_dict(data, loader=self._hydrate_node)]
         
         # Ensure initial_root_label is the ONLY root node
         life_node = next((r for r in self.roots if r.label == self.initial_root_label), None)
@@ -44,26 +164,288 @@ class NodeService:
         
         # Ensure roots only contains the main label
         self.roots = [life_node]
+        self._reindex()
+        # Anything the fix-ups above changed has to reach the store in full
+        self._store_full = data is None or bool(other_roots)
+
+    # --- Index ---
+    def _reindex(self):
+        """Rebuilds the uid index from scratch (load, undo, redo replace every Node)."""
+        self.nodes = {node.uid: node for node in iter_preorder(self.roots)}
+        self.fragments.clear()
+        self.search_index.clear()
+        self._intention_signatures.clear()
+        for node in self.nodes.values():
+            self.search_index.index_node(node)
+            if node.is_hydrated:
+                self._intention_signatures[node.uid] = self._intention_signature(node)
+        self._unindexed_details = [uid for uid, node in self.nodes.items() if not node.is_hydrated]
+
+    def _hydrate_node(self, node):
+        """Node loader for skeleton nodes: reads the details and brings the indexes up to date."""
+        details = self.store.details.read(node._details, node.uid)
+        if details is None:
+            return
+        node.set_details(details)
+        self._intention_signatures[node.uid] = self._intention_signature(node)
+        self.search_index.index_node(node)
+
+    def index_pending_details(self, limit=500):
+        """
+        Adds the descriptions and intention texts of up to limit skeleton nodes to the search index,
+        reading them without hydrating the nodes. Returns how many are still pending.
+        """
+        while self._unindexed_details and limit > 0:
+            node = self.nodes.get(self._unindexed_details.pop())
+            if node is None or node.is_hydrated:
+                continue # Hydration indexed it already
+            limit -= 1
+            details = self.store.details.read(node._details, node.uid)
+            if details:
+                if any(i.get("status") == "completed" for i in details.get("intentions", [])):
+                    self._archive_candidates.add(node.uid)
+                texts = tuple(i.get("text", "") for i in details.get("intentions", []))
+                self.search_index.index_fields(node.uid, node.label, node.status, details.get("description", ""), texts)
+        return len(self._unindexed_details)
+
+    def _index_subtree(self, node):
+        for n in iter_preorder([node]):
+            self.nodes[n.uid] = n
+            self._dirty_uids.add(n.uid)
+            self.search_index.index_node(n)
+            self._intention_signatures[n.uid] = self._intention_signature(n)
+
+    def _unindex_subtree(self, node):
+        for n in iter_preorder([node]):
+            self.nodes.pop(n.uid, None)
+            self._removed_uids.add(n.uid)
+            self.search_index.remove_node(n.uid)
+            self._intention_signatures.pop(n.uid, None)
+
+    @staticmethod
+    def _intention_signature(node):
+        return tuple((i.text, i.status) for i in node.intentions)
+
+    def intentions_changed(self, node):
+        """
+        Call after rewriting node.intentions. Re-indexes search and publishes
+        INTENTIONS_CHANGED, unless texts and statuses are the same as last time.
+        """
+        if node.uid not in self.nodes:
+            return False
+        signature = self._intention_signature(node)
+        if self._intention_signatures.get(node.uid) == signature:
+            return False
+        self._intention_signatures[node.uid] = signature
+        self.search_index.index_node(node)
+        self._emit(ChangeKind.INTENTIONS_CHANGED, node.uid)
+        return True
+
+    def search(self, query, statuses=None, limit=50):
+        """Returns [(Node, score)] best first. See SearchIndex.search for matching rules."""
+        results = []
+        for uid, score in self.search_index.search(query, statuses=statuses, limit=limit):
+            node = self.nodes.get(uid)
+            if node:
+                results.append((node, score))
+        return results
+
+    def get(self, uid):
+        """Returns the node with this uid, or None."""
+        return self.nodes.get(uid)
+
+    def ancestors(self, uid):
+        """Parent, grandparent, ... up to the root (nearest first)."""
+        node = self.nodes.get(uid)
+        result = []
+        while node and node.parent:
+            node = node.parent
+            result.append(node)
+        return result
+
+    def descendants(self, uid):
+        """Every node below uid, in pre-order."""
+        node = self.nodes.get(uid)
+        return list(iter_preorder(node.children)) if node else []
+
+    def has_unsaved_changes(self):
+        return bool(self._dirty_uids or self._removed_uids or self._store_full)
 
     def save(self):
-        data = [r.to_dict() for r in self.roots]
+        """Writes what changed since the last save; nothing at all when nothing did (e.g. periodic saves)."""
+        if self._transaction_depth:
+            self._transaction_dirty = True # Written once when the transaction commits
+            return
+        if not self.has_unsaved_changes():
+            self._flush_events()
+            return
         try:
-             with open(self.file_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            if self.store:
+                self._save_to_store()
+                self._flush_events()
+                return
+            data = self._encode_tree()
+            with open(self.file_path, 'wb') as f:
+                f.write(data)
+            self._dirty_uids, self._removed_uids, self._store_full = set(), set(), False
         except Exception as e:
             print(f"NodeService: Failed to save tree data: {e}")
+        self._flush_events()
+
+    def _encode_tree(self):
+        """The whole tree in the active backend's format (from the fragment cache when possible)."""
+        serializer = get_serializer()
+        if self.lazy:
+            return self.store.details.snapshot(self.roots, serializer, pretty=self.pretty)
+        if self.pretty or serializer.format != "json":
+            return serializer.dumps([r.to_dict() for r in self.roots], pretty=self.pretty)
+        return self._snapshot()
+
+    def _save_to_store(self):
+        dirty, removed, full = self._dirty_uids, self._removed_uids, self._store_full
+        self._dirty_uids, self._removed_uids, self._store_full = set(), set(), False
+        try:
+            self.store.save_tree(self.roots, self.nodes, dirty, removed, full=full)
+        except Exception:
+            # Keep the change set so the next save retries it
+            self._dirty_uids |= dirty
+            self._removed_uids |= removed
+            self._store_full = self._store_full or full
+            raise
 
     def push_state(self):
-        self.undo_stack.append([r.to_dict() for r in self.roots])
+        if self._transaction_depth:
+            self._transaction_pushed = True # The snapshot taken at transaction start becomes the undo entry
+            return
+        self.undo_stack.append(self._snapshot())
         self.redo_stack.clear()
 
+    def _snapshot(self):
+        # Undo entries are encoded JSON bytes: built from the fragment cache and much smaller than dicts
+        serializer = get_serializer()
+        if serializer.format != "json":
+            serializer = _FRAGMENT_FALLBACK # Fragments are spliced as JSON text
+        if len(self.fragments) > len(self.nodes):
+            self.fragments.prune(self.nodes)
+        return self.fragments.encode(self.roots, serializer)
+
+    def _restore(self, snapshot):
+        self.roots = [Node.from_dict(d, loader=self._hydrate_node) for d in load_bytes(snapshot)]
+        self._reindex()
+
+    # --- Transactions ---
+    @contextmanager
+    def transaction(self):
+        """
+        Groups mutations into one undo entry, one write and one batch of events:
+            with service.transaction():
+                service.rename_node(a, "x")
+                service.delete_nodes([b])
+        On an exception the tree (and undo/redo stacks) are restored and the exception re-raised.
+        Nested transactions join the outermost one.
+        """
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield self
+            finally:
+                self._transaction_depth -= 1
+            return
+        
+        snapshot = self._snapshot()
+        undo_stack, redo_stack = list(self.undo_stack), list(self.redo_stack)
+        self._transaction_depth = 1
+        self._transaction_pushed = False
+        self._transaction_dirty = False
+        try:
+            yield self
+        except BaseException:
+            # Roll back: Node objects are rebuilt, like undo()
+            self._transaction_depth = 0
+            self._restore(snapshot)
+            self.undo_stack, self.redo_stack = undo_stack, redo_stack
+            self._pending_events = [] # Views may have seen none of it, so tell them to reload
+            self._emit(ChangeKind.RELOADED)
+            self._flush_events()
+            raise
+        
+        self._transaction_depth = 0
+        if self._transaction_pushed:
+            self.undo_stack.append(snapshot)
+            self.redo_stack.clear()
+        if self._transaction_dirty or self._transaction_pushed:
+            self.save()
+        else:
+            self._flush_events() # e.g. only stats/cycle ticks, which are never written on their own
+
+    def in_transaction(self):
+        return self._transaction_depth > 0
+
+    # --- Change Notification ---
+    def subscribe(self, callback):
+        """
+        callback(events) receives a list of ChangeEvents after every committed change:
+        once per save, once per transaction, or right away for stats/cycle ticks.
+        """
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def mark_dirty(self, node):
+        """Call after changing a node's fields directly (not through this service) so the next save writes them."""
+        self.fragments.invalidate(node)
+        self._dirty_uids.add(node.uid)
+
+    def _emit(self, kind, uid=None, old=None, new=None, delta=None):
+        # Every event dirties the cached fragment of the node it names, plus any parent it left or joined
+        if kind == ChangeKind.RELOADED:
+            self.fragments.clear()
+            self._store_full = True
+        else:
+            node = self.nodes.get(uid) if uid else None
+            if node:
+                self.fragments.invalidate(node)
+                self._dirty_uids.add(uid)
+            
+            # Parents whose child list changed (None = the roots list)
+            parents = {ChangeKind.NODE_ADDED: (new,), ChangeKind.NODE_REMOVED: (old,),
+                       ChangeKind.NODE_MOVED: (old, new)}.get(kind, ())
+            for parent_uid in parents:
+                parent = self.nodes.get(parent_uid) if parent_uid else None
+                if parent:
+                    self.fragments.invalidate(parent)
+                    self._dirty_uids.add(parent_uid)
+                # Sibling positions shift when a child list changes (unless the node was appended)
+                siblings = parent.children if parent else (self.roots if parent_uid is None else ())
+                if kind == ChangeKind.NODE_ADDED and siblings and siblings[-1].uid == uid:
+                    continue
+                self._dirty_uids.update(child.uid for child in siblings)
+        
+        self.generation += 1
+        if kind in LAYOUT_KINDS:
+            self.structure_generation += 1
+        self._pending_events.append(ChangeEvent(kind, uid, old, new, delta, self.generation))
+
+    def _flush_events(self):
+        if self._transaction_depth or not self._pending_events:
+            return
+        events, self._pending_events = self._pending_events, []
+        for callback in list(self.listeners):
+            try:
+                callback(events)
+            except Exception as e:
+                print(f"NodeService: Change listener failed: {e}")
+
     def undo(self):
         if not self.undo_stack:
             return False
             
-        self.redo_stack.append([r.to_dict() for r in self.roots])
-        previous_state = self.undo_stack.pop()
-        self.roots = [Node.from_dict(d) for d in previous_state]
+        self.redo_stack.append(self._snapshot())
+        self._restore(self.undo_stack.pop())
+        self._emit(ChangeKind.RELOADED)
         self.save()
         return True
 
@@ -71,9 +453,9 @@ class NodeService:
         if not self.redo_stack:
             return False
             
-        self.undo_stack.append([r.to_dict() for r in self.roots])
-        next_state = self.redo_stack.pop()
-        self.roots = [Node.from_dict(d) for d in next_state]
+        self.undo_stack.append(self._snapshot())
+        self._restore(self.redo_stack.pop())
+        self._emit(ChangeKind.RELOADED)
         self.save()
         return True
 
@@ -85,6 +467,8 @@ class NodeService:
             new_node.x = x
             new_node.y = y
             life_node.add_child(new_node)
+            self._index_subtree(new_node)
+            self._emit(ChangeKind.NODE_ADDED, new_node.uid, new=life_node.uid)
             self.save()
             return new_node
         
@@ -92,6 +476,8 @@ class NodeService:
         new_node.x = x
         new_node.y = y
         self.roots.append(new_node)
+        self._index_subtree(new_node)
+        self._emit(ChangeKind.NODE_ADDED, new_node.uid)
         self.save()
         return new_node
 
@@ -101,6 +487,8 @@ class NodeService:
         new_node.x = parent_node.x
         new_node.y = parent_node.y + 50
         parent_node.add_child(new_node)
+        self._index_subtree(new_node)
+        self._emit(ChangeKind.NODE_ADDED, new_node.uid, new=parent_node.uid)
         self.save()
         return new_node
 
@@ -108,27 +496,286 @@ class NodeService:
         if node.label == self.initial_root_label:
             return False
         self.push_state()
-        node.label = new_label
+        old_label, node.label = node.label, new_label
+        self.search_index.index_node(node)
+        self._emit(ChangeKind.NODE_RENAMED, node.uid, old=old_label, new=new_label)
         self.save()
         return True
 
     def update_node_status(self, node, status):
         self.push_state()
-        node.status = status
+        old_status, node.status = node.status, status
+        self.search_index.set_status(node.uid, status)
+        self._emit(ChangeKind.STATUS_CHANGED, node.uid, old=old_status, new=status)
+        self.save()
+        return True
+
+    def set_collapsed(self, node, collapsed):
+        """Collapses/expands a subtree in the view. View state only, so no undo entry."""
+        if node.collapsed == collapsed:
+            return False
+        node.collapsed = collapsed
+        self._emit(ChangeKind.COLLAPSED_CHANGED, node.uid, new=collapsed)
+        self.save()
+        return True
+
+    def record_stats(self, node, stats, time=0, words=0, chars=0):
+        """
+        Adds tracked activity to one of node's intention Stats (the dashboard calls this every second).
+        Published as STATS_CHANGED right away; only journaled (if the store keeps a journal) until the next save.
+        """
+        if not (time or words or chars):
+            return False
+        stats.time += time
+        stats.words += words
+        stats.chars += chars
+        # Emitted first: the append may start a checkpoint, which must not encode node's stale fragment
+        self._emit(ChangeKind.STATS_CHANGED, node.uid, delta=Stats(time, words, chars))
+        if hasattr(self.store, 'append_stats'):
+            index = next((i for i, intention in enumerate(node.intentions) if intention.stats is stats), None)
+            if index is not None:
+                self._journal(self.store.append_stats, node, index)
+        self._flush_events()
+        return True
+
+    def tick_cycle(self, node, seconds=1):
+        """
+        Advances node's focus cycle. Returns True when an 8-hour block completed.
+        Published as CYCLE_CHANGED right away; only journaled (if the store keeps a journal) until the next save.
+        """
+        old_time = node.cycle_time
+        node.cycle_time += seconds
+        completed = False
+        if node.cycle_time >= CYCLE_TIME_LIMIT:
+            node.cycle_count += 1
+            node.cycle_time = max(0, node.cycle_time - CYCLE_TIME_LIMIT)
+            completed = True
+        self._emit(ChangeKind.CYCLE_CHANGED, node.uid, old=old_time, new=node.cycle_time) # Before the append, see record_stats
+        if hasattr(self.store, 'append_cycle'):
+            self._journal(self.store.append_cycle, node)
+        self._flush_events()
+        return completed
+
+    def _journal(self, append, *args):
+        try:
+            append(*args)
+        except Exception as e:
+            print(f"NodeService: Failed to journal change: {e}")
+
+    # --- Intentions ---
+    # The dashboard edits intentions through these, so a save only writes the nodes they touched.
+    # Housekeeping like the stats they track: no undo entries.
+    def add_intention(self, node, text):
+        """Appends a new active intention to node and saves. Returns the Intention."""
+        intention = Intention(text)
+        node.intentions.append(intention)
+        self._intention_edited(node)
+        self.save()
+        return intention
+
+    def complete_intention(self, node, intention, completed_at=None):
+        """Marks one of node's intentions completed (now, unless completed_at is given) and saves."""
+        if intention.status == "completed":
+            return False
+        intention.status = "completed"
+        intention.completed_at = completed_at or datetime.datetime.now().isoformat(timespec="seconds")
+        self._intention_edited(node)
+        self.save()
+        return True
+
+    def remove_intention(self, node, intention):
+        """Drops one of node's intentions (by identity); its stats stay counted in node.archived_stats."""
+        if not any(i is intention for i in node.intentions):
+            return False
+        node.intentions = [i for i in node.intentions if i is not intention]
+        node.archived_stats.add(intention.stats)
+        self._intention_edited(node)
         self.save()
         return True
 
+    def clear_intentions(self, nodes):
+        """Drops every intention of nodes in one write, keeping their stats in archived_stats."""
+        with self.transaction():
+            for node in nodes:
+                if not node.intentions:
+                    continue
+                for intention in node.intentions:
+                    node.archived_stats.add(intention.stats)
+                node.intentions = []
+                self._intention_edited(node)
+                self.save() # Joins the transaction
+
+    def _intention_edited(self, node):
+        self.mark_dirty(node) # Also covers changes the signature doesn't see (completed_at, archived_stats)
+        self.intentions_changed(node)
+
+    # --- Import / Export (see Adapters.Persistence.tree_io) ---
+    def import_records(self, records, parent=None, batch_size=TREE_IMPORT_BATCH_SIZE):
+        """
+        Adds nodes from flat records ({"uid", "parent", "label", ...} plus any Node fields) below parent
+        (the root by default) as one undo entry, one save and one batch of events, so views lay out once.
+        records is consumed batch_size at a time. "parent" names an earlier or later record, or an existing node;
+        records whose parent hasn't shown up yet wait for it and end up below parent if it never does.
+        A uid already in the tree gets a fresh one, so re-importing an export adds a copy.
+        Malformed records raise TreeFormatError and roll the whole import back. Returns the number of nodes added.
+        """
+        target = parent or self.roots[0]
+        imported = {} # Source uid -> Node, to resolve "parent" references
+        waiting = {} # Source parent uid -> records that arrived before their parent
+        count = 0
+        records = iter(records)
+        with self.transaction():
+            self.push_state()
+            while True:
+                batch = list(itertools.islice(records, batch_size))
+                if not batch:
+                    break
+                for record in batch:
+                    record = _clean_import_record(record)
+                    parent_uid = record["parent"]
+                    node_parent = (imported.get(parent_uid) or self.nodes.get(parent_uid)) if parent_uid else target
+                    if node_parent is None:
+                        waiting.setdefault(parent_uid, []).append(record)
+                        continue
+                    count += self._import_record(record, node_parent, imported, waiting)
+            while waiting: # Parents that never showed up, in the order they were first named
+                for record in waiting.pop(next(iter(waiting))):
+                    count += self._import_record(record, target, imported, waiting)
+            if count:
+                self.save()
+        return count
+
+    def _import_record(self, record, parent, imported, waiting):
+        """Builds record's node below parent, then any waiting records that name it. Returns how many nodes were built."""
+        count = 0
+        stack = [(record, parent)]
+        while stack:
+            record, parent = stack.pop()
+            source_uid = record["uid"]
+            node = Node.from_dict({k: v for k, v in record.items() if k != "parent"})
+            if node.uid in self.nodes:
+                node.uid = str(uuid.uuid4()) # Re-importing an export, or a clash with this tree
+            if "x" not in record:
+                node.x, node.y = parent.x, parent.y + 50
+            parent.add_child(node)
+            self._index_subtree(node)
+            self._emit(ChangeKind.NODE_ADDED, node.uid, new=parent.uid)
+            count += 1
+            if source_uid:
+                imported[source_uid] = node
+                stack.extend((child, node) for child in reversed(waiting.pop(source_uid, [])))
+        return count
+
+    def iter_export(self, node=None):
+        """
+        Yields (depth, parent uid, full own fields) for node's subtree in pre-order, or for everything
+        below the root. Skeleton nodes are read without being hydrated, so exports don't load the whole tree.
+        """
+        tops = [node] if node else [child for root in self.roots for child in root.children]
+        stack = [(top, 0, None) for top in reversed(tops)]
+        while stack:
+            current, depth, parent_uid = stack.pop()
+            yield depth, parent_uid, self.export_fields(current)
+            stack.extend((child, depth + 1, current.uid) for child in reversed(current.children))
+
+    def export_fields(self, node):
+        """node's own fields in Node.to_dict() shape (without children), hydrated or not."""
+        if node.is_hydrated:
+            return node._fields_dict()
+        data = node._skeleton_dict()
+        data.pop("intention_stats", None)
+        details = self.store.details.read(data.pop("details"), node.uid) or {}
+        data["description"] = details.get("description", "")
+        data["intentions"] = details.get("intentions", [])
+        data["allowed_windows"] = details.get("allowed_windows", [])
+        return data
+
+    # --- Intention Archive ---
+    def archive_completed(self, days=None, now=None):
+        """
+        Moves completed intentions finished more than days ago (archive_days by default) out of the tree
+        into self.archive; their stats stay counted in the node's archived_stats. Completed intentions
+        without a completion time are stamped now, so they age from the first sweep.
+        Skeleton nodes are only swept once index_pending_details() has seen them. Housekeeping: no undo entry.
+        Returns how many intentions were archived.
+        """
+        days = self.archive_days if days is None else days
+        if days is None:
+            return 0
+        now = now or datetime.datetime.now()
+        cutoff = now - datetime.timedelta(days=days)
+        stamp = now.isoformat(timespec="seconds")
+
+        candidates = [node for node in self.nodes.values() if node.is_hydrated or node.uid in self._archive_candidates]
+        self._archive_candidates = set()
+        archived = 0
+        with self.transaction():
+            for node in candidates:
+                if node.parent is None:
+                    continue # The root's list is the dashboard's view of every node, never its own
+                old, stamped = [], False
+                for intention in node.intentions:
+                    if intention.status != "completed":
+                        continue
+                    completed_at = self._parse_timestamp(intention.completed_at)
+                    if completed_at is None:
+                        intention.completed_at = stamp
+                        stamped = True
+                    elif completed_at <= cutoff:
+                        old.append(intention)
+
+                if old:
+                    try:
+                        self.archive.append(node.uid, old, stamp) # Written before they leave the tree
+                    except OSError as e:
+                        print(f"NodeService: Failed to archive intentions of {node.label}: {e}")
+                        old = []
+                for intention in old:
+                    node.archived_stats.add(intention.stats)
+                if old:
+                    gone = {id(intention) for intention in old}
+                    node.intentions = [i for i in node.intentions if id(i) not in gone]
+                    self.intentions_changed(node)
+                    archived += len(old)
+                if old or stamped:
+                    self.mark_dirty(node)
+                    self.save() # Joins the transaction: one write for the whole sweep
+        return archived
+
+    @staticmethod
+    def _parse_timestamp(value):
+        try:
+            parsed = datetime.datetime.fromisoformat(value) if value else None
+        except (TypeError, ValueError):
+            return None
+        if parsed and parsed.tzinfo:
+            parsed = parsed.astimezone().replace(tzinfo=None) # Compared with naive local times
+        return parsed
+
+    def archived_intentions(self, node, start=0, limit=50):
+        """
+        Page of archived intentions (dicts, see IntentionArchive) of node and its descendants,
+        newest archived first. For a root, every archived intention, including those of deleted nodes.
+        """
+        return self.archive.page(self._archive_uids(node), start, limit)
+
+    def archived_count(self, node):
+        return self.archive.count(self._archive_uids(node))
+
+    @staticmethod
+    def _archive_uids(node):
+        return None if node.parent is None else [n.uid for n in iter_preorder([node])]
+
     def reparent_node(self, child_node, new_parent):
-        if child_node == new_parent:
+        if child_node.uid == new_parent.uid:
             return False
 
-        ancestor = new_parent
-        while ancestor:
-            if ancestor == child_node:
-                return False
-            ancestor = ancestor.parent
+        # Can't move a node under its own subtree
+        if any(ancestor.uid == child_node.uid for ancestor in self.ancestors(new_parent.uid)):
+            return False
             
         self.push_state()
+        old_parent_uid = child_node.parent.uid if child_node.parent else None
         if child_node.parent:
             if child_node in child_node.parent.children:
                 child_node.parent.children.remove(child_node)
@@ -136,51 +783,29 @@ class NodeService:
             self.roots.remove(child_node)
             
         new_parent.add_child(child_node)
+        self._emit(ChangeKind.NODE_MOVED, child_node.uid, old=old_parent_uid, new=new_parent.uid)
         self.save()
         return True
 
     def _get_node_total_stats(self, node):
         """Calculate total stats for a node including intentions, archived_stats, and all children."""
-        totals = {"time": 0, "words": 0, "chars": 0}
-        
-        # Add archived stats
-        archived = getattr(node, 'archived_stats', {"time": 0, "words": 0, "chars": 0})
-        totals["time"] += archived.get("time", 0)
-        totals["words"] += archived.get("words", 0)
-        totals["chars"] += archived.get("chars", 0)
-        
-        # Add stats from active intentions
-        for intention in getattr(node, 'intentions', []):
-            stats = intention.get("stats", {})
-            totals["time"] += stats.get("time", 0)
-            totals["words"] += stats.get("words", 0)
-            totals["chars"] += stats.get("chars", 0)
-        
-        # Recursively add children stats
-        for child in node.children:
-            child_stats = self._get_node_total_stats(child)
-            totals["time"] += child_stats["time"]
-            totals["words"] += child_stats["words"]
-            totals["chars"] += child_stats["chars"]
-        
+        totals = Stats()
+        for descendant in iter_preorder([node]):
+            totals.add(descendant.archived_stats)
+            totals.add(descendant.intention_totals()) # Cached aggregate for nodes that aren't hydrated
         return totals
 
+    def get_subtree_stats(self, node):
+        """Public accessor for the aggregated stats of a node and its descendants."""
+        return self._get_node_total_stats(node)
+
     def _archive_stats_to_parent(self, node):
         """Archive node's total stats to its parent before deletion."""
         if not node.parent:
             return
             
-        # Get total stats from this node and all its children
-        total_stats = self._get_node_total_stats(node)
-        
-        # Ensure parent has archived_stats
-        if not hasattr(node.parent, 'archived_stats'):
-            node.parent.archived_stats = {"time": 0, "words": 0, "chars": 0}
-        
-        # Add to parent's archived stats
-        node.parent.archived_stats["time"] += total_stats["time"]
-        node.parent.archived_stats["words"] += total_stats["words"]
-        node.parent.archived_stats["chars"] += total_stats["chars"]
+        # Get total stats from this node and all its children, add to parent's archived stats
+        node.parent.archived_stats.add(self._get_node_total_stats(node))
 
     def delete_nodes(self, nodes):
         if not nodes:
@@ -193,11 +818,16 @@ class NodeService:
                 continue
             if node.parent:
                 # Archive stats to parent before deletion
+                parent_uid = node.parent.uid
                 self._archive_stats_to_parent(node)
                 node.delete()
+                self._unindex_subtree(node)
+                self._emit(ChangeKind.NODE_REMOVED, node.uid, old=parent_uid)
                 nodes_deleted = True
             elif node in self.roots:
                 self.roots.remove(node)
+                self._unindex_subtree(node)
+                self._emit(ChangeKind.NODE_REMOVED, node.uid)
                 nodes_deleted = True
         
         if nodes_deleted:
@@ -216,29 +846,18 @@ class NodeService:
                 continue
             if node.parent:
                 # Archive only this node's stats (not children's since they're kept)
-                node_own_stats = {"time": 0, "words": 0, "chars": 0}
-                
-                # Add archived stats
-                archived = getattr(node, 'archived_stats', {"time": 0, "words": 0, "chars": 0})
-                node_own_stats["time"] += archived.get("time", 0)
-                node_own_stats["words"] += archived.get("words", 0)
-                node_own_stats["chars"] += archived.get("chars", 0)
+                node_own_stats = node.archived_stats.copy()
                 
                 # Add stats from intentions
-                for intention in getattr(node, 'intentions', []):
-                    stats = intention.get("stats", {})
-                    node_own_stats["time"] += stats.get("time", 0)
-                    node_own_stats["words"] += stats.get("words", 0)
-                    node_own_stats["chars"] += stats.get("chars", 0)
+                for intention in node.intentions:
+                    node_own_stats.add(intention.stats)
                 
                 # Archive to parent
-                if not hasattr(node.parent, 'archived_stats'):
-                    node.parent.archived_stats = {"time": 0, "words": 0, "chars": 0}
-                node.parent.archived_stats["time"] += node_own_stats["time"]
-                node.parent.archived_stats["words"] += node_own_stats["words"]
-                node.parent.archived_stats["chars"] += node_own_stats["chars"]
+                parent_uid = node.parent.uid
+                node.parent.archived_stats.add(node_own_stats)
                 
                 node.delete_keep_children()
+                self._drop_kept_children_node(node, parent_uid)
                 nodes_deleted = True
             elif node in self.roots:
                 index = self.roots.index(node)
@@ -246,6 +865,7 @@ class NodeService:
                 for child in reversed(node.children):
                     child.parent = None
                     self.roots.insert(index, child)
+                self._drop_kept_children_node(node, None)
                 nodes_deleted = True
         
         if nodes_deleted:
@@ -253,13 +873,15 @@ class NodeService:
             return True
         return False
 
+    def _drop_kept_children_node(self, node, parent_uid):
+        self.nodes.pop(node.uid, None)
+        self._removed_uids.add(node.uid)
+        self.search_index.remove_node(node.uid)
+        self._intention_signatures.pop(node.uid, None)
+        self._emit(ChangeKind.NODE_REMOVED, node.uid, old=parent_uid)
+        for child in node.children:
+            self._emit(ChangeKind.NODE_MOVED, child.uid, old=node.uid, new=parent_uid)
+
     def get_all_nodes(self):
         """Returns a flat list of all nodes in all roots."""
-        all_nodes = []
-        def _collect(n):
-            all_nodes.append(n)
-            for c in n.children:
-                _collect(c)
-        for r in self.roots:
-            _collect(r)
-        return all_nodes
+        return list(iter_preorder(self.roots))
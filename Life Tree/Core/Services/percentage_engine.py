@@ -1,32 +1,27 @@
+from Core.Entities.tree_traversal import iter_postorder
+
 def _get_subtree_mass(node):
     """
     Returns (solved_count, total_count) for the subtree starting at node.
     Each node counts as 1 unit of 'mass'.
     If the node itself is 'solved', its entire subtree is considered 100% complete.
     """
-    children = getattr(node, 'children', [])
-    
-    # Base count for the node itself
-    total_count = 1
-    
-    # If the node itself is solved, the entire subtree mass (current + recursive children) 
-    # is considered solved. We still need the total count for the percentage base.
-    node_is_solved = getattr(node, 'status', 'neutral') == 'solved'
-    
-    recursive_solved = 0
-    recursive_total = 0
-    
-    for child in children:
-        c_solved, c_total = _get_subtree_mass(child)
-        recursive_solved += c_solved
-        recursive_total += c_total
-    
-    final_total = total_count + recursive_total
-    
-    if node_is_solved:
-        return final_total, final_total
+    # Post-order: every child's (solved, total) is known before its parent is visited
+    mass = {}
+    for current in iter_postorder([node]):
+        # Base count for the node itself
+        solved, total = 0, 1
+        for child in current.children:
+            c_solved, c_total = mass.pop(id(child))
+            solved += c_solved
+            total += c_total
         
-    return recursive_solved, final_total
+        # If the node itself is solved, the entire subtree mass (current + children)
+        # is considered solved. We still need the total count for the percentage base.
+        if getattr(current, 'status', 'neutral') == 'solved':
+            solved = total
+        mass[id(current)] = (solved, total)
+    return mass[id(node)]
 
 def calculate_node_percentage(node):
     """
@@ -0,0 +1,244 @@
+import bisect
+import heapq
+import re
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Field weights: a label hit ranks above an intention hit, above a description hit
+LABEL_WEIGHT = 3
+INTENTION_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+# Match quality per query term
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+FUZZY_SCORE = 0.5
+
+MAX_PREFIX_EXPANSIONS = 200 # Tokens a single prefix may expand to (bounds 1-2 letter queries)
+MIN_FUZZY_LENGTH = 4 # Shorter terms only match exactly/by prefix, typos there are too ambiguous
+MAX_PROBED_SETS = 8 # Multi-term queries merge posting sets of a term (or tier) spread over more than this
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _deletes(token):
+    """Every string obtained by deleting one character (SymSpell-style edit-distance-1 keys)."""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+class SearchIndex:
+    """
+    Incrementally maintained inverted index over node labels, descriptions and intention texts.
+    Nodes are (re)indexed one at a time; queries never rebuild anything.
+    """
+    def __init__(self):
+        self.postings = {} # token -> {field weight: set of uids}
+        self.sorted_tokens = [] # All tokens, sorted, for prefix ranges via bisect
+        self.fuzzy_keys = {} # one-deletion key -> set of tokens
+        self.doc_tokens = {} # uid -> {token: field weight}
+        self.doc_signatures = {} # uid -> what was indexed, to skip unchanged nodes
+        self.statuses = {} # uid -> node status
+        self.labels = {} # uid -> label (tie-break ordering, result display)
+
+    def __len__(self):
+        return len(self.doc_tokens)
+
+    # --- Maintenance ---
+    def index_node(self, node):
+        """Adds or refreshes one node. Cheap no-op if nothing searchable changed."""
+        if not getattr(node, 'is_hydrated', True):
+            # Details still on disk: keep whatever was indexed from them so far (see NodeService.index_pending_details)
+            previous = self.doc_signatures.get(node.uid)
+            description, texts = previous[1:] if previous else (None, None)
+            self.index_fields(node.uid, node.label, node.status, description, texts)
+            return
+        self.index_fields(node.uid, node.label, node.status, node.description, tuple(i.text for i in node.intentions))
+
+    def index_fields(self, uid, label, status, description, texts):
+        """index_node() from plain values, for nodes whose details were read without building them."""
+        signature = (label, description, texts)
+        self.statuses[uid] = status
+        if self.doc_signatures.get(uid) == signature:
+            return
+        
+        tokens = {}
+        for token in tokenize(description):
+            tokens[token] = DESCRIPTION_WEIGHT
+        for text in texts or ():
+            for token in tokenize(text):
+                tokens[token] = max(tokens.get(token, 0), INTENTION_WEIGHT)
+        for token in tokenize(label):
+            tokens[token] = LABEL_WEIGHT
+        
+        self.remove_node(uid)
+        self.doc_tokens[uid] = tokens
+        self.doc_signatures[uid] = signature
+        self.statuses[uid] = status
+        self.labels[uid] = label
+        for token, weight in tokens.items():
+            tiers = self.postings.get(token)
+            if tiers is None:
+                tiers = self.postings[token] = {}
+                bisect.insort(self.sorted_tokens, token)
+                for key in _deletes(token) | {token}:
+                    self.fuzzy_keys.setdefault(key, set()).add(token)
+            tiers.setdefault(weight, set()).add(uid)
+
+    def remove_node(self, uid):
+        tokens = self.doc_tokens.pop(uid, None)
+        self.doc_signatures.pop(uid, None)
+        self.statuses.pop(uid, None)
+        self.labels.pop(uid, None)
+        if not tokens:
+            return
+        for token, weight in tokens.items():
+            tiers = self.postings.get(token)
+            if tiers is None:
+                continue
+            uids = tiers.get(weight)
+            if uids is not None:
+                uids.discard(uid)
+                if not uids:
+                    del tiers[weight]
+            if not tiers:
+                del self.postings[token]
+                index = bisect.bisect_left(self.sorted_tokens, token)
+                del self.sorted_tokens[index]
+                for key in _deletes(token) | {token}:
+                    bucket = self.fuzzy_keys.get(key)
+                    if bucket:
+                        bucket.discard(token)
+                        if not bucket:
+                            del self.fuzzy_keys[key]
+
+    def set_status(self, uid, status):
+        if uid in self.statuses:
+            self.statuses[uid] = status
+
+    def clear(self):
+        self.postings.clear()
+        self.sorted_tokens.clear()
+        self.fuzzy_keys.clear()
+        self.doc_tokens.clear()
+        self.doc_signatures.clear()
+        self.statuses.clear()
+        self.labels.clear()
+
+    # --- Queries ---
+    def _expand_term(self, term, fuzzy):
+        """Returns {token: match score} for one query term."""
+        matches = {}
+        start = bisect.bisect_left(self.sorted_tokens, term)
+        for token in self.sorted_tokens[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not token.startswith(term):
+                break
+            matches[token] = EXACT_SCORE if token == term else PREFIX_SCORE
+        
+        if fuzzy and len(term) >= MIN_FUZZY_LENGTH:
+            candidates = set()
+            for key in _deletes(term) | {term}:
+                candidates.update(self.fuzzy_keys.get(key, ()))
+            for token in candidates:
+                matches.setdefault(token, FUZZY_SCORE)
+        return matches
+
+    def search(self, query, statuses=None, fuzzy=True, limit=50):
+        """
+        Returns [(uid, score)] best first. Every query term must match (prefix or one typo).
+        statuses: optional iterable of node statuses to keep.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        allowed = set(statuses) if statuses else None
+        expansions = [self._expand_term(term, fuzzy) for term in terms]
+        if not all(expansions):
+            return []
+        
+        if len(expansions) == 1:
+            hits = self._search_single(expansions[0], allowed, limit)
+        else:
+            hits = self._search_all(expansions, allowed, limit)
+        
+        hits = list(hits.items())
+        hits.sort(key=lambda item: (-item[1], self.labels.get(item[0], "")))
+        return hits
+
+    def _search_single(self, expansion, allowed, limit):
+        """Walks score tiers best first and stops once `limit` hits are found."""
+        tiers = sorted(((weight * quality, token, weight)
+                        for token, quality in expansion.items()
+                        for weight in self.postings[token]), reverse=True)
+        hits = {}
+        for score, token, weight in tiers:
+            for uid in self.postings[token][weight]:
+                if uid in hits or (allowed and self.statuses.get(uid) not in allowed):
+                    continue
+                hits[uid] = score
+                if len(hits) >= limit:
+                    return hits
+        return hits
+
+    def _term_tiers(self, expansion):
+        """[(score, [uid sets])] best first: the posting sets one term hits, grouped by weight * quality."""
+        tiers = {}
+        for token, quality in expansion.items():
+            for weight, uids in self.postings[token].items():
+                tiers.setdefault(weight * quality, []).append(uids)
+        return sorted(tiers.items(), reverse=True)
+
+    def _search_all(self, expansions, allowed, limit):
+        """
+        AND of several terms. The term with the fewest postings drives: its uids are visited best tier first
+        and the other terms score each one by probing their own tiers best first. Stops once `limit` hits
+        score at least what any uid still unvisited could.
+        """
+        def _size(tiers):
+            return sum(len(uids) for _, sets in tiers for uids in sets)
+        terms = sorted((self._term_tiers(expansion) for expansion in expansions), key=_size)
+        driver = terms[0]
+        # Per other term: every uid it hits (rejects most non-matches in one lookup), then its tiers to score with
+        others = [(self._probe_sets([uids for _, sets in tiers for uids in sets]),
+                   [(score, self._probe_sets(sets)) for score, sets in tiers]) for tiers in terms[1:]]
+        others_best = sum(tiers[0][0] for _, tiers in others)
+        
+        hits = {}
+        top = [] # Min-heap of the best `limit` scores so far
+        seen = set() # A uid in several driver tiers is scored once, from the best
+        for driver_score, sets in driver:
+            bound = driver_score + others_best # Best any uid from here on can score
+            if len(top) >= limit and top[0] >= bound:
+                break
+            for uids in sets:
+                for uid in uids:
+                    if uid in seen:
+                        continue
+                    seen.add(uid)
+                    if allowed and self.statuses.get(uid) not in allowed:
+                        continue
+                    total = driver_score
+                    for term_uids, tiers in others:
+                        if not any(uid in s for s in term_uids):
+                            break
+                        for score, probe in tiers:
+                            if any(uid in s for s in probe):
+                                total += score
+                                break
+                    else:
+                        hits[uid] = total
+                        if len(top) < limit:
+                            heapq.heappush(top, total)
+                        elif total > top[0]:
+                            heapq.heapreplace(top, total)
+                        if len(top) >= limit and top[0] >= bound:
+                            return dict(heapq.nlargest(limit, hits.items(), key=lambda item: item[1]))
+        return dict(heapq.nlargest(limit, hits.items(), key=lambda item: item[1]))
+
+    @staticmethod
+    def _probe_sets(sets):
+        """Posting sets for membership tests: biggest first, or merged when a short prefix spread them thin."""
+        if len(sets) > MAX_PROBED_SETS:
+            return [set().union(*sets)]
+        return sorted(sets, key=len, reverse=True)
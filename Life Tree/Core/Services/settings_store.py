@@ -0,0 +1,116 @@
+import copy
+import threading
+from Infrastructure.variables import SETTINGS_FLUSH_DELAY
+
+DEFAULT_RESTRICTED_KEYWORDS = ["facebook", "spank", "antigravity", "zoechip", "youtube"]
+
+
+class SettingsStore:
+    """
+    Process-wide cache of the small settings documents: per-perspective view states,
+    window geometry (both kept in app_state) and the restriction config.
+    Everything is loaded once; setters only touch memory and schedule a coalesced
+    background flush through the repository. flush() writes synchronously (used on exit).
+    """
+    def __init__(self, repository, flush_delay=SETTINGS_FLUSH_DELAY):
+        self.repository = repository # load/save_app_state, load/save_restriction_config
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = set() # "app_state", "restriction"
+
+        self._app_state = self.repository.load_app_state() or {}
+        self._restriction = self.repository.load_restriction_config() or {}
+
+    # --- View states (one per perspective) ---
+    def view_state(self, perspective):
+        """{"zoom", "center_x", "center_y"} last saved for perspective, or None."""
+        with self._lock:
+            state = self._app_state.get(perspective) or {}
+            if "view_zoom" not in state:
+                state = self._app_state # Older files kept a single global view
+            if state.get("view_zoom") is None:
+                return None
+            return {
+                "zoom": float(state.get("view_zoom", 1.0)),
+                "center_x": float(state.get("view_center_x", 0.0)),
+                "center_y": float(state.get("view_center_y", 0.0))
+            }
+
+    def set_view_state(self, perspective, view_state):
+        entry = {
+            "view_center_x": float(view_state["center_x"]),
+            "view_center_y": float(view_state["center_y"]),
+            "view_zoom": float(view_state["zoom"])
+        }
+        with self._lock:
+            if self._app_state.get(perspective) != entry:
+                self._app_state[perspective] = entry
+                self._mark_dirty("app_state")
+
+    # --- Window geometry ---
+    def window_geometry(self, name):
+        """(x, y, width, height) last saved for the named window, or None."""
+        with self._lock:
+            geometry = self._app_state.get("window_geometry", {}).get(name)
+            if not geometry or len(geometry) != 4:
+                return None
+            return tuple(int(v) for v in geometry)
+
+    def set_window_geometry(self, name, x, y, width, height):
+        geometry = [int(x), int(y), int(width), int(height)]
+        with self._lock:
+            geometries = self._app_state.setdefault("window_geometry", {})
+            if geometries.get(name) != geometry:
+                geometries[name] = geometry
+                self._mark_dirty("app_state")
+
+    # --- Restriction config ---
+    def restricted_keywords(self):
+        with self._lock:
+            return list(self._restriction.get("keywords", DEFAULT_RESTRICTED_KEYWORDS))
+
+    def restriction_armed(self):
+        """Saved armed flag, or None if it was never saved."""
+        with self._lock:
+            armed = self._restriction.get("armed")
+            return None if armed is None else bool(armed)
+
+    def set_restriction_config(self, keywords, armed):
+        config = {"keywords": list(keywords), "armed": bool(armed)}
+        with self._lock:
+            if self._restriction != config:
+                self._restriction = config
+                self._mark_dirty("restriction")
+
+    # --- Flushing ---
+    def _mark_dirty(self, section):
+        self._dirty.add(section)
+        if self.flush_delay is None:
+            return # Manual flush() only
+        # Debounce: every change pushes the write back, so a burst costs one write
+        if self._timer:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.flush_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Writes the dirty sections now. Safe to call from any thread; a no-op when clean."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            dirty, self._dirty = self._dirty, set()
+            app_state = copy.deepcopy(self._app_state) if "app_state" in dirty else None
+            restriction = copy.deepcopy(self._restriction) if "restriction" in dirty else None
+
+            # Still under the lock, so two flushes can't write out of order
+            try:
+                if app_state is not None:
+                    self.repository.save_app_state(app_state)
+                if restriction is not None:
+                    self.repository.save_restriction_config(restriction)
+            except Exception as e:
+                print(f"SettingsStore: Failed to flush settings: {e}")
+                self._dirty |= dirty # Retried by the next flush
@@ -0,0 +1,72 @@
+import math
+
+class GridIndex:
+    """
+    Uniform grid over axis-aligned rectangles.
+    Point and rectangle queries only look at the cells they touch, so hit-testing
+    cost depends on local density instead of the total number of nodes.
+    """
+    def __init__(self, cell_size=256):
+        self.cell_size = cell_size
+        self.cells = {} # (cx, cy) -> set of keys
+        self.rects = {} # key -> (x, y, w, h)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def _cell_range(self, x, y, w, h):
+        size = self.cell_size
+        return (math.floor(x / size), math.floor(y / size),
+                math.floor((x + w) / size), math.floor((y + h) / size))
+
+    def insert(self, key, x, y, w, h):
+        """Adds or moves the rectangle stored under key."""
+        if key in self.rects:
+            self.remove(key)
+        self.rects[key] = (x, y, w, h)
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, w, h)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self.cells.setdefault((cx, cy), set()).add(key)
+
+    def remove(self, key):
+        rect = self.rects.pop(key, None)
+        if rect is None:
+            return
+        cx0, cy0, cx1, cy1 = self._cell_range(*rect)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self.cells[(cx, cy)]
+
+    def clear(self):
+        self.cells.clear()
+        self.rects.clear()
+
+    def query_point(self, x, y):
+        """Returns the keys whose rectangle contains (x, y)."""
+        size = self.cell_size
+        bucket = self.cells.get((math.floor(x / size), math.floor(y / size)), ())
+        hits = []
+        for key in bucket:
+            rx, ry, rw, rh = self.rects[key]
+            if rx <= x <= rx + rw and ry <= y <= ry + rh:
+                hits.append(key)
+        return hits
+
+    def query_rect(self, x, y, w, h):
+        """Returns the keys whose rectangle intersects the given one."""
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, w, h)
+        hits = set()
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for key in self.cells.get((cx, cy), ()):
+                    if key in hits:
+                        continue
+                    rx, ry, rw, rh = self.rects[key]
+                    if rx <= x + w and x <= rx + rw and ry <= y + h and y <= ry + rh:
+                        hits.add(key)
+        return hits
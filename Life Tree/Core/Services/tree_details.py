@@ -0,0 +1,163 @@
+import os
+import json
+import glob
+import threading
+from Core.Entities.tree_traversal import iter_preorder, iter_postorder
+
+
+class DetailStore:
+    """
+    Detail fields (description, intentions, allowed_windows) of a skeleton tree file, kept in
+    <tree file>.details.<generation>: one JSON line per node. The skeleton references each line
+    as [generation, offset, length], so hydrating a node is a single seek-and-read.
+    Every checkpoint writes a new generation; lines of nodes that were never hydrated are copied
+    byte for byte, so checkpoints don't parse the history of untouched nodes.
+    """
+    def __init__(self, tree_path):
+        self.base_path = tree_path + ".details"
+        self.generation = max(self._generations(), default=0)
+        self._pending = {} # generation -> Event set once its file is in place
+        self._failed = {} # generation whose write failed -> {uid: reference it replaced}
+        self._uid_offsets = None # (generation, {uid: (offset, length)}) for references that went stale
+
+    def _path(self, generation):
+        return f"{self.base_path}.{generation}"
+
+    def _generations(self):
+        generations = []
+        for path in glob.glob(glob.escape(self.base_path) + ".*"):
+            suffix = path.rsplit(".", 1)[-1]
+            if suffix.isdigit():
+                generations.append(int(suffix))
+        return generations
+
+    # --- Reading ---
+    def read(self, ref, uid):
+        """Details dict of uid, or None. Falls back to a lookup by uid in the newest generation."""
+        try:
+            pending = self._pending.get(ref[0])
+            if pending:
+                pending.wait() # Referenced by the checkpoint being written right now
+            if ref[0] in self._failed:
+                ref = self._failed[ref[0]].get(uid, ref)
+            generation, offset, length = ref
+            with open(self._path(generation), 'rb') as f:
+                f.seek(offset)
+                data = json.loads(f.read(length))
+            if data.get("uid") == uid:
+                return data
+        except (OSError, ValueError, TypeError, IndexError):
+            pass
+        return self._read_by_uid(uid, max((g for g in self._generations() if g not in self._pending), default=0))
+
+    def _read_by_uid(self, uid, generation):
+        path = self._path(generation)
+        if not os.path.exists(path):
+            return None
+        if not self._uid_offsets or self._uid_offsets[0] != generation:
+            offsets = {}
+            with open(path, 'rb') as f:
+                offset = 0
+                for line in f:
+                    try:
+                        offsets[json.loads(line).get("uid")] = (offset, len(line))
+                    except ValueError:
+                        pass
+                    offset += len(line)
+            self._uid_offsets = (generation, offsets)
+        found = self._uid_offsets[1].get(uid)
+        if not found:
+            return None
+        with open(path, 'rb') as f:
+            f.seek(found[0])
+            return json.loads(f.read(found[1]))
+
+    def _raw(self, ref, uid, fallback_generation):
+        """The stored line of a node that was never hydrated (re-encoded if the reference went stale)."""
+        try:
+            if ref[0] in self._failed:
+                ref = self._failed[ref[0]].get(uid, ref)
+            generation, offset, length = ref
+            with open(self._path(generation), 'rb') as f:
+                f.seek(offset)
+                line = f.read(length)
+            if json.loads(line).get("uid") == uid:
+                return line
+        except (OSError, ValueError, TypeError, IndexError):
+            pass
+        data = self._read_by_uid(uid, fallback_generation) or {"uid": uid}
+        return json.dumps(data, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    # --- Checkpoints ---
+    def snapshot(self, roots, serializer, pretty=False):
+        """
+        Encodes the skeleton for a new generation and returns (skeleton bytes, DetailsWrite).
+        Runs on the owning thread: hydrated nodes are encoded now, the rest are copied later
+        by DetailsWrite.write(). Nodes that aren't hydrated are re-pointed at the new generation.
+        """
+        generation = self.generation + 1
+        parts = [] # (bytes or (old ref, uid))
+        refs = {}
+        offset = 0
+        for node in iter_preorder(roots):
+            if node.is_hydrated:
+                line = json.dumps(node.details_dict(), separators=(",", ":")).encode("utf-8") + b"\n"
+                parts.append(line)
+                length = len(line)
+            else:
+                parts.append((node._details, node.uid))
+                length = node._details[2]
+            refs[node.uid] = [generation, offset, length] # A stale copied line may differ in length; read() then finds it by uid
+            offset += length
+
+        built = {}
+        for node in iter_postorder(roots):
+            data = node._skeleton_dict(refs[node.uid])
+            data["children"] = [built.pop(id(child)) for child in node.children]
+            built[id(node)] = data
+        skeleton = [built[id(root)] for root in roots]
+
+        event = threading.Event()
+        self._pending[generation] = event
+        for node in iter_preorder(roots):
+            if not node.is_hydrated:
+                node._details = refs[node.uid]
+        self.generation = generation
+        return serializer.dumps(skeleton, pretty=pretty), DetailsWrite(self, generation, parts, event)
+
+    def prune(self, keep_generation):
+        """Deletes generations older than keep_generation (nothing references them once the journal is cut)."""
+        for generation in self._generations():
+            if generation < keep_generation:
+                try:
+                    os.remove(self._path(generation))
+                except OSError as e:
+                    print(f"DetailStore: Could not remove {self._path(generation)}: {e}")
+
+
+class DetailsWrite:
+    """The file half of a DetailStore.snapshot(), safe to run in a background thread."""
+    def __init__(self, store, generation, parts, event):
+        self.store = store
+        self.generation = generation
+        self.parts = parts
+        self.event = event
+
+    def write(self):
+        path = self.store._path(self.generation)
+        try:
+            with open(path + ".tmp", 'wb') as f:
+                for part in self.parts:
+                    f.write(part if isinstance(part, bytes) else self.store._raw(*part, self.generation - 1))
+            os.replace(path + ".tmp", path)
+        except Exception:
+            # Nodes were already re-pointed at this generation: send their reads back to the old lines
+            copied = (part for part in self.parts if not isinstance(part, bytes))
+            self.store._failed[self.generation] = {uid: ref for ref, uid in copied}
+            raise
+        finally:
+            self.store._pending.pop(self.generation, None)
+            self.event.set()
+
+    def prune(self):
+        self.store.prune(self.generation)
@@ -0,0 +1,254 @@
+import os
+import json
+import threading
+from Core.Ports.serializer import read_file
+from Core.Services.tree_details import DetailStore
+from Infrastructure.variables import TREE_JOURNAL_COMPACT_BYTES
+
+
+class TreeJournal:
+    """
+    Write-ahead journal for a tree file: NodeService's row store when no database is configured.
+    The tree file is the checkpoint; every save appends one JSON line per changed node to
+    <path>.journal instead of rewriting the whole tree, and stat/cycle ticks are appended as they happen.
+    Records hold absolute values (not deltas), so replaying one that the checkpoint already
+    contains is harmless. Once the journal passes compact_bytes, a new checkpoint is written in the background.
+    With lazy set, the checkpoint is a skeleton whose detail fields live in a DetailStore and are
+    only read when a node is hydrated; otherwise skeleton nodes are filled in at load.
+
+    Records ({"seq": n, "op": ...}):
+        node   - parent, index, fields: create or update the node and (re)attach it at parent[index]
+        remove - uid: drop the node and whatever is still below it
+        stats  - uid, i, text, stats: Stats of node.intentions[i] (skipped if the text no longer matches)
+        cycle  - uid, time, count
+    """
+    def __init__(self, path, encode=None, compact_bytes=TREE_JOURNAL_COMPACT_BYTES, lazy=False):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.encode = encode # () -> checkpoint bytes, or (skeleton bytes, DetailsWrite)
+        self.lazy = lazy
+        self.details = DetailStore(path)
+        self.compact_bytes = compact_bytes
+        self.seq = 0 # Last sequence number written
+        self._size = 0
+        self._lock = threading.Lock() # Appends vs. the compaction thread rewriting the journal
+        self._compaction = None
+
+    # --- Loading ---
+    def load_tree(self):
+        """Checkpoint with the journal replayed on top, as a list of root dicts (None if nothing is stored)."""
+        roots = read_file(self.path) if os.path.exists(self.path) else None
+        if isinstance(roots, dict):
+            roots = [roots]
+        records = list(self._read_records())
+        if records:
+            roots = self.replay(roots or [], records, self._hydrate_dict)
+            print(f"TreeJournal: Replayed {len(records)} change(s) onto {os.path.basename(self.path)}")
+        if roots and not self.lazy:
+            stack = list(roots)
+            while stack:
+                node_data = stack.pop()
+                self._hydrate_dict(node_data)
+                stack.extend(node_data.get("children", []))
+        return roots
+
+    def _hydrate_dict(self, node_data):
+        """Turns a skeleton node dict into a full one (in place)."""
+        ref = node_data.pop("details", None)
+        node_data.pop("intention_stats", None)
+        if ref is not None and "intentions" not in node_data:
+            details = self.details.read(ref, node_data.get("uid")) or {}
+            for field in ("description", "intentions", "allowed_windows"):
+                node_data[field] = details.get(field, [] if field != "description" else "")
+
+    def _read_records(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'rb') as f:
+            data = f.read()
+
+        # A crash mid-append leaves a torn last line: cut it so the next append starts clean
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(end)
+        self._size = end
+
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            self.seq = max(self.seq, record.get("seq", 0))
+            yield record
+
+    @staticmethod
+    def replay(roots, records, hydrate=None):
+        """
+        Applies journal records to a list of root dicts (in place) and returns it.
+        hydrate(node_dict) fills in a skeleton node's details, needed before its stats can be patched.
+        """
+        index = {}
+        parents = {} # uid -> parent dict (None for roots)
+
+        def _index(data, parent):
+            stack = [(data, parent)]
+            while stack:
+                node_data, parent_data = stack.pop()
+                index[node_data.get("uid")] = node_data
+                parents[node_data.get("uid")] = parent_data
+                stack.extend((child, node_data) for child in node_data.get("children", []))
+
+        def _detach(uid):
+            parent_data = parents.get(uid)
+            siblings = parent_data["children"] if parent_data else roots
+            siblings[:] = [child for child in siblings if child.get("uid") != uid]
+
+        for root in roots:
+            _index(root, None)
+
+        for record in records:
+            op = record.get("op")
+            uid = record.get("uid")
+            if op == "node":
+                fields = record.get("fields", {})
+                uid = fields.get("uid")
+                parent_uid = record.get("parent")
+                parent_data = index.get(parent_uid) if parent_uid else None
+                if parent_uid and parent_data is None:
+                    continue # Parent gone; a later remove record drops this node too
+                node_data = index.get(uid)
+                if node_data is None:
+                    node_data = {"children": []}
+                    index[uid] = node_data
+                else:
+                    _detach(uid)
+                    children = node_data.get("children", [])
+                    node_data.clear() # A full record replaces a skeleton one and vice versa
+                    node_data["children"] = children
+                node_data.update(fields)
+                siblings = parent_data["children"] if parent_data else roots
+                siblings.insert(min(record.get("index", len(siblings)), len(siblings)), node_data)
+                parents[uid] = parent_data
+            elif op == "remove" and uid in index:
+                _detach(uid)
+                stack = [index[uid]]
+                while stack:
+                    node_data = stack.pop()
+                    index.pop(node_data.get("uid"), None)
+                    parents.pop(node_data.get("uid"), None)
+                    stack.extend(node_data.get("children", []))
+            elif op == "stats" and uid in index:
+                if "intentions" not in index[uid] and hydrate:
+                    hydrate(index[uid])
+                intentions = index[uid].get("intentions", [])
+                i = record.get("i", -1)
+                if 0 <= i < len(intentions) and intentions[i].get("text") == record.get("text"):
+                    intentions[i]["stats"] = record.get("stats")
+            elif op == "cycle" and uid in index:
+                index[uid]["cycle_time"] = record.get("time", 0)
+                index[uid]["cycle_count"] = record.get("count", 0)
+        return roots
+
+    # --- Writing ---
+    def save_tree(self, roots, nodes, dirty_uids, removed_uids, full=False):
+        """Store interface (see SqliteTreeStore.save_tree): journals the changed nodes, or checkpoints when full."""
+        if full:
+            self.checkpoint()
+            return
+
+        def _depth(node):
+            depth = 0
+            while node.parent:
+                node = node.parent
+                depth += 1
+            return depth
+
+        positions = {} # id(parent) -> {id(child): index}, built once per sibling list (imports add thousands)
+
+        def _position(node):
+            siblings = node.parent.children if node.parent else roots
+            index = positions.get(id(node.parent))
+            if index is None:
+                index = positions[id(node.parent)] = {id(child): i for i, child in enumerate(siblings)}
+            return index.get(id(node), len(siblings))
+
+        # Parents before children and siblings in order, so each insert lands where it belongs
+        changed = sorted((nodes[uid] for uid in dirty_uids if uid in nodes),
+                         key=lambda n: (_depth(n), _position(n)))
+        records = [{"op": "node", "parent": n.parent.uid if n.parent else None, "index": _position(n),
+                    "fields": n._fields_dict()} for n in changed]
+        records.extend({"op": "remove", "uid": uid} for uid in removed_uids if uid not in nodes)
+        self.append(records)
+
+    def append_stats(self, node, index):
+        intention = node.intentions[index]
+        self.append([{"op": "stats", "uid": node.uid, "i": index, "text": intention.text,
+                      "stats": intention.stats.to_dict()}])
+
+    def append_cycle(self, node):
+        self.append([{"op": "cycle", "uid": node.uid, "time": node.cycle_time, "count": node.cycle_count}])
+
+    def append(self, records):
+        if not records:
+            return
+        with self._lock:
+            lines = []
+            for record in records:
+                self.seq += 1
+                record["seq"] = self.seq
+                lines.append(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+            data = b"".join(lines)
+            with open(self.journal_path, 'ab') as f:
+                f.write(data)
+            self._size += len(data)
+
+        if self._size >= self.compact_bytes and self.encode and not self._compacting():
+            self.compact()
+
+    # --- Checkpoints ---
+    def _compacting(self):
+        return self._compaction is not None and self._compaction.is_alive()
+
+    def compact(self):
+        """Encodes the tree now (cheap, from the fragment cache) and writes the checkpoint in a background thread."""
+        data, seq = self.encode(), self.seq
+        self._compaction = threading.Thread(target=self._write_checkpoint, args=(data, seq), daemon=True)
+        self._compaction.start()
+
+    def checkpoint(self):
+        """Writes the whole tree and empties the journal, synchronously."""
+        if self._compacting():
+            self._compaction.join()
+        self._write_checkpoint(self.encode(), self.seq)
+
+    def _write_checkpoint(self, snapshot, seq):
+        data, details = snapshot if isinstance(snapshot, tuple) else (snapshot, None)
+        try:
+            if details:
+                details.write() # The skeleton must never point at lines that aren't on disk yet
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+
+            # Keep only what was appended after the snapshot (the writer may have kept going)
+            with self._lock:
+                kept = []
+                if os.path.exists(self.journal_path):
+                    with open(self.journal_path, 'rb') as f:
+                        for line in f:
+                            try:
+                                if json.loads(line).get("seq", 0) > seq:
+                                    kept.append(line)
+                            except ValueError:
+                                continue
+                journal_tmp = self.journal_path + ".tmp"
+                with open(journal_tmp, 'wb') as f:
+                    f.writelines(kept)
+                os.replace(journal_tmp, self.journal_path)
+                self._size = sum(len(line) for line in kept)
+            if details:
+                details.prune()
+        except Exception as e:
+            print(f"TreeJournal: Failed to write checkpoint: {e}")
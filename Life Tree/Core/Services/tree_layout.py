@@ -0,0 +1,122 @@
+import time
+from collections import namedtuple
+from Core.Entities.tree_traversal import iter_preorder, iter_postorder
+
+# Immutable view of everything the layout needs. Built on the UI thread, safe to hand to a worker.
+NodeSnapshot = namedtuple("NodeSnapshot", ["uid", "width", "status", "collapsed", "children"])
+
+
+class LayoutCancelled(Exception):
+    pass
+
+
+class LayoutResult:
+    """Output of compute_layout(): plain data, applied to the scene in one batch."""
+    def __init__(self):
+        self.positions = {} # uid -> (x, y, width) for every visible node
+        self.percentages = {} # uid -> subtree completion % for every visible node
+        self.order = [] # Visible uids, parents before children
+        self.edges = [] # (parent_uid, child_uid) for every visible connection
+        self.timings = {"layout": 0.0, "percentage": 0.0}
+
+
+def snapshot_tree(roots, measure_width):
+    """
+    Freezes the tree into NodeSnapshots.
+    measure_width(label) returns the rendered label width in pixels.
+    Returns (snapshots, anchors) where anchors[i] is the (x, y) root i must stay at.
+    """
+    # Post-order, so each node's child snapshots already exist when it is frozen
+    built = {}
+    for node in iter_postorder(roots):
+        width = max(100, measure_width(node.label) + 40) # Min 100, add 40px padding
+        children = tuple(built.pop(id(child)) for child in node.children)
+        built[id(node)] = NodeSnapshot(node.uid, width, node.status, node.collapsed, children)
+
+    snapshots = tuple(built[id(root)] for root in roots)
+    anchors = tuple((root.x, root.y) for root in roots)
+    return snapshots, anchors
+
+
+def compute_layout(snapshots, anchors, level_height=80, with_percentages=True, is_cancelled=None):
+    """
+    Pure layout over a snapshot: no Qt, no Node mutation.
+    Raises LayoutCancelled if is_cancelled() turns true mid-way.
+    """
+    result = LayoutResult()
+
+    # 1. Positions (same rules as the original recursive layout)
+    start = time.perf_counter()
+
+    def _visible_children(snap):
+        # A collapsed subtree is laid out as a single (summary) node
+        return () if snap.collapsed else snap.children
+
+    def _check_cancelled():
+        if is_cancelled and is_cancelled():
+            raise LayoutCancelled()
+
+    for root, (anchor_x, anchor_y) in zip(snapshots, anchors):
+        # a) Post-order: horizontal span of every visible subtree (40px margin per leaf)
+        spans = {}
+        children_width = {}
+        for snap in iter_postorder([root], _visible_children):
+            _check_cancelled()
+            kids = _visible_children(snap)
+            if kids:
+                total = sum(spans[child.uid] for child in kids)
+                children_width[snap.uid] = total
+                spans[snap.uid] = max(total, snap.width + 40)
+            else:
+                spans[snap.uid] = snap.width + 40
+
+        # b) Pre-order: children are packed left to right, parents centered over them
+        local = {}
+        stack = [(root, 0, 0)]
+        while stack:
+            _check_cancelled()
+            snap, x, y = stack.pop()
+            kids = _visible_children(snap)
+            if kids:
+                local[snap.uid] = (x + (children_width[snap.uid] - snap.width) / 2, y)
+                child_x = x
+                placed = []
+                for child in kids:
+                    placed.append((child, child_x, y + level_height))
+                    child_x += spans[child.uid]
+                stack.extend(reversed(placed))
+            else:
+                local[snap.uid] = (x, y)
+
+        # c) Shift so the root stays exactly at its anchor
+        root_x, root_y = local[root.uid]
+        dx, dy = anchor_x - root_x, anchor_y - root_y
+        for snap in iter_preorder([root], _visible_children):
+            x, y = local[snap.uid]
+            result.positions[snap.uid] = (x + dx, y + dy, snap.width)
+            result.order.append(snap.uid)
+            for child in _visible_children(snap):
+                result.edges.append((snap.uid, child.uid))
+
+    result.timings["layout"] = time.perf_counter() - start
+
+    # 2. Subtree mass percentages, one post-order pass for the whole tree
+    if with_percentages:
+        start = time.perf_counter()
+
+        mass = {}
+        for snap in iter_postorder(snapshots):
+            _check_cancelled()
+            solved, total = 0, 1
+            for child in snap.children:
+                c_solved, c_total = mass.pop(child.uid)
+                solved += c_solved
+                total += c_total
+            if snap.status == "solved":
+                solved = total
+            mass[snap.uid] = (solved, total)
+            if snap.uid in result.positions:
+                result.percentages[snap.uid] = (solved / total) * 100.0
+        result.timings["percentage"] = time.perf_counter() - start
+
+    return result
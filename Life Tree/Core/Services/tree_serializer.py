@@ -0,0 +1,49 @@
+from Core.Entities.tree_traversal import iter_postorder
+
+
+class FragmentCache:
+    """
+    Memoized JSON bytes of every node's subtree, for incremental saves.
+    A fragment embeds its children, so a change must invalidate the node and all its ancestors.
+    """
+    def __init__(self):
+        self.fragments = {} # uid -> JSON bytes of node.to_dict()
+        self.serializer_name = None # Backend the fragments were encoded with
+
+    def __len__(self):
+        return len(self.fragments)
+
+    def invalidate(self, node):
+        while node is not None:
+            self.fragments.pop(node.uid, None)
+            node = node.parent
+
+    def clear(self):
+        self.fragments.clear()
+
+    def prune(self, live_uids):
+        """Drops fragments of nodes that no longer exist."""
+        for uid in [uid for uid in self.fragments if uid not in live_uids]:
+            del self.fragments[uid]
+
+    def encode(self, roots, serializer):
+        """
+        Same document as serializer.dumps([r.to_dict() for r in roots]) for a compact JSON
+        serializer, but only nodes without a cached fragment are re-encoded.
+        """
+        if serializer.name != self.serializer_name:
+            self.fragments.clear()
+            self.serializer_name = serializer.name
+        fragments = self.fragments
+
+        def _stale_children(node):
+            return [child for child in node.children if child.uid not in fragments]
+
+        stale_roots = [root for root in roots if root.uid not in fragments]
+        for node in iter_postorder(stale_roots, _stale_children):
+            # "children" is the last key of to_dict(), so it can be appended to the encoded fields
+            fields = serializer.dumps(node._fields_dict())
+            children = b",".join(fragments[child.uid] for child in node.children)
+            fragments[node.uid] = fields[:-1] + b',"children":[' + children + b']}'
+
+        return b"[" + b",".join(fragments[root.uid] for root in roots) + b"]"
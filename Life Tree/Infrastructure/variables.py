@@ -13,7 +13,11 @@ VALUES_DATA_PATH = os.path.join(DATABASE_DIR, "values_data.json")
 FOCUS_DATA_PATH = os.path.join(DATABASE_DIR, "focus_data.json")
 STATS_HISTORY_PATH = os.path.join(DATABASE_DIR, "stats_history.json")
 APP_STATE_PATH = os.path.join(DATABASE_DIR, "app_state.json")
-SESSION_LOGS_PATH = os.path.join(DATABASE_DIR, "session_logs.json")
+SESSION_LOGS_PATH = os.path.join(DATABASE_DIR, "session_logs.json") # Legacy whole-file log, imported into SESSION_LOG_PATH
+SESSION_LOG_PATH = os.path.join(DATABASE_DIR, "session_logs.jsonl")
+RESTRICT_CONFIG_PATH = os.path.join(DATABASE_DIR, "restrict_config.json")
+LEGACY_RESTRICT_CONFIG_PATH = os.path.join("progress_logs", "restrict_config.json") # Old location, relative to the working directory
+SQLITE_DB_PATH = os.path.join(DATABASE_DIR, "life_tree.db")
 
 # --- Timing Configuration (Minutes) ---
 FOCUS_TIME = 25
@@ -27,6 +31,22 @@ IDLE_THRESHOLD_SECONDS = 25
 # --- Cycle Configuration ---
 CYCLE_TIME_LIMIT = 28800 # 8 hours in seconds
 
+# --- Storage ---
+STORAGE_BACKEND = "json" # "json" (one file per store) or "sqlite" (SQLITE_DB_PATH, migrated from the JSON files on first run)
+SERIALIZER_BACKEND = "auto" # "auto" (orjson > msgspec > json), or one of "json", "orjson", "msgspec", "msgpack"
+TREE_SAVE_PRETTY = False # Indented JSON for hand-inspection; disables incremental (cached) saves
+TREE_JOURNAL_ENABLED = True # Saves append changed nodes to <tree file>.journal; the tree file is rewritten only at checkpoints
+TREE_JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024 # Journal size that triggers a background checkpoint
+TREE_LAZY_DETAILS = False # Journal checkpoints as a skeleton + details file; intentions/descriptions load on first access
+SETTINGS_FLUSH_DELAY = 2.0 # Seconds of quiet before view states / geometry / restriction config are written
+TREE_IMPORT_BATCH_SIZE = 1000 # Records parsed and turned into nodes per step of an import (see NodeService.import_records)
+INTENTION_ARCHIVE_DAYS = 30 # Completed intentions older than this move to <tree file>.archive (None keeps them in the tree)
+
+# --- Tree Canvas ---
+TREE_TILE_CACHE_ENABLED = False # Pre-rendered tiles for smooth panning of very large trees
+CANVAS_STATS_PATH = os.path.join(DATABASE_DIR, "canvas_stats.csv") # Rolling export of the F3 stats overlay
+CANVAS_STATS_MAX_ROWS = 3600 # One row per second while the overlay is on (~1 hour)
+
 # --- Graph Configuration ---
 GRAPH_FOCUS_WINDOW_MINS = 25
 GRAPH_UPDATE_INTERVAL_MS = 1000
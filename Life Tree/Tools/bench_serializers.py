@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import random
+import tempfile
+
+# Add the project root to sys.path to allow absolute imports like 'Core.Entities'
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from Core.Entities.node import Node
+from Core.Entities.intention import Intention, Stats
+from Core.Ports.serializer import load_bytes, register_decoder
+from Core.Entities.tree_traversal import iter_preorder
+from Adapters.Persistence.serializers import available_serializers
+
+TREE_NODES = 10000
+HISTORY_POINTS = 86400 # One point per second for a full day
+
+
+def build_tree(count):
+    """~count nodes, 10 children per node, each with a couple of intentions."""
+    rng = random.Random(1)
+    root = Node("My Problems")
+    frontier = [root]
+    made = 1
+    while made < count:
+        parent = frontier.pop(0)
+        for i in range(10):
+            if made >= count:
+                break
+            node = parent.add_child(Node(f"{parent.label[:20]} / task {made}", status=rng.choice(["neutral", "solving", "solved"])))
+            node.x, node.y = rng.uniform(-5000, 5000), rng.uniform(0, 2000)
+            node.intentions = [Intention(f"Intention {made}.{j}", "active", Stats(rng.randint(0, 9000), rng.randint(0, 900), rng.randint(0, 5000))) for j in range(2)]
+            frontier.append(node)
+            made += 1
+    return root
+
+
+def build_history(count):
+    """Same shape as HistoryRecorder.data_points."""
+    start = time.time() - count
+    return [[start + i, i * 0.8, i // 7, i // 2, f"Node {i // 600}", f"Intention {i // 1200}"] for i in range(count)]
+
+
+def timed(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def run(name, data, path):
+    print(f"{name}")
+    print(f"  {'backend':<10} {'save':>10} {'load':>10} {'size':>10}")
+    for backend_name, backend in available_serializers().items():
+        register_decoder(backend) # Let load_bytes() use this backend for its format
+
+        def _save():
+            with open(path, 'wb') as f:
+                f.write(backend.dumps(data))
+
+        def _load():
+            with open(path, 'rb') as f:
+                return load_bytes(f.read())
+
+        save_ms = timed(_save)
+        load_ms = timed(_load)
+        size_kb = os.path.getsize(path) / 1024
+        print(f"  {backend_name:<10} {save_ms:8.1f}ms {load_ms:8.1f}ms {size_kb:8.0f}KB")
+    print()
+
+
+if __name__ == "__main__":
+    root = build_tree(TREE_NODES)
+    count = sum(1 for _ in iter_preorder([root]))
+    tree = [root.to_dict()]
+    history = build_history(HISTORY_POINTS)
+    print(f"Backends installed: {', '.join(available_serializers())}\n")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "bench.bin")
+        run(f"Tree ({count} nodes, dict -> bytes -> dict)", tree, path)
+        run(f"History ({HISTORY_POINTS} points)", history, path)
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+
+# Add the project root to sys.path to allow absolute imports like 'Core.Entities'
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from Core.Entities.node import Node
+from Core.Services.node_service import NodeService
+from Core.Services.percentage_engine import calculate_node_percentage
+from Core.Services.tree_layout import snapshot_tree, compute_layout
+from Core.Entities.tree_traversal import iter_preorder, iter_postorder
+
+DEEP_DEPTH = 5000
+WIDE_FANOUT = 1000
+
+
+def build_deep(depth):
+    """A single chain: root -> child -> ... (depth nodes)."""
+    root = Node("My Life")
+    node = root
+    for i in range(depth - 1):
+        node = node.add_child(Node(f"Deep {i}", status="solved" if i % 3 == 0 else "neutral"))
+    return root
+
+
+def build_wide(fanout):
+    """Two levels: root -> fanout children -> 2 grandchildren each."""
+    root = Node("My Life")
+    for i in range(fanout):
+        child = root.add_child(Node(f"Wide {i}", status="solved" if i % 3 == 0 else "neutral"))
+        child.add_child(Node(f"Wide {i}.a"))
+        child.add_child(Node(f"Wide {i}.b"))
+    return root
+
+
+def recursive_count(node):
+    """The old recursive style, kept as a baseline."""
+    return 1 + sum(recursive_count(child) for child in node.children)
+
+
+def timed(label, func, repeat=5):
+    best = None
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"  {label:<28} {best * 1000:9.2f} ms")
+    except RecursionError:
+        print(f"  {label:<28}  RecursionError")
+
+
+def run(name, root):
+    service = NodeService.__new__(NodeService) # No file I/O, just the tree helpers
+    service.roots = [root]
+    count = sum(1 for _ in iter_preorder([root]))
+    print(f"{name} ({count} nodes)")
+
+    timed("recursive count (baseline)", lambda: recursive_count(root))
+    timed("iter_preorder", lambda: sum(1 for _ in iter_preorder([root])))
+    timed("iter_postorder", lambda: sum(1 for _ in iter_postorder([root])))
+    timed("get_all_nodes", service.get_all_nodes)
+    timed("get_subtree_stats", lambda: service.get_subtree_stats(root))
+    timed("calculate_node_percentage", lambda: calculate_node_percentage(root))
+    timed("translate", lambda: root.translate(1, 1))
+    data = root.to_dict()
+    timed("to_dict", root.to_dict)
+    timed("from_dict", lambda: Node.from_dict(data))
+    snapshots, anchors = snapshot_tree([root], lambda label: len(label) * 7)
+    timed("snapshot_tree", lambda: snapshot_tree([root], lambda label: len(label) * 7))
+    timed("compute_layout", lambda: compute_layout(snapshots, anchors))
+    print()
+
+
+if __name__ == "__main__":
+    print(f"Python recursion limit: {sys.getrecursionlimit()}\n")
+    run(f"Deep chain (depth {DEEP_DEPTH})", build_deep(DEEP_DEPTH))
+    run(f"Wide tree (fan-out {WIDE_FANOUT})", build_wide(WIDE_FANOUT))
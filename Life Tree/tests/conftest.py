@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Add the project root to sys.path to allow absolute imports like 'Core.Entities'
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
@@ -0,0 +1,58 @@
+import datetime
+
+from Core.Entities.intention import Intention, Stats
+from Core.Services.intention_archive import IntentionArchive
+from Core.Services.node_service import NodeService
+
+NOW = datetime.datetime(2026, 3, 1, 12, 0, 0)
+
+
+def completed(text, days_ago, time=0):
+    completed_at = (NOW - datetime.timedelta(days=days_ago)).isoformat(timespec="seconds")
+    return Intention(text, "completed", Stats(time), completed_at)
+
+
+def test_pages_newest_first_and_skips_duplicates(tmp_path):
+    archive = IntentionArchive(str(tmp_path / "tree.json.archive"))
+    first = [completed(f"a{i}", 40 + i) for i in range(3)]
+    assert archive.append("a", first, "2026-02-01") == 3
+    assert archive.append("b", [completed("b0", 45)], "2026-02-02") == 1
+    assert archive.append("a", first[:1], "2026-02-03") == 0 # A retried sweep
+
+    reopened = IntentionArchive(str(tmp_path / "tree.json.archive"))
+    assert reopened.count() == 4 and reopened.count(["a"]) == 3
+    assert [e["text"] for e in reopened.page()] == ["b0", "a2", "a1", "a0"]
+    assert [e["text"] for e in reopened.page(["a"], start=1, limit=1)] == ["a1"]
+
+
+def test_append_after_torn_line(tmp_path):
+    path = tmp_path / "tree.json.archive"
+    IntentionArchive(str(path)).append("a", [completed("kept", 40)], "2026-02-01")
+    with open(path, 'ab') as f:
+        f.write(b'{"text":"torn","uid":"a"') # Crash mid-append
+
+    archive = IntentionArchive(str(path))
+    archive.append("a", [completed("next", 35)], "2026-02-02")
+    assert [e["text"] for e in IntentionArchive(str(path)).page()] == ["next", "kept"]
+
+
+def test_sweep_moves_old_completed_intentions_out(tmp_path):
+    service = NodeService(str(tmp_path / "tree.json"), lazy=False, archive_days=30)
+    node = service.add_child_node(service.roots[0], "A")
+    node.intentions = [completed("old", 40, time=100), completed("recent", 5, time=20),
+                       Intention("active", stats=Stats(7)), Intention("unstamped", "completed")]
+    service.mark_dirty(node)
+    service.save()
+    undo_depth = len(service.undo_stack)
+
+    assert service.archive_completed(now=NOW) == 1
+    assert [i.text for i in node.intentions] == ["recent", "active", "unstamped"]
+    assert node.intentions[2].completed_at == NOW.isoformat(timespec="seconds") # Ages from the first sweep
+    assert node.archived_stats.time == 100
+    assert service.get_subtree_stats(node).time == 127 # Totals unchanged
+    assert len(service.undo_stack) == undo_depth
+    assert [e["text"] for e in service.archived_intentions(node)] == ["old"]
+
+    reloaded = NodeService(str(tmp_path / "tree.json"), lazy=False)
+    assert [i.text for i in reloaded.get(node.uid).intentions] == ["recent", "active", "unstamped"]
+    assert reloaded.archived_count(reloaded.roots[0]) == 1
@@ -0,0 +1,72 @@
+import time
+import random
+
+from Core.Services.search_index import SearchIndex, tokenize, LABEL_WEIGHT, DESCRIPTION_WEIGHT
+
+WORDS = ["study", "studio", "math", "mathe", "stuff", "matrix", "magic", "read", "ready", "write", "writer"]
+
+
+def build_index(count, seed=1):
+    rng = random.Random(seed)
+    index = SearchIndex()
+    for uid in range(count):
+        index.index_fields(str(uid), " ".join(rng.sample(WORDS, 2)), rng.choice(["neutral", "solved"]),
+                           " ".join(rng.sample(WORDS, 3)), (" ".join(rng.sample(WORDS, 2)),))
+    return index
+
+
+def brute_force(index, query, statuses=None):
+    """Every match with its score, scoring each document from its own tokens."""
+    expansions = [index._expand_term(term, True) for term in dict.fromkeys(tokenize(query))]
+    hits = {}
+    for uid, doc in index.doc_tokens.items():
+        if statuses and index.statuses[uid] not in statuses:
+            continue
+        bests = [max((weight * expansion.get(token, 0) for token, weight in doc.items()), default=0)
+                 for expansion in expansions]
+        if all(bests):
+            hits[uid] = sum(bests)
+    return hits
+
+
+def test_multi_term_matches_brute_force():
+    for seed in range(5):
+        index = build_index(300, seed)
+        for query in ["stu ma", "study math", "read writ", "ma st re", "wrte ready"]:
+            for statuses in (None, ["solved"]):
+                expected = brute_force(index, query, statuses)
+                found = index.search(query, statuses=statuses, limit=len(expected) + 1)
+                assert {uid for uid, _ in found} == set(expected)
+                assert all(abs(score - expected[uid]) < 1e-9 for uid, score in found)
+
+                top = index.search(query, statuses=statuses, limit=5)
+                best = sorted(expected.values(), reverse=True)[:5]
+                assert [round(score, 9) for _, score in top] == [round(score, 9) for score in best]
+
+
+def test_label_hits_rank_first():
+    index = SearchIndex()
+    index.index_fields("a", "Garden", "neutral", "weekly plan", ())
+    index.index_fields("b", "Weekly plan", "neutral", "garden", ())
+    assert index.search("weekly plan")[0] == ("b", 2 * LABEL_WEIGHT)
+    assert index.search("garden") == [("a", LABEL_WEIGHT), ("b", DESCRIPTION_WEIGHT)]
+
+
+def test_common_tokens_stop_at_limit():
+    # ~75k indexed strings (label, description, intention per node), two tokens in every label
+    rng = random.Random(1)
+    vocab = [f"w{i}" for i in range(5000)] + WORDS
+    index = SearchIndex()
+    for uid in range(25000):
+        index.index_fields(str(uid), " ".join(rng.sample(vocab, 2)) + " common common2", "neutral",
+                           " ".join(rng.sample(vocab, 5)), (" ".join(rng.sample(vocab, 3)),))
+
+    for query in ["common common2", "comm common2", "common study", "study math", "stu ma"]:
+        elapsed = []
+        for _ in range(5):
+            start = time.perf_counter()
+            hits = index.search(query, limit=50)
+            elapsed.append(time.perf_counter() - start)
+        assert len(hits) <= 50
+        assert min(elapsed) < 0.010, f"{query!r} took {min(elapsed) * 1000:.1f} ms"
+    assert len(index.search("common common2", limit=50)) == 50
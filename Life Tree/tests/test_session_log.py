@@ -0,0 +1,36 @@
+from Adapters.Persistence.session_log import SessionLog
+
+
+def entry(timestamp, outcome="done"):
+    return {"timestamp": timestamp, "outcome": outcome}
+
+
+def test_range_reads_by_day(tmp_path):
+    log = SessionLog(str(tmp_path / "sessions.jsonl"))
+    for timestamp in ["2026-01-01T09:00:00", "2026-01-01T17:00:00", "2026-01-02T09:00:00", "2026-01-04T09:00:00"]:
+        log.append(entry(timestamp))
+
+    reopened = SessionLog(str(tmp_path / "sessions.jsonl"))
+    assert reopened.days() == ["2026-01-01", "2026-01-02", "2026-01-04"]
+    assert [e["timestamp"] for e in reopened.read_range("2026-01-02", "2026-01-03")] == ["2026-01-02T09:00:00"]
+    assert len(reopened.read_range(start="2026-01-01")) == 4
+
+
+def test_clock_going_backwards_is_compacted_sorted(tmp_path):
+    log = SessionLog(str(tmp_path / "sessions.jsonl"))
+    log.append(entry("2026-01-03T09:00:00"))
+    log.append(entry("2026-01-01T09:00:00"))
+    assert [e["timestamp"][:10] for e in log.read_range()] == ["2026-01-01", "2026-01-03"]
+    assert log.read_range("2026-01-02") == [entry("2026-01-03T09:00:00")]
+
+
+def test_append_after_torn_line(tmp_path):
+    path = tmp_path / "sessions.jsonl"
+    SessionLog(str(path)).append(entry("2026-01-01T09:00:00", "first"))
+    with open(path, 'ab') as f:
+        f.write(b'{"timestamp":"2026-01-01T10:00:00","outc') # Crash mid-write
+
+    log = SessionLog(str(path))
+    log.append(entry("2026-01-01T12:00:00", "second"))
+    assert [e["outcome"] for e in log.read_range()] == ["first", "second"]
+    assert [e["outcome"] for e in SessionLog(str(path)).read_range("2026-01-01")] == ["first", "second"]
@@ -0,0 +1,70 @@
+import glob
+
+from Core.Services.node_service import NodeService
+
+
+def open_service(tmp_path):
+    return NodeService(str(tmp_path / "tree.json"), lazy=True)
+
+
+def build_tree(service, count=5):
+    nodes = []
+    for i in range(count):
+        node = service.add_child_node(service.roots[0], f"Node {i}")
+        node.description = f"Notes {i}"
+        service.mark_dirty(node)
+        intention = service.add_intention(node, f"Intention {i}")
+        service.record_stats(node, intention.stats, time=10 * i)
+        nodes.append(node)
+    service.store.checkpoint()
+    return nodes
+
+
+def test_skeleton_loads_details_on_first_access(tmp_path):
+    built = build_tree(open_service(tmp_path))
+
+    service = open_service(tmp_path)
+    nodes = [service.get(node.uid) for node in built]
+    assert not any(node.is_hydrated for node in nodes)
+    assert nodes[3].intention_totals().time == 30 # Cached aggregate, no read
+
+    assert nodes[2].description == "Notes 2"
+    assert nodes[2].is_hydrated and not nodes[1].is_hydrated
+    assert nodes[2].intentions[0].stats.time == 20
+
+
+def test_export_reads_details_without_hydrating(tmp_path):
+    build_tree(open_service(tmp_path))
+    service = open_service(tmp_path)
+    rows = list(service.iter_export())
+    assert [fields["intentions"][0]["text"] for _, _, fields in rows] == [f"Intention {i}" for i in range(5)]
+    assert not any(node.is_hydrated for node in service.nodes.values() if node.parent)
+
+
+def test_journal_replays_onto_skeleton_nodes(tmp_path):
+    built = build_tree(open_service(tmp_path))
+    service = open_service(tmp_path)
+    node = service.get(built[1].uid)
+    service.record_stats(node, node.intentions[0].stats, time=5) # Journaled only
+    service.rename_node(service.get(built[4].uid), "Renamed")
+
+    reloaded = open_service(tmp_path)
+    assert reloaded.get(built[1].uid).intentions[0].stats.time == 15
+    assert reloaded.get(built[4].uid).label == "Renamed"
+    assert reloaded.get(built[4].uid).description == "Notes 4"
+
+
+def test_checkpoint_copies_untouched_details_and_prunes_old_files(tmp_path):
+    built = build_tree(open_service(tmp_path))
+    service = open_service(tmp_path)
+    node = service.get(built[0].uid)
+    node.description = "Changed"
+    service.mark_dirty(node)
+    service.save()
+    service.store.checkpoint()
+    assert len(glob.glob(str(tmp_path / "tree.json.details.*"))) == 1
+    assert not any(n.is_hydrated for n in service.nodes.values() if n.parent and n is not node)
+
+    reloaded = open_service(tmp_path)
+    assert reloaded.get(built[0].uid).description == "Changed"
+    assert [reloaded.get(n.uid).description for n in built[1:]] == [f"Notes {i}" for i in range(1, 5)]
@@ -0,0 +1,110 @@
+import pytest
+
+from Adapters.Persistence import tree_io
+from Core.Entities.intention import Stats
+from Core.Services.node_service import NodeService
+
+
+def open_service(tmp_path, name="tree.json"):
+    return NodeService(str(tmp_path / name), lazy=False)
+
+
+def build_tree(service):
+    root = service.roots[0]
+    work = service.add_child_node(root, "Work")
+    service.update_node_status(work, "solving")
+    service.add_child_node(work, "Report, \"final\"")
+    home = service.add_child_node(root, "Home")
+    garden = service.add_child_node(home, "Garden <beds>")
+    garden.description = "Two lines\nof notes"
+    service.mark_dirty(garden)
+    intention = service.add_intention(garden, "Weed")
+    service.record_stats(garden, intention.stats, time=60, words=3)
+    return root
+
+
+def shape(service, detailed):
+    """(depth, label[, status, description]) of everything below the root, in pre-order."""
+    rows = []
+    for depth, _, fields in service.iter_export():
+        row = (depth, fields["label"])
+        if detailed:
+            row += (fields["status"], fields["description"])
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize("ext", [".opml", ".txt", ".csv", ".jsonl"])
+def test_round_trip(tmp_path, ext):
+    source = open_service(tmp_path, "source.json")
+    build_tree(source)
+    path = str(tmp_path / f"tree{ext}")
+    assert tree_io.export_tree(source, path) == 4
+
+    target = open_service(tmp_path, "target.json")
+    assert tree_io.import_tree(target, path) == 4
+    assert shape(target, ext != ".txt") == shape(source, ext != ".txt")
+    if ext == ".jsonl":
+        garden = next(n for n in target.nodes.values() if n.label == "Garden <beds>")
+        assert garden.intentions[0].text == "Weed"
+        assert garden.intentions[0].stats.to_dict() == Stats(60, 3, 0).to_dict()
+
+
+def test_import_is_one_undo_entry_and_clashing_uids_get_fresh_ones(tmp_path):
+    service = open_service(tmp_path)
+    build_tree(service)
+    path = str(tmp_path / "tree.jsonl")
+    tree_io.export_tree(service, path)
+    before = set(service.nodes)
+
+    assert tree_io.import_tree(service, path) == 4 # Into the tree it came from: a copy
+    assert len(service.nodes) == len(before) + 4
+    assert before < set(service.nodes)
+    service.undo()
+    assert set(service.nodes) == before
+
+
+def test_csv_rows_in_any_order(tmp_path):
+    path = tmp_path / "edges.csv"
+    path.write_text("uid,parent,label\nc,b,Child\nb,a,Middle\na,,Top\n", encoding="utf-8")
+    service = open_service(tmp_path)
+    tree_io.import_tree(service, str(path))
+    assert shape(service, False) == [(0, "Top"), (1, "Middle"), (2, "Child")]
+
+
+@pytest.mark.parametrize("name, content", [
+    ("latin1.txt", "Caf\xe9\n    Menu\n".encode("latin-1")),
+    ("latin1.csv", "label\nCaf\xe9\n".encode("latin-1")),
+    ("broken.opml", b"<opml><body><outline text='a'></body>"),
+    ("no_label.csv", b"name\nx\n"),
+    ("shape.jsonl", b'{"uid":"a","label":"A"}\n{"uid":"b","parent":"a","intentions":[1]}\n'),
+    ("types.jsonl", b'{"uid":"a","label":"A","x":"abc"}\n'),
+    ("parent.jsonl", b'{"uid":"a","label":"A","parent":["x"]}\n'),
+    ("stats.jsonl", b'{"uid":"a","label":"A","archived_stats":{"time":"soon"}}\n'),
+])
+def test_malformed_files_roll_back(tmp_path, name, content):
+    service = open_service(tmp_path)
+    build_tree(service)
+    before = shape(service, True)
+    undo_depth = len(service.undo_stack)
+    path = tmp_path / name
+    path.write_bytes(content)
+
+    with pytest.raises(tree_io.TreeFormatError):
+        tree_io.import_tree(service, str(path))
+    assert shape(service, True) == before
+    assert len(service.undo_stack) == undo_depth
+
+
+def test_numeric_text_is_coerced(tmp_path):
+    path = tmp_path / "nodes.jsonl"
+    path.write_text('{"uid":"a","label":"A","x":"12.5","cycle_count":"3","collapsed":false}\n', encoding="utf-8")
+    service = open_service(tmp_path)
+    tree_io.import_tree(service, str(path))
+    node = next(n for n in service.nodes.values() if n.label == "A")
+    assert (node.x, node.cycle_count) == (12.5, 3)
+
+
+def test_unknown_extension(tmp_path):
+    with pytest.raises(tree_io.TreeFormatError):
+        tree_io.import_tree(open_service(tmp_path), str(tmp_path / "tree.xlsx"))
@@ -0,0 +1,98 @@
+import json
+
+from Core.Services.node_service import NodeService
+from Core.Services.tree_journal import TreeJournal
+
+
+def open_service(tmp_path, **kwargs):
+    return NodeService(str(tmp_path / "tree.json"), lazy=False, **kwargs)
+
+
+def wait_for_checkpoint(service):
+    if service.store._compaction:
+        service.store._compaction.join()
+
+
+def test_replay_applies_records_in_order():
+    roots = [{"uid": "root", "label": "Root", "children": []}]
+    records = [
+        {"op": "node", "parent": "root", "index": 0, "fields": {"uid": "a", "label": "A"}},
+        {"op": "node", "parent": "root", "index": 0, "fields": {"uid": "b", "label": "B",
+                                                                "intentions": [{"text": "x", "status": "active"}]}},
+        {"op": "node", "parent": "a", "index": 0, "fields": {"uid": "c", "label": "C"}},
+        {"op": "stats", "uid": "b", "i": 0, "text": "x", "stats": {"time": 7, "words": 0, "chars": 0}},
+        {"op": "stats", "uid": "b", "i": 0, "text": "renamed", "stats": {"time": 99}}, # Text changed: skipped
+        {"op": "cycle", "uid": "a", "time": 12, "count": 1},
+        {"op": "remove", "uid": "a"},
+    ]
+    roots = TreeJournal.replay(roots, records)
+    children = roots[0]["children"]
+    assert [child["uid"] for child in children] == ["b"]
+    assert children[0]["intentions"][0]["stats"]["time"] == 7
+
+
+def test_saves_reload_from_journal_and_checkpoint(tmp_path):
+    service = open_service(tmp_path)
+    a = service.add_child_node(service.roots[0], "A")
+    service.add_child_node(a, "A1")
+    service.rename_node(a, "Renamed")
+
+    service.store.checkpoint()
+    assert (tmp_path / "tree.json.journal").read_bytes() == b""
+    b = service.add_child_node(service.roots[0], "B") # Journaled on top of the checkpoint
+    service.delete_nodes([a])
+
+    reloaded = open_service(tmp_path)
+    assert [child.label for child in reloaded.roots[0].children] == ["B"]
+    assert reloaded.get(b.uid) is not None and reloaded.get(a.uid) is None
+
+
+def test_ticks_survive_a_checkpoint_they_trigger(tmp_path):
+    service = open_service(tmp_path)
+    node = service.add_child_node(service.roots[0], "A")
+    intention = service.add_intention(node, "write")
+    service.record_stats(node, intention.stats, time=5)
+    service.store.compact() # Caches the node's fragment
+    wait_for_checkpoint(service)
+
+    service.store.compact_bytes = 1 # Every append now starts a checkpoint
+    service.record_stats(node, intention.stats, time=1)
+    wait_for_checkpoint(service)
+    assert open_service(tmp_path).get(node.uid).intentions[0].stats.time == 6
+
+    service.store.compact_bytes = 10 ** 9
+    service.store.compact()
+    wait_for_checkpoint(service)
+    service.store.compact_bytes = 1
+    service.tick_cycle(node, 3)
+    wait_for_checkpoint(service)
+    assert open_service(tmp_path).get(node.uid).cycle_time == 3
+
+
+def test_torn_last_line_is_cut(tmp_path):
+    service = open_service(tmp_path)
+    a = service.add_child_node(service.roots[0], "A")
+    journal_path = tmp_path / "tree.json.journal"
+    with open(journal_path, 'ab') as f:
+        f.write(b'{"op":"node","parent":null,"fie') # Crash mid-append
+
+    reloaded = open_service(tmp_path)
+    assert reloaded.get(a.uid) is not None
+    b = reloaded.add_child_node(reloaded.roots[0], "B")
+    for line in journal_path.read_bytes().splitlines():
+        json.loads(line) # The next append started on a clean line
+    assert open_service(tmp_path).get(b.uid) is not None
+
+
+def test_clean_save_writes_nothing(tmp_path):
+    service = open_service(tmp_path)
+    node = service.add_child_node(service.roots[0], "A")
+    journal_path = tmp_path / "tree.json.journal"
+    size = journal_path.stat().st_size
+    service.save()
+    assert journal_path.stat().st_size == size
+
+    service.add_intention(node, "write")
+    records = [json.loads(line) for line in journal_path.read_bytes().splitlines()]
+    assert records[-1]["fields"]["uid"] == node.uid
+    assert len(records) == len(set(r["seq"] for r in records))
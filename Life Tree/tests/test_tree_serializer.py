@@ -0,0 +1,59 @@
+from Core.Entities.node import Node
+from Core.Entities.intention import Intention
+from Core.Ports.serializer import StdlibJsonSerializer
+from Core.Services.tree_serializer import FragmentCache
+from Core.Entities.tree_traversal import iter_preorder
+
+SERIALIZER = StdlibJsonSerializer()
+
+
+def build_tree():
+    root = Node("Root")
+    for i in range(3):
+        child = root.add_child(Node(f"Child {i}"))
+        for j in range(2):
+            grandchild = child.add_child(Node(f"Grandchild {i}.{j}", description="notes"))
+            grandchild.intentions = [Intention(f"Intention {i}.{j}")]
+    return root
+
+
+def full_encode(roots):
+    return SERIALIZER.dumps([root.to_dict() for root in roots])
+
+
+def test_fragments_match_a_full_encode():
+    roots = [build_tree()]
+    cache = FragmentCache()
+    assert cache.encode(roots, SERIALIZER) == full_encode(roots)
+    assert len(cache) == 10
+    assert cache.encode(roots, SERIALIZER) == full_encode(roots) # All from the cache
+
+
+def test_invalidated_nodes_and_ancestors_are_re_encoded():
+    roots = [build_tree()]
+    cache = FragmentCache()
+    cache.encode(roots, SERIALIZER)
+
+    grandchild = roots[0].children[1].children[0]
+    grandchild.label = "Renamed"
+    grandchild.intentions[0].stats.time = 30
+    cache.invalidate(grandchild)
+    assert cache.encode(roots, SERIALIZER) == full_encode(roots)
+
+    moved = roots[0].children[2]
+    roots[0].children.remove(moved)
+    cache.invalidate(roots[0])
+    roots[0].children[0].add_child(moved)
+    cache.invalidate(roots[0].children[0])
+    assert cache.encode(roots, SERIALIZER) == full_encode(roots)
+
+
+def test_prune_drops_removed_nodes():
+    roots = [build_tree()]
+    cache = FragmentCache()
+    cache.encode(roots, SERIALIZER)
+    removed = roots[0].children.pop()
+    cache.invalidate(roots[0])
+    cache.prune({node.uid for node in iter_preorder(roots)})
+    assert not {node.uid for node in iter_preorder([removed])} & set(cache.fragments)
+    assert cache.encode(roots, SERIALIZER) == full_encode(roots)